@@ -38,7 +38,7 @@ version = 0.1
 
 # (list) Application requirements
 # comma separated e.g. requirements = sqlite3,kivy
-requirements = python3,kivy==2.2.1,kivymd,kivy_garden.mapview,geopy,pyperclip,overpass,certifi,openssl,osm2geojson,shapely,urllib3,plyer
+requirements = python3,kivy==2.2.1,kivymd,kivy_garden.mapview,numpy,geopy,pyperclip,overpass,certifi,openssl,osm2geojson,shapely,urllib3,plyer
 
 # (str) Custom source folders for requirements
 # Sets custom source for any requirements with recipes
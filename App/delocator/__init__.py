@@ -0,0 +1,5 @@
+"""
+Headless building blocks of DeLocator.
+Nothing in this package imports Kivy, so it can be used from the app,
+from scripts and from the command line alike.
+"""
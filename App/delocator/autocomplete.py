@@ -0,0 +1,171 @@
+# On-device address suggestions from a prefix index over known addresses
+import bisect
+import heapq
+import threading
+import unicodedata
+
+from .geocode_cache import _PUNCTUATION, get_geocode_cache, normalize_address
+from .offline_index import get_offline_index
+
+SUGGESTION_LIMIT = 6
+# Shorter input matches too much to be useful
+MIN_PREFIX_LENGTH = 2
+
+# Weight an address gains each time it is added from a source; the heaviest suggestions come first
+SOURCE_WEIGHTS = {
+    'history': 4.0,
+    'saved': 3.0,
+    'geocode': 2.0,
+    'offline': 1.0
+}
+
+# Sorts after every character, closing the range of keys that start with a prefix
+_MAX_CHAR = "\U0010ffff"
+
+
+def normalize_prefix(text):
+    """
+    Normalizes typed, possibly unfinished text like normalize_address, except
+    that a word still being typed is not expanded ("Str" may become "Strandweg").
+    """
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    if not text or not text[-1].isalnum():
+        return normalize_address(text)
+    tokens = _PUNCTUATION.sub(" ", text).split()
+    head = normalize_address(" ".join(tokens[:-1]))
+    return f"{head} {tokens[-1]}" if head else tokens[-1]
+
+
+# PrefixIndex: Sorted normalized keys, so all keys starting with a prefix
+# form one contiguous range found by two binary searches.
+# A ranked index returns the heaviest keys of the range; an unranked one
+# just its first keys, which stays fast for large reference data.
+class PrefixIndex:
+    def __init__(self, ranked=True):
+        self.ranked = ranked
+        self._keys = []
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, text, source="history"):
+        """
+        Adds an address, or raises the weight of one already known.
+        """
+        text = (text or "").strip()
+        key = normalize_address(text)
+        if not key:
+            return
+        weight = SOURCE_WEIGHTS.get(source, 1.0)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = [weight, text]
+                bisect.insort(self._keys, key)
+            else:
+                entry[0] += weight
+
+    def add_many(self, texts, source):
+        """
+        Adds many addresses with one sort instead of an insertion each.
+        """
+        weight = SOURCE_WEIGHTS.get(source, 1.0)
+        with self._lock:
+            added = False
+            for text in texts:
+                text = (text or "").strip()
+                key = normalize_address(text)
+                if not key:
+                    continue
+                entry = self._entries.get(key)
+                if entry is None:
+                    self._entries[key] = [weight, text]
+                    self._keys.append(key)
+                    added = True
+                else:
+                    entry[0] += weight
+            if added:
+                self._keys.sort()
+
+    def clear(self):
+        with self._lock:
+            self._keys = []
+            self._entries = {}
+
+    def suggest(self, text, limit=SUGGESTION_LIMIT):
+        """
+        Returns up to limit known addresses starting with the typed text, heaviest first.
+        """
+        prefix = normalize_prefix(text)
+        if len(prefix) < MIN_PREFIX_LENGTH:
+            return []
+        with self._lock:
+            start = bisect.bisect_left(self._keys, prefix)
+            if not self.ranked:
+                keys = [key for key in self._keys[start:start + limit] if key.startswith(prefix)]
+                return [self._entries[key][1] for key in keys]
+            end = bisect.bisect_left(self._keys, prefix + _MAX_CHAR, start)
+            best = heapq.nlargest(limit, self._keys[start:end], key=lambda key: self._entries[key][0])
+            return [self._entries[key][1] for key in best]
+
+
+# AddressSuggester: The user's own addresses (history, saved, geocoded) ranked by
+# weight, topped up with addresses of the offline extract in alphabetical order
+class AddressSuggester:
+    def __init__(self):
+        self.personal = PrefixIndex()
+        self.reference = PrefixIndex(ranked=False)
+
+    def add(self, text, source="history"):
+        self.personal.add(text, source)
+
+    def suggest(self, text, limit=SUGGESTION_LIMIT):
+        """
+        Returns up to limit addresses starting with the typed text.
+        """
+        suggestions = self.personal.suggest(text, limit)
+        if len(suggestions) < limit:
+            known = {normalize_address(suggestion) for suggestion in suggestions}
+            for suggestion in self.reference.suggest(text, limit):
+                if len(suggestions) >= limit:
+                    break
+                if normalize_address(suggestion) not in known:
+                    suggestions.append(suggestion)
+        return suggestions
+
+
+def build_address_suggester(saved_locations=(), suggester=None):
+    """
+    Fills a suggester (default: the shared one) from saved locations,
+    the geocode cache and the offline POI index, and returns it.
+    """
+    suggester = get_address_suggester() if suggester is None else suggester
+    suggester.personal.add_many((location.get("original_address") for location in saved_locations), "saved")
+
+    geocode_cache = get_geocode_cache()
+    if geocode_cache is not None:
+        suggester.personal.add_many(geocode_cache.queries(), "geocode")
+
+    offline_index = get_offline_index()
+    if offline_index is not None:
+        suggester.reference.add_many(offline_index.addresses(), "offline")
+    return suggester
+
+
+# Shared suggester behind the address input
+_suggester = None
+_suggester_lock = threading.Lock()
+
+
+def get_address_suggester():
+    """
+    Returns the shared suggester, empty until build_address_suggester fills it.
+    """
+    global _suggester
+    if _suggester is None:
+        with _suggester_lock:
+            if _suggester is None:
+                _suggester = AddressSuggester()
+    return _suggester
@@ -0,0 +1,293 @@
+"""
+Command line interface for headless anonymization.
+
+Examples:
+    python -m delocator batch addresses.csv -o anonymized.jsonl --workers 4
+    python -m delocator import-pbf vienna.osm.pbf -o poi_index.sqlite3
+    python -m delocator clear-history history.sqlite3 --geocode-cache geocode_cache.sqlite3
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .clients import get_geocoder
+from .density import configure_density_memory
+from .engine import DEFAULT_RADIUS, AnonymizationError, anonymize_address
+from .geocode_cache import GeocodeCache, configure_geocode_cache
+from .history import AnonymizationHistory
+from .instrumentation import configure_logging, disable_trace, enable_trace, format_stage_stats, profiling
+from .offline_index import build_index_from_pbf, configure_offline_index
+from .overpass_pool import configure_overpass_endpoints, get_overpass_pool
+from .poi_cache import configure_poi_cache
+from .ratelimit import TokenBucket, nominatim_limiter
+
+OUTPUT_FIELDS = [
+    'index', 'original_address', 'address', 'latitude', 'longitude',
+    'original_latitude', 'original_longitude', 'category', 'distance', 'radius', 'candidate_count', 'error'
+]
+
+
+def read_addresses(path, column="address"):
+    """
+    Yields (index, address) pairs from a CSV or JSONL file, one at a time.
+    CSV files use the given column, or the first column if it is missing.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            for index, line in enumerate(file):
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                address = record.get(column) if isinstance(record, dict) else record
+                yield index, str(address or "")
+        else:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if header is None:
+                return
+            if column in header:
+                position = header.index(column)
+            else:
+                # No header row with the column: treat the first row as data
+                position = 0
+                yield 0, header[0] if header else ""
+            for index, row in enumerate(reader, start=1):
+                yield index, row[position] if len(row) > position else ""
+
+
+# ResultWriter: Serializes results as JSONL or CSV and flushes after every record
+class ResultWriter:
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self.fmt = fmt
+        self._lock = threading.Lock()
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=OUTPUT_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, record):
+        with self._lock:
+            if self._csv is not None:
+                self._csv.writerow(record)
+            else:
+                self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.stream.flush()
+
+
+def anonymize_one(index, address, geocoder, overpass_limiter, radius, rng, adaptive=False):
+    """
+    Anonymizes a single address and returns an output record.
+    Failures are reported in the record instead of aborting the batch.
+    """
+    record = {'index': index, 'original_address': address}
+    if not address.strip():
+        record['error'] = "Empty address"
+        return record
+
+    try:
+        result = anonymize_address(
+            address,
+            geocoder=geocoder,
+            radius=radius,
+            rng=rng,
+            overpass_limiter=overpass_limiter,
+            adaptive=adaptive
+        )
+        record.update(result)
+    except AnonymizationError as e:
+        record['error'] = e.title
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+    return record
+
+
+def run_batch(addresses, writer, workers=4, geocode_rate=1.0, overpass_rate=1.0,
+              radius=DEFAULT_RADIUS, rng=random, adaptive=False, inline=False):
+    """
+    Anonymizes addresses concurrently and writes each result as soon as it is done.
+    At most 2 * workers addresses are held in memory at any time.
+    With inline, workers is ignored and addresses are anonymized one at a time
+    on the calling thread, the only one cProfile traces.
+    Returns (succeeded, failed) counts.
+    """
+    geocoder = get_geocoder()
+    # Geocoding shares the process-wide Nominatim scheduler with every other caller
+    nominatim_limiter.set_rate(geocode_rate)
+    overpass_limiter = TokenBucket(overpass_rate)
+    max_pending = max(1, workers) * 2
+    succeeded = failed = 0
+
+    if inline:
+        for index, address in addresses:
+            record = anonymize_one(index, address, geocoder, overpass_limiter, radius, rng, adaptive)
+            writer.write(record)
+            if record.get('error'):
+                failed += 1
+            else:
+                succeeded += 1
+        return succeeded, failed
+
+    def collect(done):
+        nonlocal succeeded, failed
+        for future in done:
+            record = future.result()
+            writer.write(record)
+            if record.get('error'):
+                failed += 1
+            else:
+                succeeded += 1
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        pending = set()
+        for index, address in addresses:
+            pending.add(executor.submit(
+                anonymize_one, index, address, geocoder,
+                overpass_limiter, radius, rng, adaptive
+            ))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        done, _ = wait(pending)
+        collect(done)
+
+    return succeeded, failed
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="delocator", description="Headless DeLocator address anonymization")
+    parser.add_argument("-v", "--verbose", action="count", default=0,
+                        help="Log progress to stderr (-v: info, -vv: debug)")
+    parser.add_argument("--timings", action="store_true", help="Print per-stage timings to stderr when done")
+    parser.add_argument("--profile", help="Write cProfile stats of the run to this file")
+    parser.add_argument("--trace", help="Write stage spans as a Chrome trace-event JSON file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch = subparsers.add_parser("batch", help="Anonymize a CSV or JSONL file of addresses")
+    batch.add_argument("input", help="CSV or JSONL file with one address per row")
+    batch.add_argument("-o", "--output", help="Output file (.jsonl or .csv); defaults to JSONL on stdout")
+    batch.add_argument("--column", default="address", help="CSV column / JSON key holding the address")
+    batch.add_argument("--workers", type=int, default=4,
+                       help="Number of concurrent workers (runs with --profile use one, on the main thread)")
+    batch.add_argument("--geocode-rate", type=float, default=1.0,
+                       help="Maximum Nominatim requests per second (usage policy: 1)")
+    batch.add_argument("--overpass-rate", type=float, default=1.0,
+                       help="Maximum Overpass requests per second")
+    batch.add_argument("--overpass-endpoint", action="append", metavar="URL",
+                       help="Overpass interpreter URL; repeat to add failover mirrors (default: overpass-api.de only)")
+    batch.add_argument("--radius", type=int, default=DEFAULT_RADIUS, help="Search radius in meters")
+    batch.add_argument("--adaptive", action="store_true",
+                       help="Choose the radius per address from the local density of places (ignores --radius)")
+    batch.add_argument("--density-memory", help="Path of the SQLite density memory used by --adaptive")
+    batch.add_argument("--seed", type=int, help="Random seed for reproducible selection")
+    batch.add_argument("--cache", help="Path of the SQLite POI cache to use")
+    batch.add_argument("--geocode-cache", help="Path of the SQLite geocode cache to use")
+    batch.add_argument("--offline-index", help="Path of an offline POI index built with import-pbf")
+
+    import_pbf = subparsers.add_parser("import-pbf", help="Build an offline POI index from an .osm.pbf extract")
+    import_pbf.add_argument("pbf", help="Regional .osm.pbf extract")
+    import_pbf.add_argument("-o", "--output", default="poi_index.sqlite3", help="Index file to create or extend")
+
+    clear_history = subparsers.add_parser("clear-history",
+                                          help="Delete stored anonymizations and looked up addresses")
+    clear_history.add_argument("history", nargs="?", help="History database (the app's history.sqlite3)")
+    clear_history.add_argument("--geocode-cache", help="Geocode cache whose looked up addresses to delete as well")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    configure_logging({0: None, 1: "INFO"}.get(args.verbose, "DEBUG"))
+    if args.trace:
+        enable_trace(args.trace)
+
+    with profiling(args.profile):
+        status = run_command(args, profile=bool(args.profile or os.environ.get("DELOCATOR_PROFILE")))
+
+    disable_trace()
+    if args.timings:
+        print(format_stage_stats(), file=sys.stderr)
+        for endpoint in get_overpass_pool().stats():
+            latency = f"{endpoint['latency_ms']:.0f} ms" if endpoint['latency_ms'] is not None else "-"
+            print(f"{endpoint['url']}: {endpoint['state']}, {latency}, "
+                  f"{endpoint['successes']} ok, {endpoint['failures']} failed", file=sys.stderr)
+    return status
+
+
+def run_command(args, profile=False):
+    if args.command == "batch":
+        if args.cache:
+            configure_poi_cache(args.cache)
+        if args.geocode_cache:
+            configure_geocode_cache(args.geocode_cache)
+        if args.offline_index:
+            configure_offline_index(args.offline_index)
+        if args.density_memory:
+            configure_density_memory(args.density_memory)
+        if args.overpass_endpoint:
+            configure_overpass_endpoints(args.overpass_endpoint)
+        rng = random.Random(args.seed) if args.seed is not None else random
+
+        fmt = "csv" if args.output and args.output.lower().endswith(".csv") else "jsonl"
+        stream = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+
+        try:
+            writer = ResultWriter(stream, fmt)
+            succeeded, failed = run_batch(
+                read_addresses(args.input, args.column),
+                writer,
+                workers=args.workers,
+                geocode_rate=args.geocode_rate,
+                overpass_rate=args.overpass_rate,
+                radius=args.radius,
+                rng=rng,
+                adaptive=args.adaptive,
+                # cProfile does not follow worker threads
+                inline=profile
+            )
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+
+        print(f"Done: {succeeded} anonymized, {failed} failed", file=sys.stderr)
+        return 0 if failed == 0 else 1
+
+    if args.command == "import-pbf":
+        started = time.perf_counter()
+        imported = build_index_from_pbf(args.pbf, args.output)
+        print(f"Imported {imported} places into {args.output} in {time.perf_counter() - started:.1f}s",
+              file=sys.stderr)
+        return 0
+
+    if args.command == "clear-history":
+        if not args.history and not args.geocode_cache:
+            print("Nothing to clear: give a history database and/or --geocode-cache", file=sys.stderr)
+            return 2
+        for path, store in ((args.history, AnonymizationHistory), (args.geocode_cache, GeocodeCache)):
+            if not path:
+                continue
+            if not os.path.exists(path):
+                print(f"Not found: {path}", file=sys.stderr)
+                return 1
+            opened = store(path)
+            try:
+                opened.clear()
+            finally:
+                opened.close()
+            print(f"Cleared {path}", file=sys.stderr)
+        return 0
+
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# Long-lived, thread-safe HTTP clients for Nominatim and Overpass.
+# requests, geopy and certifi are imported when the first client is created,
+# so they do not weigh on app start.
+import threading
+
+from .geocode_cache import CachingGeocoder
+
+USER_AGENT = "DeLocatorApp"
+NOMINATIM_DOMAIN = "nominatim.openstreetmap.org"
+NOMINATIM_SCHEME = "https"
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+
+_lock = threading.Lock()
+_session = None
+_geocoder = None
+
+
+def _create_ssl_context():
+    # Same context the app used before, now scoped to our own clients
+    # instead of geopy.geocoders.options.default_ssl_context
+    import ssl
+
+    import certifi
+    return ssl._create_unverified_context(cafile=certifi.where())
+
+
+def get_session():
+    """
+    Returns the shared keep-alive requests session.
+    Connections are pooled, so only the first request to a host pays the TCP/TLS handshake.
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({
+                    'User-Agent': USER_AGENT,
+                    'Accept-Encoding': "gzip, deflate"
+                })
+                _session = session
+    return _session
+
+
+def get_geocoder():
+    """
+    Returns the shared Nominatim geocoder.
+    It is built once with its own SSL context and a pooled requests adapter,
+    and answers repeated lookups from the geocode cache.
+    """
+    global _geocoder
+    if _geocoder is None:
+        with _lock:
+            if _geocoder is None:
+                from geopy.adapters import RequestsAdapter
+                from geopy.geocoders import Nominatim
+
+                def adapter_factory(proxies, ssl_context):
+                    return RequestsAdapter(
+                        proxies=proxies,
+                        ssl_context=ssl_context,
+                        pool_connections=POOL_CONNECTIONS,
+                        pool_maxsize=POOL_MAXSIZE
+                    )
+
+                _geocoder = CachingGeocoder(Nominatim(
+                    user_agent=USER_AGENT,
+                    domain=NOMINATIM_DOMAIN,
+                    scheme=NOMINATIM_SCHEME,
+                    timeout=10,
+                    ssl_context=_create_ssl_context(),
+                    adapter_factory=adapter_factory
+                ))
+    return _geocoder
+
+
+def close_clients():
+    """
+    Closes the shared session and geocoder; they are recreated on next use.
+    """
+    global _session, _geocoder
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+        if _geocoder is not None:
+            _geocoder.geocoder.adapter.__exit__(None, None, None)
+            _geocoder = None
@@ -0,0 +1,94 @@
+# Remembered candidate density per area, used to size adaptive searches
+import math
+import sqlite3
+import threading
+import time
+
+from .poi_cache import geohash_encode
+
+# Geohash precision 5 gives cells of roughly 5 km x 5 km: one neighbourhood
+# is sized from what was seen anywhere nearby
+DENSITY_PRECISION = 5
+# Weight of a new observation in the moving average
+SMOOTHING = 0.5
+
+
+def annulus_area(radius, min_distance=0.0):
+    """
+    Returns the area in square kilometers between min_distance and radius meters.
+    """
+    return math.pi * (radius ** 2 - min(min_distance, radius) ** 2) / 1e6
+
+
+# DensityMemory: SQLite table of the observed candidates per square kilometer of each cell
+class DensityMemory:
+    def __init__(self, path, precision=DENSITY_PRECISION):
+        self.path = path
+        self.precision = precision
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS density ("
+            " cell TEXT PRIMARY KEY,"
+            " density REAL NOT NULL,"
+            " samples INTEGER NOT NULL,"
+            " updated REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, lat, lon):
+        """
+        Returns the remembered candidates per square kilometer around (lat, lon), or None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT density FROM density WHERE cell = ?", (geohash_encode(lat, lon, self.precision),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def observe(self, lat, lon, count, area):
+        """
+        Folds one search (count candidates found in area square kilometers) into the cell's average.
+        """
+        if area <= 0:
+            return
+        observed = count / area
+        cell = geohash_encode(lat, lon, self.precision)
+        with self._lock:
+            row = self._conn.execute("SELECT density, samples FROM density WHERE cell = ?", (cell,)).fetchone()
+            if row is None:
+                density, samples = observed, 1
+            else:
+                density = (1 - SMOOTHING) * row[0] + SMOOTHING * observed
+                samples = row[1] + 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO density (cell, density, samples, updated) VALUES (?, ?, ?, ?)",
+                (cell, density, samples, time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Shared memory used by adaptive searches
+_density_memory = None
+
+
+def configure_density_memory(path):
+    """
+    Opens the shared density memory at the given path and returns it.
+    """
+    global _density_memory
+    if _density_memory is not None:
+        _density_memory.close()
+    _density_memory = DensityMemory(path)
+    return _density_memory
+
+
+def get_density_memory():
+    """
+    Returns the shared density memory, or None if none is configured.
+    """
+    return _density_memory
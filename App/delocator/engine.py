@@ -0,0 +1,663 @@
+"""
+Headless anonymization engine.
+Runs the geocode -> Overpass -> random selection pipeline without any UI,
+so it can be driven from the Kivy app as well as from the batch CLI.
+"""
+import logging
+import math
+import random
+import re
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from .clients import get_geocoder, get_session
+from .density import annulus_area, get_density_memory
+from .instrumentation import span
+from .offline_index import get_offline_index
+from .overpass_pool import DEFAULT_ENDPOINTS, get_overpass_pool
+from .overpass_stream import CHUNK_SIZE, ReservoirSampler, RingSampler, iter_elements
+from .poi_cache import get_poi_cache
+from .spatial import filter_by_distance
+
+# Primary endpoint; searches go through the endpoint pool of overpass_pool
+OVERPASS_URL = DEFAULT_ENDPOINTS[0]
+DEFAULT_RADIUS = 500
+# Number of candidates kept from an Overpass response
+DEFAULT_SAMPLE_SIZE = 10
+# Minimum distance in meters between the original address and the chosen place
+DEFAULT_MIN_DISTANCE = 0.0
+# Candidates are distance-filtered in batches of this size while the response streams in
+FILTER_BATCH_SIZE = 256
+# Places of one Overpass response kept in the POI cache: all of them in most
+# areas, a uniform sample in the densest. Each hit samples afresh from these.
+POI_CACHE_SAMPLE_SIZE = 1000
+
+# Adaptive radius: one fetch at an outer radius sized from the remembered
+# density, split into equal-area rings the final radius is chosen from
+ADAPTIVE_INITIAL_RADIUS = 2 * DEFAULT_RADIUS
+ADAPTIVE_MIN_RADIUS = DEFAULT_RADIUS // 2
+ADAPTIVE_MAX_RADIUS = 2000
+ADAPTIVE_RADIUS_STEP = 250
+# The outer radius is planned for this many times the target count
+ADAPTIVE_OVERFETCH = 2.0
+ADAPTIVE_RING_COUNT = 4
+
+# Typed text shorter than this is not prefetched
+PREFETCH_MIN_LENGTH = 8
+
+logger = logging.getLogger(__name__)
+
+
+# Categories for anonymized location search.
+# Used for filtering specific public places with Overpass API.# 🔧 NEW: Categories for anonymized location search
+PLACE_CATEGORIES = {
+    "Dining": [
+        '"amenity"="restaurant"',
+        '"amenity"="cafe"',
+        '"amenity"="bar"',
+        '"amenity"="fast_food"'
+    ],
+    "Shopping": [
+        '"shop"="supermarket"',
+        '"shop"="bakery"',
+        '"shop"="convenience"'
+    ],
+    "Healthcare": [
+        '"amenity"="pharmacy"'
+    ],
+    "Services": [
+        '"amenity"="bank"',
+        '"amenity"="atm"',
+        '"amenity"="post_office"',
+        '"amenity"="fuel"'
+    ],
+    "Transport": [
+        '"highway"="bus_stop"'
+    ],
+    "Recreation": [
+        '"leisure"="park"',
+        '"shop"="hairdresser"'
+    ]
+}
+
+
+def parse_tag_filter(tag_filter):
+    """
+    Splits a '"key"="value"' filter into (key, value).
+    """
+    key, value = (part.strip().strip('"') for part in tag_filter.split("=", 1))
+    return key, value
+
+
+def group_category_filters(categories=PLACE_CATEGORIES):
+    """
+    Groups the '"key"="value"' filters of all categories by OSM key.
+    Returns a dict mapping each key to its sorted list of values.
+    """
+    grouped = {}
+    for filters in categories.values():
+        for tag_filter in filters:
+            key, value = parse_tag_filter(tag_filter)
+            grouped.setdefault(key, set()).add(value)
+    return {key: sorted(values) for key, values in sorted(grouped.items())}
+
+
+def compile_category_lookup(categories=PLACE_CATEGORIES):
+    """
+    Compiles PLACE_CATEGORIES into a {(key, value): (rank, category)} table.
+    The rank is the category's position, so earlier categories win when an
+    element matches several.
+    """
+    lookup = {}
+    for rank, (category, filters) in enumerate(categories.items()):
+        for tag_filter in filters:
+            lookup.setdefault(parse_tag_filter(tag_filter), (rank, category))
+    return lookup
+
+
+def matches_place_categories(tags):
+    """
+    Checks if an element's tags match any filter of PLACE_CATEGORIES.
+    """
+    for key in CATEGORY_KEYS:
+        value = tags.get(key)
+        if value is not None and (key, value) in CATEGORY_LOOKUP:
+            return True
+    return False
+
+
+def build_overpass_query(latitude, longitude, radius, categories=PLACE_CATEGORIES):
+    """
+    Builds one Overpass union query covering every category in PLACE_CATEGORIES.
+    The radius search runs once; values are matched per key with an anchored regex.
+    Only elements with a street and city are returned, as nothing else is usable.
+    """
+    clauses = "\n".join(
+        f'  nw.addressed[{key}~"^({"|".join(re.escape(value) for value in values)})$"];'
+        for key, values in group_category_filters(categories).items()
+    )
+    return (
+        "[out:json][timeout:25];\n"
+        f'nw(around:{radius},{latitude},{longitude})["addr:street"]["addr:city"]->.addressed;\n'
+        f"(\n{clauses}\n)->.places;\n"
+        # Nodes carry lat/lon; ways only need their tags and center point
+        "node.places;\nout qt;\n"
+        "way.places;\nout tags center qt;"
+    )
+
+
+# (key, value) -> (rank, category) table and the keys it uses, compiled once from PLACE_CATEGORIES
+CATEGORY_LOOKUP = compile_category_lookup()
+CATEGORY_KEYS = tuple(sorted({key for key, _ in CATEGORY_LOOKUP}))
+
+
+def determine_category_from_tags(tags):
+    """
+    Determines a location's category based on its OSM tags.
+    Returns a human-readable category string.
+    """
+    best = None
+    for key in CATEGORY_KEYS:
+        value = tags.get(key)
+        if value is None:
+            continue
+        match = CATEGORY_LOOKUP.get((key, value))
+        if match is not None and (best is None or match < best):
+            best = match
+    return best[1] if best is not None else "Other"
+
+
+def classify_tags(tags_list):
+    """
+    Returns the category of every tag dict in tags_list, in order.
+    """
+    return [determine_category_from_tags(tags) for tags in tags_list]
+
+
+def is_valid_address(address, tags):
+    """
+    Checks if an address is valid.
+    """
+    return address is not None and len(address.strip()) > 0
+
+
+def element_to_candidate(element):
+    """
+    Turns one Overpass element into a candidate record.
+    Returns None if the element has no coordinates or no street and city.
+    """
+    # Extract coordinates (ways are returned with their center point)
+    center = element.get('center', element)
+    lat = center.get('lat')
+    lon = center.get('lon')
+    if not (lat and lon):
+        return None
+
+    # Extract tags
+    tags = element.get('tags', {})
+    if not tags:
+        return None
+
+    # Check address
+    street = tags.get("addr:street", "")
+    city = tags.get("addr:city", "")
+    if not (street and city):
+        return None
+
+    return {
+        'address': f"{street}, {city}",
+        'coordinates': (lon, lat),
+        'category': determine_category_from_tags(tags),
+        'tags': tags
+    }
+
+
+def filter_candidates(candidates, latitude, longitude, min_distance=0.0, max_distance=math.inf):
+    """
+    Keeps the candidates between min_distance and max_distance meters of a
+    location and stores each one's 'distance', in a single vectorized pass.
+    """
+    if not candidates:
+        return []
+
+    coordinates = np.array([candidate['coordinates'] for candidate in candidates], dtype=np.float64)
+    indices, distances = filter_by_distance(
+        latitude, longitude, coordinates[:, 1], coordinates[:, 0], min_distance, max_distance
+    )
+
+    kept = []
+    for index, distance in zip(indices.tolist(), distances.tolist()):
+        candidate = candidates[index]
+        candidate['distance'] = distance
+        kept.append(candidate)
+    return kept
+
+
+def get_places_with_fallback(api, location, radius=500, sample_size=DEFAULT_SAMPLE_SIZE, rng=random,
+                             min_distance=0.0):
+    """
+    Fetches nearby public places by direct HTTP request to Overpass API.
+    This method bypasses the Overpass Python library.
+    Returns a list of amenities with address and coordinates.
+    The response is parsed while it streams in, and a uniform random sample of
+    sample_size addressed places is kept, so memory does not grow with the radius.
+    Results are served from the POI cache when a nearby query was answered before,
+    or from the offline POI index when it covers the area; Overpass is the fallback.
+    Only places between min_distance and radius meters away are returned.
+    """
+    sampler = ReservoirSampler(sample_size, rng)
+    collect_places(location, radius, sampler, min_distance)
+    return sampler.items
+
+
+def collect_places(location, radius, sampler, min_distance=0.0, cancel_check=None, use_cache=True):
+    """
+    Feeds the places between min_distance and radius meters of location into
+    sampler (anything with add(), seen and items), from the POI cache, the
+    offline index or Overpass, in that order.
+    Returns the source that answered ("cache", "offline" or "overpass"), or None.
+    cancel_check, if given, is called while the Overpass response streams in and may raise to abort.
+    Without use_cache the POI cache is not read, since it holds only a sample
+    of each area (a fresh result is still stored in it).
+    """
+
+    # Answer from the spatial cache if this cell was fetched recently
+    poi_cache = get_poi_cache()
+    if poi_cache is not None and use_cache:
+        cached = poi_cache.get(location.latitude, location.longitude, radius)
+        # The session counters only; stats() would count the whole table on every lookup
+        if cached is not None:
+            logger.debug(f"POI cache hit: {len(cached)} addresses (hits={poi_cache.hits}, "
+                         f"misses={poi_cache.misses}, saved={poi_cache.saved_seconds:.1f}s)")
+            for candidate in filter_candidates(cached, location.latitude, location.longitude,
+                                               min_distance, radius):
+                sampler.add(candidate)
+            return "cache"
+        logger.debug(f"POI cache miss (hits={poi_cache.hits}, misses={poi_cache.misses})")
+
+    # Answer from the imported offline extract if it covers the search area
+    offline_index = get_offline_index()
+    if offline_index is not None and offline_index.covers(location.latitude, location.longitude, radius):
+        for candidate in offline_index.query(location.latitude, location.longitude, radius, min_distance):
+            sampler.add(candidate)
+        if sampler.seen:
+            logger.debug(f"Offline index: {sampler.seen} addresses")
+            return "offline"
+        logger.debug("Offline index has no places here, falling back to Overpass")
+
+    logger.debug("Direct HTTP request to Overpass API...")
+
+    # Compose one Overpass union query for all categories
+    overpass_query = build_overpass_query(location.latitude, location.longitude, radius)
+
+    try:
+        started = time.perf_counter()
+        with span("overpass_request"):
+            # Fails over and hedges across the configured endpoints
+            response = get_overpass_pool().post({'data': overpass_query}, timeout=30)
+
+        with response:
+            if response.status_code != 200:
+                logger.warning(f"HTTP Error: {response.status_code}")
+                return None
+
+            element_count = 0
+            batch = []
+            # The cache gets its own, much larger sample, so later hits do not all draw from the same few places
+            cache_sampler = ReservoirSampler(POI_CACHE_SAMPLE_SIZE)
+
+            def flush(batch):
+                if cancel_check is not None:
+                    cancel_check()
+                # Distance constraints are applied to whole batches at once
+                for candidate in filter_candidates(batch, location.latitude, location.longitude,
+                                                   min_distance, radius):
+                    sampler.add(candidate)
+                    cache_sampler.add(candidate)
+
+            with span("parse"):
+                for element in iter_elements(response.iter_content(chunk_size=CHUNK_SIZE)):
+                    element_count += 1
+                    try:
+                        candidate = element_to_candidate(element)
+                    except Exception as e:
+                        logger.warning(f"Element error: {e}")
+                        continue
+                    if candidate is not None:
+                        batch.append(candidate)
+                        if len(batch) >= FILTER_BATCH_SIZE:
+                            flush(batch)
+                            batch = []
+                flush(batch)
+
+        amenities_data = sampler.items
+        logger.info(f"Direct API: {element_count} elements, {sampler.seen} with address, "
+                    f"{len(amenities_data)} sampled")
+
+        # Only successful, non-empty results are cached so transient failures can be retried
+        if poi_cache is not None and cache_sampler.items:
+            poi_cache.put(location.latitude, location.longitude, radius, cache_sampler.items,
+                          fetch_seconds=time.perf_counter() - started)
+
+        return "overpass"
+
+    except Exception as e:
+        # A cancelled caller gets its exception again instead of a failed fetch
+        if cancel_check is not None:
+            cancel_check()
+        logger.warning(f"HTTP request error: {e}")
+        return None
+
+
+def ring_edges(radius, min_distance=0.0, count=ADAPTIVE_RING_COUNT):
+    """
+    Splits the search area between min_distance and radius into count rings of
+    equal area and returns their outer edges in meters.
+    """
+    inner = min(min_distance, radius)
+    return [math.sqrt(inner ** 2 + (radius ** 2 - inner ** 2) * (i + 1) / count) for i in range(count)]
+
+
+def _radius_for_density(density, target, min_distance):
+    # Radius whose area outside the min_distance hole holds the over-fetched target
+    # at density places/km², rounded up to ADAPTIVE_RADIUS_STEP so repeated searches share cache entries
+    area = target * ADAPTIVE_OVERFETCH / density
+    radius = math.sqrt(area * 1e6 / math.pi + min_distance ** 2)
+    radius = math.ceil(radius / ADAPTIVE_RADIUS_STEP) * ADAPTIVE_RADIUS_STEP
+    return min(ADAPTIVE_MAX_RADIUS, max(ADAPTIVE_MIN_RADIUS, min_distance + ADAPTIVE_RADIUS_STEP, radius))
+
+
+def plan_adaptive_radius(latitude, longitude, target=DEFAULT_SAMPLE_SIZE, min_distance=0.0):
+    """
+    Returns the outer radius to fetch for an adaptive search, sized from the
+    remembered density of the area, or ADAPTIVE_INITIAL_RADIUS for unknown areas.
+    If the POI cache already holds a usable radius for this spot (e.g. from a
+    prefetch), the one closest to the plan is reused so the search is a cache hit.
+    """
+    memory = get_density_memory()
+    density = memory.get(latitude, longitude) if memory is not None else None
+    if not density:
+        planned = max(ADAPTIVE_INITIAL_RADIUS, min_distance + ADAPTIVE_RADIUS_STEP)
+    else:
+        planned = _radius_for_density(density, target, min_distance)
+
+    poi_cache = get_poi_cache()
+    if poi_cache is not None:
+        usable = [radius for radius in poi_cache.cached_radii(latitude, longitude)
+                  if ADAPTIVE_MIN_RADIUS <= radius <= ADAPTIVE_MAX_RADIUS and radius > min_distance]
+        if usable:
+            return min(usable, key=lambda radius: abs(radius - planned))
+    return planned
+
+
+def get_places_adaptive(location, target=DEFAULT_SAMPLE_SIZE, rng=random, min_distance=0.0, cancel_check=None,
+                        use_cache=True, strict=False):
+    """
+    Adaptive alternative to a fixed radius: fetches once at an outer radius
+    planned from the area's remembered density, then draws the sample from the
+    smallest inner ring (at least ADAPTIVE_MIN_RADIUS) holding target places.
+    If Overpass returns fewer than target places, the radius is widened once
+    from the observed density. Returns (candidates, radius).
+    use_cache is passed on to collect_places. With strict, a search that no
+    source answered (Overpass unreachable) raises AnonymizationError instead
+    of looking like an area without places.
+    """
+    latitude, longitude = location.latitude, location.longitude
+    memory = get_density_memory()
+
+    def fetch(outer):
+        sampler = RingSampler(ring_edges(outer, min_distance), target, rng)
+        source = collect_places(location, outer, sampler, min_distance, cancel_check, use_cache)
+        if source is None and strict:
+            raise AnonymizationError("API Error", "Failed to fetch nearby locations.")
+        # Only complete fetches tell the density; cache entries hold just a sample
+        if source in ("offline", "overpass") and memory is not None:
+            memory.observe(latitude, longitude, sampler.seen, annulus_area(outer, min_distance))
+        return sampler, source
+
+    outer = plan_adaptive_radius(latitude, longitude, target, min_distance)
+    sampler, source = fetch(outer)
+
+    if source == "overpass" and sampler.seen < target and outer < ADAPTIVE_MAX_RADIUS:
+        # Sparse area: one wider fetch, sized from what this one found
+        if sampler.seen:
+            wider = _radius_for_density(sampler.seen / annulus_area(outer, min_distance), target, min_distance)
+        else:
+            wider = ADAPTIVE_MAX_RADIUS
+        logger.info(f"Adaptive radius: {sampler.seen} places within {outer:.0f} m, widening once")
+        outer = min(ADAPTIVE_MAX_RADIUS, max(wider, outer + ADAPTIVE_RADIUS_STEP))
+        sampler, source = fetch(outer)
+
+    # Smallest ring that meets the target; the whole disc if none does
+    ring_count = len(sampler.edges)
+    for index, (edge, count) in enumerate(zip(sampler.edges, sampler.cumulative_counts())):
+        if edge >= ADAPTIVE_MIN_RADIUS and count >= target:
+            ring_count = index + 1
+            break
+
+    radius = sampler.edges[ring_count - 1]
+    logger.debug(f"Adaptive radius: {radius:.0f} m of {outer:.0f} m fetched, {sampler.seen} places")
+    return sampler.sample(ring_count), radius
+
+
+def test_simple_overpass(api, location):
+    """
+    Sends a basic test query to Overpass API to check if it's reachable and functional.
+    Returns True if at least one restaurant is found, otherwise False.
+    """
+    try:
+        url = OVERPASS_URL
+        simple_query = f"""
+        [out:json][timeout:25];
+        node(around:500,{location.latitude},{location.longitude})[amenity=restaurant];
+        out body;
+        """
+
+        response = get_session().post(url, data={'data': simple_query}, timeout=30)
+        if response.status_code == 200:
+            data = response.json()
+            elements = data.get('elements', [])
+            return len(elements) > 0
+        else:
+            logger.warning(f"Direct HTTP failed: {response.status_code}")
+            return False
+
+    except Exception as e:
+        logger.warning(f"HTTP Test Error: {e}")
+        return False
+
+
+def extract_address_from_tags(tags):
+    """
+    Extracts a full, real address from OSM tags.
+    Only returns addresses if 'street' and 'city' are present.
+    Ignores names, brands, and generic types.
+    """
+    street = tags.get("addr:street", "").strip()
+    housenumber = tags.get("addr:housenumber", "").strip()
+    postcode = tags.get("addr:postcode", "").strip()
+    city = tags.get("addr:city", "").strip()
+
+    if street and city:
+        address_parts = []
+
+        # Add street and optional house number
+        if housenumber:
+            address_parts.append(f"{street} {housenumber}")
+        else:
+            address_parts.append(street)
+
+        # Add postal code and city
+        if postcode:
+            address_parts.append(f"{postcode} {city}")
+        else:
+            address_parts.append(city)
+
+        return ", ".join(address_parts)
+
+    # 🔧 DISCARD EVERYTHING ELSE - even if name, brand, operator are present
+    return None
+
+
+def extract_addresses(tags_list):
+    """
+    Returns the address of every tag dict in tags_list (None where incomplete), in order.
+    """
+    return [extract_address_from_tags(tags) for tags in tags_list]
+
+
+# AnonymizationError: Raised when an address cannot be anonymized; carries a user-facing title
+class AnonymizationError(Exception):
+    def __init__(self, title, message):
+        super().__init__(message)
+        self.title = title
+        self.message = message
+
+
+def anonymize_address(address, geocoder=None, radius=DEFAULT_RADIUS, rng=random,
+                      overpass_limiter=None, cancel_check=None, min_distance=DEFAULT_MIN_DISTANCE,
+                      adaptive=False, keep_candidates=False):
+    """
+    Geocodes an address, fetches nearby public places and picks one at random.
+    Returns a dict with the original and anonymized address and coordinates.
+    Raises AnonymizationError if any step yields no usable result.
+    An optional limiter is acquired before the POI request.
+    cancel_check, if given, is called between stages and may raise to abort.
+    With adaptive, radius is ignored and chosen by get_places_adaptive.
+    With keep_candidates, the result also lists all candidates in 'candidates'
+    (address, coordinates, category and distance of each).
+    """
+    if geocoder is None:
+        geocoder = get_geocoder()
+
+    # Geocoding
+    with span("geocode"):
+        location = geocoder.geocode(address)
+    if not location:
+        raise AnonymizationError(
+            "Address Not Found",
+            "No address found for your input.\nPlease try a different search term."
+        )
+
+    logger.debug(f"Address found: {location.address}")
+
+    if cancel_check is not None:
+        cancel_check()
+
+    if overpass_limiter is not None:
+        overpass_limiter.acquire()
+
+    try:
+        if adaptive:
+            amenities_data, radius = get_places_adaptive(location, rng=rng, min_distance=min_distance,
+                                                         cancel_check=cancel_check)
+        else:
+            amenities_data = get_places_with_fallback(None, location, radius=radius, rng=rng,
+                                                      min_distance=min_distance)  # api=None
+    except Exception as e:
+        if cancel_check is not None:
+            cancel_check()
+        raise AnonymizationError(
+            "API Error", f"Failed to fetch nearby locations.\nError: {e}"
+        )
+
+    if not amenities_data:
+        raise AnonymizationError(
+            "No Locations Found",
+            "No public places found near this address.\nPlease try a different location."
+        )
+
+    if cancel_check is not None:
+        cancel_check()
+
+    with span("selection"):
+        # Keep only candidates with a usable address
+        candidates = [place_data for place_data in amenities_data
+                      if is_valid_address(place_data['address'], place_data['tags'])]
+
+        if not candidates:
+            raise AnonymizationError(
+                "No Valid Addresses",
+                "No valid public place addresses found.\nPlease try a different location."
+            )
+
+        # Random selection
+        selected = rng.choice(candidates)
+    lon, lat = selected['coordinates']
+
+    result = {
+        'original_address': address,
+        'original_latitude': location.latitude,
+        'original_longitude': location.longitude,
+        'address': selected['address'],
+        'latitude': lat,
+        'longitude': lon,
+        'category': selected['category'],
+        'distance': selected.get('distance'),
+        'radius': radius,
+        'candidate_count': len(candidates)
+    }
+    if keep_candidates:
+        result['candidates'] = candidate_records(candidates)
+    return result
+
+
+def candidate_records(places):
+    """
+    Turns places with a usable address into plain records (address,
+    coordinates, category and distance of each) that can be stored as JSON.
+    """
+    return [{
+        'address': place['address'],
+        'latitude': place['coordinates'][1],
+        'longitude': place['coordinates'][0],
+        'category': place['category'],
+        'distance': place.get('distance')
+    } for place in places if is_valid_address(place['address'], place['tags'])]
+
+
+def search_candidates(latitude, longitude, target=DEFAULT_SAMPLE_SIZE, rng=random,
+                      min_distance=DEFAULT_MIN_DISTANCE, cancel_check=None):
+    """
+    Searches public places around coordinates that are already known, without
+    geocoding, with the adaptive radius of get_places_adaptive. The POI cache
+    is bypassed: it holds too small a sample for more than DEFAULT_SAMPLE_SIZE
+    places. Returns (candidates, radius) with candidates as from
+    candidate_records; raises AnonymizationError if the search failed.
+    """
+    location = SimpleNamespace(latitude=latitude, longitude=longitude)
+    places, radius = get_places_adaptive(location, target=target, rng=rng, min_distance=min_distance,
+                                         cancel_check=cancel_check, use_cache=False, strict=True)
+    return candidate_records(places), radius
+
+
+def looks_like_complete_address(text):
+    """
+    Cheap check if typed text is worth geocoding speculatively:
+    long enough and holding a house number or a comma-separated locality.
+    """
+    text = text.strip()
+    return len(text) >= PREFETCH_MIN_LENGTH and ("," in text or any(char.isdigit() for char in text))
+
+
+def prefetch_address(address, geocoder=None, cancel_check=None, min_distance=DEFAULT_MIN_DISTANCE):
+    """
+    Runs the network part of an adaptive anonymize_address ahead of time, so the
+    geocode and POI caches already hold the answers when the address is submitted.
+    Returns the geocoded location, or None if the address was not found.
+    """
+    if geocoder is None:
+        geocoder = get_geocoder()
+
+    # Typed text may still be a fragment: its result is only kept in memory until it is submitted
+    location = geocoder.geocode(address, persist=False)
+    if not location:
+        return None
+
+    if cancel_check is not None:
+        cancel_check()
+
+    get_places_adaptive(location, min_distance=min_distance, cancel_check=cancel_check)
+    return location
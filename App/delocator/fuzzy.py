@@ -0,0 +1,151 @@
+# Similarity matching of addresses on character trigrams of their normalized form
+import threading
+from collections import defaultdict, namedtuple
+
+# Minimum Dice similarity of the street names' trigram sets for two addresses to count as the same
+MATCH_THRESHOLD = 0.8
+
+# Shortest postcode that follows a house number (four digits in Austria and Switzerland)
+POSTCODE_DIGITS = 4
+
+# AddressParts: A normalized address split into the street name, the house
+# number tokens that follow it, and the postcodes and place words after those
+AddressParts = namedtuple("AddressParts", ["street", "numbers", "postcodes", "place"])
+
+
+def trigrams(key):
+    """
+    Returns the set of character trigrams of a normalized address,
+    padded so that word starts and ends count as well.
+    """
+    padded = f"  {key} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def _has_digit(token):
+    return any(char.isdigit() for char in token)
+
+
+def address_parts(key):
+    """
+    Splits a normalized address such as "hauptstrasse 5 3 1010 wien": the
+    words before the first number are the street, the run of numbers after it
+    the house number (with staircase or door), and the rest the postcodes and
+    the place. Within that run, a plain number of POSTCODE_DIGITS or more
+    digits starts the postcode, since the comma before it is gone.
+    """
+    tokens = key.split()
+    first = next((index for index, token in enumerate(tokens) if _has_digit(token)), len(tokens))
+    end = min(first + 1, len(tokens))
+    while end < len(tokens) and _has_digit(tokens[end]) and not (
+            tokens[end].isdigit() and len(tokens[end]) >= POSTCODE_DIGITS):
+        end += 1
+    rest = tokens[end:]
+    return AddressParts(
+        " ".join(tokens[:first]),
+        tuple(tokens[first:end]),
+        tuple(token for token in rest if _has_digit(token)),
+        tuple(token for token in rest if not _has_digit(token))
+    )
+
+
+def same_location(first, second):
+    """
+    Checks the parts of two addresses that must match exactly for them to be
+    the same address: the same, non-empty house number, and the same place or
+    postcode. Where both addresses give a place (or a postcode), it must be
+    equal; at least one of the two must be given by both.
+    """
+    if not first.street or not second.street or not first.numbers or first.numbers != second.numbers:
+        return False
+    compared = False
+    for mine, theirs in ((first.postcodes, second.postcodes), (first.place, second.place)):
+        if mine and theirs:
+            if mine != theirs:
+                return False
+            compared = True
+    return compared
+
+
+# TrigramIndex: Inverted index from the trigrams of street names to
+# normalized addresses (see normalize_address), for finding the known address
+# a misspelled or differently written one stands for. Only the street name is
+# compared by similarity; house number and place must match exactly.
+class TrigramIndex:
+    def __init__(self, threshold=MATCH_THRESHOLD):
+        self.threshold = threshold
+        self._values = {}
+        self._parts = {}
+        self._trigrams = {}
+        self._postings = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, key, value):
+        """
+        Adds a normalized address, or replaces the value stored for it.
+        """
+        if not key:
+            return
+        with self._lock:
+            self._values[key] = value
+            if key not in self._trigrams:
+                parts = address_parts(key)
+                grams = trigrams(parts.street)
+                self._parts[key] = parts
+                self._trigrams[key] = grams
+                for gram in grams:
+                    self._postings[gram].add(key)
+
+    def discard(self, key):
+        with self._lock:
+            self._values.pop(key, None)
+            self._parts.pop(key, None)
+            for gram in self._trigrams.pop(key, ()):
+                self._postings[gram].discard(key)
+                if not self._postings[gram]:
+                    del self._postings[gram]
+
+    def get(self, key):
+        """
+        Returns the value stored for exactly this normalized address, or None.
+        """
+        with self._lock:
+            return self._values.get(key)
+
+    def match(self, key, threshold=None):
+        """
+        Returns (value, score) of the known address with the most similar
+        street name, scored at least threshold (default: the index's), whose
+        house number and place are the same (see same_location), or None.
+        An identical address scores 1.0.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        if not key:
+            return None
+
+        with self._lock:
+            value = self._values.get(key)
+            if value is not None:
+                return value, 1.0
+
+            parts = address_parts(key)
+            grams = trigrams(parts.street)
+            shared = defaultdict(int)
+            for gram in grams:
+                for candidate in self._postings.get(gram, ()):
+                    shared[candidate] += 1
+
+            best = None
+            best_score = threshold
+            for candidate, count in shared.items():
+                # Dice coefficient of the two street names' trigram sets
+                score = 2.0 * count / (len(grams) + len(self._trigrams[candidate]))
+                if score >= best_score and same_location(parts, self._parts[candidate]):
+                    best, best_score = candidate, score
+
+            if best is None:
+                return None
+            return self._values[best], best_score
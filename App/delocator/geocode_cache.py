@@ -0,0 +1,317 @@
+# Persistent geocoding cache keyed on normalized addresses
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, namedtuple
+
+from .fuzzy import TrigramIndex
+from .ratelimit import nominatim_limiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 90 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+MEMORY_ENTRIES = 256
+
+# Result type for cached lookups; has the attributes the app reads from geopy locations
+CachedLocation = namedtuple("CachedLocation", ["address", "latitude", "longitude"])
+
+# Abbreviations expanded before lookup (after case folding, so "ß" is already "ss")
+ABBREVIATIONS = {
+    "str": "strasse",
+    "pl": "platz",
+    "g": "gasse",
+    "ave": "avenue",
+    "rd": "road",
+    "blvd": "boulevard"
+}
+
+_PUNCTUATION = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def normalize_address(address):
+    """
+    Normalizes an address for cache lookups.
+    Ignores case, whitespace and punctuation and expands common abbreviations,
+    so "Hauptstr. 5, Wien" and "hauptstraße 5 wien" share one key.
+    """
+    text = unicodedata.normalize("NFKC", address or "").casefold()
+    tokens = _PUNCTUATION.sub(" ", text).split()
+
+    normalized = []
+    for token in tokens:
+        if token in ABBREVIATIONS:
+            token = ABBREVIATIONS[token]
+        elif token.endswith("str") and len(token) > 3:
+            # Compound street names such as "hauptstr"
+            token = token + "asse"
+        normalized.append(token)
+    return " ".join(normalized)
+
+
+# GeocodeCache: SQLite store of geocoding results with a small in-memory LRU in front.
+# Lookups are exact unless asked otherwise: a trigram index over the stored keys
+# then finds misspelled or differently written forms of an address looked up before.
+class GeocodeCache:
+    def __init__(self, path, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+
+        # Built from the stored keys on the first fuzzy lookup
+        self._fuzzy = None
+        self._memory = OrderedDict()
+        # Speculative lookups (see hold), kept out of the database until submitted
+        self._held = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocode_cache ("
+            " key TEXT PRIMARY KEY,"
+            " address TEXT NOT NULL,"
+            " latitude REAL NOT NULL,"
+            " longitude REAL NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS geocode_cache_last_access ON geocode_cache (last_access)"
+        )
+        # The query as typed is kept for autocomplete; older databases lack the column
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(geocode_cache)")]
+        if "query" not in columns:
+            self._conn.execute("ALTER TABLE geocode_cache ADD COLUMN query TEXT")
+        self._conn.commit()
+
+    def get(self, address, fuzzy=False):
+        """
+        Returns the cached CachedLocation for an address, or None.
+        With fuzzy, a similar address looked up before is accepted as well.
+        """
+        key = normalize_address(address)
+        now = time.time()
+
+        with self._lock:
+            location = self._lookup(key, now)
+            if location is None and fuzzy:
+                similar = self._similar_key(key)
+                if similar is not None:
+                    location = self._lookup(similar, now)
+                    if location is not None:
+                        logger.debug(f"Geocode cache: '{address}' matched '{similar}'")
+                        self.fuzzy_hits += 1
+
+            if location is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return location
+
+    def _lookup(self, key, now):
+        entry = self._memory.get(key)
+        if entry is not None and now - entry[1] <= self.ttl:
+            self._memory.move_to_end(key)
+            return entry[0]
+
+        row = self._conn.execute(
+            "SELECT address, latitude, longitude, created FROM geocode_cache WHERE key = ?",
+            (key,)
+        ).fetchone()
+
+        if row is None or now - row[3] > self.ttl:
+            return None
+
+        self._conn.execute("UPDATE geocode_cache SET last_access = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        location = CachedLocation(row[0], row[1], row[2])
+        self._remember(key, location, row[3])
+        return location
+
+    def _similar_key(self, key):
+        if self._fuzzy is None:
+            self._fuzzy = TrigramIndex()
+            for (stored,) in self._conn.execute("SELECT key FROM geocode_cache"):
+                self._fuzzy.add(stored, stored)
+        match = self._fuzzy.match(key)
+        return match[0] if match is not None else None
+
+    def match(self, address):
+        """
+        Returns the query, as typed then, of a cached lookup for the same or a
+        similar address, or None. Lets near-duplicate inputs share one entry.
+        """
+        key = normalize_address(address)
+        with self._lock:
+            similar = self._similar_key(key)
+            if similar is None:
+                return None
+            row = self._conn.execute(
+                "SELECT query FROM geocode_cache WHERE key = ? AND created >= ?",
+                (similar, time.time() - self.ttl)
+            ).fetchone()
+        if row is None or not row[0]:
+            return None
+        return row[0]
+
+    def put(self, address, location):
+        """
+        Stores a geocoding result (any object with address/latitude/longitude).
+        """
+        key = normalize_address(address)
+        cached = CachedLocation(location.address, location.latitude, location.longitude)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO geocode_cache"
+                " (key, query, address, latitude, longitude, created, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, address.strip(), cached.address, cached.latitude, cached.longitude, now, now)
+            )
+            # Evict least recently used entries beyond the cap
+            evicted = self._conn.execute(
+                "SELECT key FROM geocode_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?",
+                (self.max_entries,)
+            ).fetchall()
+            self._conn.executemany("DELETE FROM geocode_cache WHERE key = ?", evicted)
+            self._conn.commit()
+            self._remember(key, cached, now)
+            if self._fuzzy is not None:
+                self._fuzzy.add(key, key)
+                for (evicted_key,) in evicted:
+                    self._fuzzy.discard(evicted_key)
+        return cached
+
+    def hold(self, address, location):
+        """
+        Keeps the result of a speculative lookup, such as a prefetch of
+        half-typed text, in memory only. It is neither a typed query for
+        autocomplete nor a target of fuzzy matching until taken by take_held().
+        """
+        key = normalize_address(address)
+        cached = CachedLocation(location.address, location.latitude, location.longitude)
+        with self._lock:
+            self._held[key] = (cached, time.time())
+            self._held.move_to_end(key)
+            while len(self._held) > MEMORY_ENTRIES:
+                self._held.popitem(last=False)
+        return cached
+
+    def take_held(self, address):
+        """
+        Returns and forgets the held result for an address, or None.
+        """
+        with self._lock:
+            entry = self._held.pop(normalize_address(address), None)
+        if entry is None or time.time() - entry[1] > self.ttl:
+            return None
+        return entry[0]
+
+    def _remember(self, key, location, created):
+        self._memory[key] = (location, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def queries(self):
+        """
+        Returns the addresses that were looked up, as typed, most recently used first.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query FROM geocode_cache WHERE query IS NOT NULL AND created >= ?"
+                " ORDER BY last_access DESC",
+                (time.time() - self.ttl,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def clear(self):
+        """
+        Removes all cached lookups, including the queries kept for autocomplete.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM geocode_cache")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+            self._memory.clear()
+            self._held.clear()
+            self._fuzzy = None
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'fuzzy_hits': self.fuzzy_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# CachingGeocoder: Geocoder front-end that answers from the cache and sends
+# misses through the shared Nominatim rate-limit scheduler
+class CachingGeocoder:
+    def __init__(self, geocoder, limiter=nominatim_limiter):
+        self.geocoder = geocoder
+        self.limiter = limiter
+
+    def geocode(self, address, persist=True):
+        """
+        Geocodes an address, from the cache if possible. Without persist (for
+        speculative lookups) a new result is only held in memory; it is stored
+        once the same address is geocoded with persist.
+        """
+        cache = get_geocode_cache()
+        if cache is not None:
+            cached = cache.get(address)
+            if cached is not None:
+                return cached
+            held = cache.take_held(address)
+            if held is not None:
+                if persist:
+                    return cache.put(address, held)
+                cache.hold(address, held)
+                return held
+
+        waited = self.limiter.acquire()
+        if waited > 0:
+            logger.debug(f"Geocoding queued for {waited:.2f}s (Nominatim rate limit)")
+
+        location = self.geocoder.geocode(address)
+        if location and cache is not None:
+            if persist:
+                cache.put(address, location)
+            else:
+                cache.hold(address, location)
+        return location
+
+
+# Shared cache instance used by CachingGeocoder
+_geocode_cache = None
+
+
+def configure_geocode_cache(path, **kwargs):
+    """
+    Opens the shared geocode cache at the given path and returns it.
+    """
+    global _geocode_cache
+    if _geocode_cache is not None:
+        _geocode_cache.close()
+    _geocode_cache = GeocodeCache(path, **kwargs)
+    return _geocode_cache
+
+
+def get_geocode_cache():
+    """
+    Returns the shared geocode cache, or None if caching is not configured.
+    """
+    return _geocode_cache
@@ -0,0 +1,192 @@
+# Local history of anonymizations, indexed by normalized original address
+import json
+import random
+import sqlite3
+import threading
+import time
+
+from .geocode_cache import normalize_address
+
+# Candidate sets older than this are searched again instead of being reused.
+# Rows of either table are deleted at this age, as they hold home addresses in plain text.
+REPLAY_MAX_AGE = 30 * 24 * 3600
+
+
+# AnonymizationHistory: SQLite database with one row per anonymization and the
+# candidate set last found for each original address. Both tables are keyed
+# on the normalized address, so lookups stay a B-tree search at any size.
+# Nothing is kept longer than replay_max_age; clear() forgets everything at once.
+class AnonymizationHistory:
+    def __init__(self, path, replay_max_age=REPLAY_MAX_AGE):
+        self.path = path
+        self.replay_max_age = replay_max_age
+        self.replays = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            " id INTEGER PRIMARY KEY,"
+            " key TEXT NOT NULL,"
+            " original_address TEXT NOT NULL,"
+            " address TEXT NOT NULL,"
+            " latitude REAL NOT NULL,"
+            " longitude REAL NOT NULL,"
+            " category TEXT,"
+            " distance REAL,"
+            " created REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS history_key ON history (key, created)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS history_created ON history (created)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS candidate_sets ("
+            " key TEXT PRIMARY KEY,"
+            " original_latitude REAL NOT NULL,"
+            " original_longitude REAL NOT NULL,"
+            " radius INTEGER,"
+            " candidates TEXT NOT NULL,"
+            " created REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self.prune()
+
+    def prune(self):
+        """
+        Deletes the anonymizations and candidate sets older than replay_max_age.
+        Returns the number of rows deleted.
+        """
+        cutoff = time.time() - self.replay_max_age
+        with self._lock:
+            deleted = self._prune(cutoff)
+            self._conn.commit()
+        return deleted
+
+    def _prune(self, cutoff):
+        deleted = self._conn.execute("DELETE FROM history WHERE created < ?", (cutoff,)).rowcount
+        deleted += self._conn.execute("DELETE FROM candidate_sets WHERE created < ?", (cutoff,)).rowcount
+        return deleted
+
+    def clear(self):
+        """
+        Deletes all anonymizations and candidate sets, and compacts the file so
+        the deleted addresses do not linger in free pages.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM history")
+            self._conn.execute("DELETE FROM candidate_sets")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+
+    def record(self, result):
+        """
+        Stores one anonymization result. If it lists its candidates
+        (anonymize_address with keep_candidates), they replace the set kept for the address.
+        """
+        key = normalize_address(result['original_address'])
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO history"
+                " (key, original_address, address, latitude, longitude, category, distance, created)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, result['original_address'], result['address'], result['latitude'], result['longitude'],
+                 result.get('category'), result.get('distance'), now)
+            )
+            if result.get('candidates'):
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO candidate_sets"
+                    " (key, original_latitude, original_longitude, radius, candidates, created)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, result['original_latitude'], result['original_longitude'], result.get('radius'),
+                     json.dumps(result['candidates'], ensure_ascii=False), now)
+                )
+            self._prune(now - self.replay_max_age)
+            self._conn.commit()
+
+    def replay(self, address, rng=random):
+        """
+        Anonymizes an address seen before without any network request, by picking
+        again at random from its stored candidates. Returns a result like
+        anonymize_address, or None if the address is unknown or its candidates are too old.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT original_latitude, original_longitude, radius, candidates FROM candidate_sets"
+                " WHERE key = ? AND created >= ?",
+                (normalize_address(address), time.time() - self.replay_max_age)
+            ).fetchone()
+        if row is None:
+            return None
+
+        candidates = json.loads(row[3])
+        selected = rng.choice(candidates)
+        self.replays += 1
+        return {
+            'original_address': address,
+            'original_latitude': row[0],
+            'original_longitude': row[1],
+            'address': selected['address'],
+            'latitude': selected['latitude'],
+            'longitude': selected['longitude'],
+            'category': selected['category'],
+            'distance': selected.get('distance'),
+            'radius': row[2],
+            'candidate_count': len(candidates),
+            'candidates': candidates
+        }
+
+    def knows(self, address):
+        """
+        Checks if replay() can answer for an address.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM candidate_sets WHERE key = ? AND created >= ?",
+                (normalize_address(address), time.time() - self.replay_max_age)
+            ).fetchone()
+        return row is not None
+
+    def entries(self, address=None, limit=100):
+        """
+        Returns the latest anonymizations, newest first; only those of one original address if given.
+        """
+        query = "SELECT original_address, address, latitude, longitude, category, distance, created FROM history"
+        params = ()
+        if address is not None:
+            query += " WHERE key = ?"
+            params = (normalize_address(address),)
+        query += " ORDER BY created DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(query, params + (limit,)).fetchall()
+        fields = ('original_address', 'address', 'latitude', 'longitude', 'category', 'distance', 'created')
+        return [dict(zip(fields, row)) for row in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Shared history used by the app
+_history = None
+
+
+def configure_history(path, **kwargs):
+    """
+    Opens the shared history database at the given path and returns it.
+    """
+    global _history
+    if _history is not None:
+        _history.close()
+    _history = AnonymizationHistory(path, **kwargs)
+    return _history
+
+
+def get_history():
+    """
+    Returns the shared history, or None if none is configured.
+    """
+    return _history
@@ -0,0 +1,184 @@
+# Logging setup and per-stage timing of the anonymization pipeline
+import cProfile
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Pipeline stages reported by stage_stats(), in pipeline order
+STAGES = ("geocode", "overpass_request", "parse", "selection", "tile_warmup", "ui_update")
+WINDOW_SIZE = 200
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_windows = {}
+_windows_lock = threading.Lock()
+_trace = None
+
+
+def configure_logging(level=None):
+    """
+    Sets up the "delocator" logger. It is silent (warnings only) unless a
+    level is passed or the DELOCATOR_LOG_LEVEL environment variable is set.
+    Also enables profiling/tracing output from DELOCATOR_TRACE.
+    """
+    if level is None:
+        level = os.environ.get("DELOCATOR_LOG_LEVEL", "WARNING")
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+
+    logger = logging.getLogger("delocator")
+    logger.setLevel(level)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logger.addHandler(handler)
+        # Keep messages out of host frameworks' root handlers (e.g. Kivy's)
+        logger.propagate = False
+
+    trace_path = os.environ.get("DELOCATOR_TRACE")
+    if trace_path:
+        enable_trace(trace_path)
+    return logger
+
+
+# _TraceWriter: Appends spans to a Chrome trace-event file (chrome://tracing, Perfetto)
+class _TraceWriter:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "w")
+        # The closing bracket is optional in the trace-event format, so the
+        # file stays valid even if the app is killed
+        self._file.write("[\n")
+        self._pid = os.getpid()
+
+    def write(self, name, started, duration):
+        event = {
+            'name': name,
+            'ph': "X",
+            'ts': int(started * 1e6),
+            'dur': int(duration * 1e6),
+            'pid': self._pid,
+            'tid': threading.get_ident()
+        }
+        with self._lock:
+            self._file.write(json.dumps(event) + ",\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def enable_trace(path):
+    """
+    Starts writing every timing span to a trace-event file.
+    """
+    global _trace
+    disable_trace()
+    _trace = _TraceWriter(path)
+
+
+def disable_trace():
+    global _trace
+    if _trace is not None:
+        _trace.close()
+        _trace = None
+
+
+def record(stage, duration, started=None):
+    """
+    Adds one duration (in seconds) to the rolling window of a stage.
+    """
+    with _windows_lock:
+        window = _windows.get(stage)
+        if window is None:
+            window = _windows[stage] = deque(maxlen=WINDOW_SIZE)
+        window.append(duration)
+    if _trace is not None:
+        _trace.write(stage, started if started is not None else time.perf_counter() - duration, duration)
+
+
+@contextmanager
+def span(stage):
+    """
+    Times the enclosed block and records it under the given stage name.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - started, started)
+
+
+def _percentile(ordered, fraction):
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def stage_stats():
+    """
+    Returns {stage: {count, p50_ms, p95_ms, last_ms}} over the rolling windows.
+    """
+    with _windows_lock:
+        snapshot = {stage: list(window) for stage, window in _windows.items()}
+
+    ordered_stages = [stage for stage in STAGES if stage in snapshot]
+    ordered_stages += sorted(stage for stage in snapshot if stage not in STAGES)
+
+    stats = {}
+    for stage in ordered_stages:
+        samples = snapshot[stage]
+        ordered = sorted(samples)
+        stats[stage] = {
+            'count': len(samples),
+            'p50_ms': _percentile(ordered, 0.50) * 1000,
+            'p95_ms': _percentile(ordered, 0.95) * 1000,
+            'last_ms': samples[-1] * 1000
+        }
+    return stats
+
+
+def format_stage_stats(stats=None):
+    """
+    Formats stage_stats() as a plain-text table.
+    """
+    stats = stage_stats() if stats is None else stats
+    if not stats:
+        return "No timings recorded yet."
+
+    lines = [f"{'stage':<18}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'last ms':>10}"]
+    for stage, values in stats.items():
+        lines.append(f"{stage:<18}{values['count']:>6}{values['p50_ms']:>10.1f}"
+                     f"{values['p95_ms']:>10.1f}{values['last_ms']:>10.1f}")
+    return "\n".join(lines)
+
+
+def reset_stage_stats():
+    with _windows_lock:
+        _windows.clear()
+
+
+@contextmanager
+def profiling(path=None):
+    """
+    Runs the enclosed block under cProfile and dumps the stats to path.
+    Defaults to the DELOCATOR_PROFILE environment variable; does nothing if neither is set.
+    """
+    path = path or os.environ.get("DELOCATOR_PROFILE")
+    if not path:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        logging.getLogger(__name__).info(f"Profile written to {path}")
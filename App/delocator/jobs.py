@@ -0,0 +1,193 @@
+# Single-worker job scheduler with coalescing, cancellation and deadlines
+import logging
+import threading
+import time
+from collections import deque
+
+DEFAULT_TIMEOUT = 30.0
+
+logger = logging.getLogger(__name__)
+
+
+# JobCancelled: Raised inside a job when it was cancelled or superseded
+class JobCancelled(Exception):
+    pass
+
+
+# JobTimeout: Passed to on_error when a job misses its deadline
+class JobTimeout(Exception):
+    pass
+
+
+# Job: One unit of background work and the callbacks waiting for its result.
+# The timeout counts from when the job starts, so time spent queued behind
+# other jobs does not use it up.
+class Job:
+    def __init__(self, key, func, channel, timeout):
+        self.key = key
+        self.func = func
+        self.channel = channel
+        self.timeout = timeout
+        self.deadline = None
+        self.callbacks = []
+        self._cancelled = threading.Event()
+
+    def start(self):
+        if self.timeout:
+            self.deadline = time.monotonic() + self.timeout
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self):
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+    @property
+    def is_current(self):
+        """
+        True while the job's result is still wanted.
+        """
+        return not self.cancelled and not self.expired
+
+    def raise_if_cancelled(self):
+        """
+        Cooperative cancellation point for long-running job functions.
+        """
+        if self.cancelled:
+            raise JobCancelled(self.key)
+        if self.expired:
+            raise JobTimeout(self.key)
+
+
+# JobScheduler: Runs jobs one at a time on a single background thread.
+# Submitting a key that is already queued or running attaches to that job
+# instead of starting a new one; every submit supersedes (cancels) the
+# earlier jobs of the same channel.
+class JobScheduler:
+    def __init__(self, name="delocator-worker"):
+        self.name = name
+        self._queue = deque()
+        self._in_flight = {}
+        self._latest = {}
+        self._condition = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, key, func, on_done=None, on_error=None, channel="default", timeout=DEFAULT_TIMEOUT):
+        """
+        Schedules func(job) and returns the Job.
+        on_done(job, result) and on_error(job, exception) are called on the
+        worker thread, and only if the job was not cancelled.
+        """
+        with self._condition:
+            job = self._in_flight.get(key)
+            if job is None or not job.is_current:
+                job = Job(key, func, channel, timeout)
+                self._in_flight[key] = job
+                self._queue.append(job)
+            else:
+                logger.debug(f"Coalesced job: {key}")
+
+            job.callbacks.append((on_done, on_error))
+
+            # A newer request makes earlier ones in the same channel obsolete
+            previous = self._latest.get(channel)
+            if previous is not None and previous is not job:
+                previous.cancel()
+            self._latest[channel] = job
+
+            self._condition.notify()
+        return job
+
+    def cancel(self, channel="default"):
+        """
+        Cancels the latest job of a channel, queued or running.
+        """
+        with self._condition:
+            job = self._latest.pop(channel, None)
+            if job is not None:
+                job.cancel()
+
+    def shutdown(self):
+        with self._condition:
+            self._running = False
+            for job in self._queue:
+                job.cancel()
+            self._queue.clear()
+            self._condition.notify()
+
+    def _next_job(self):
+        with self._condition:
+            while self._running:
+                while self._queue:
+                    job = self._queue.popleft()
+                    if job.cancelled:
+                        self._forget(job)
+                        continue
+                    return job
+                self._condition.wait()
+            return None
+
+    def _forget(self, job):
+        # Called with the condition held
+        if self._in_flight.get(job.key) is job:
+            del self._in_flight[job.key]
+        if self._latest.get(job.channel) is job:
+            del self._latest[job.channel]
+
+    def _run(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+
+            result = error = None
+            job.start()
+            try:
+                job.raise_if_cancelled()
+                result = job.func(job)
+            except JobCancelled:
+                pass
+            except Exception as e:
+                error = e
+
+            with self._condition:
+                self._forget(job)
+                callbacks = list(job.callbacks)
+
+            if job.cancelled:
+                logger.debug(f"Dropped result of cancelled job: {job.key}")
+                continue
+
+            for on_done, on_error in callbacks:
+                try:
+                    if error is not None:
+                        if on_error is not None:
+                            on_error(job, error)
+                    elif on_done is not None:
+                        on_done(job, result)
+                except Exception:
+                    logger.exception(f"Callback of job {job.key} failed")
+
+
+# Shared scheduler of the app
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """
+    Returns the shared background job scheduler.
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = JobScheduler()
+    return _scheduler
@@ -0,0 +1,190 @@
+# Android notification and BroadcastReceiver for the favorites, updated only when they change.
+# The Java layer (pyjnius' autoclass and a BroadcastReceiver factory) is passed in,
+# so the manager also runs against a stand-in off the device.
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_ID = 1
+CHANNEL_ID = "saved_locations_channel"
+# Android shows at most three action buttons per notification; the first favorites get them
+MAX_ACTIONS = 3
+REQUEST_CODE_BASE = 1000
+# Registration flag for receivers other apps (the notification) may call, Android 13+
+RECEIVER_EXPORTED = 2
+
+ICON_NAMES = {
+    "icons/home.png": "Home",
+    "icons/work.png": "Work",
+    "icons/family.png": "Family"
+}
+
+
+def notification_actions(locations, limit=MAX_ACTIONS):
+    """
+    Returns the (label, address) of each action button for the given favorites.
+    """
+    return [(ICON_NAMES.get(location.get("icon") or "", "Location"), str(location["address"]))
+            for location in locations[:limit]]
+
+
+def actions_digest(actions):
+    """
+    Content hash of the action buttons; equal hashes mean the notification is up to date.
+    """
+    return hashlib.sha1(json.dumps(actions, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+# FavoritesNotifier: Keeps the favorites notification and the receiver for its
+# buttons in step with the saved locations. Each call compares against what
+# was last registered or posted and does nothing (no Java calls beyond a check
+# that the notification is still shown) if the favorites did not change.
+class FavoritesNotifier:
+    def __init__(self, autoclass, receiver_factory, max_actions=MAX_ACTIONS):
+        self.autoclass = autoclass
+        self.receiver_factory = receiver_factory
+        self.max_actions = max_actions
+
+        self.receiver = None
+        self._receiver_actions = ()
+        self._posted_digest = None
+        self._java = None
+
+    def _classes(self):
+        # Java classes and the context are looked up once; every autoclass call crosses JNI
+        if self._java is None:
+            autoclass = self.autoclass
+            context = autoclass('org.kivy.android.PythonActivity').mActivity
+            Context = autoclass('android.content.Context')
+            self._java = {
+                'context': context,
+                'package': context.getPackageName(),
+                'manager': context.getSystemService(Context.NOTIFICATION_SERVICE),
+                'sdk': autoclass('android.os.Build$VERSION').SDK_INT,
+                'NotificationManager': autoclass('android.app.NotificationManager'),
+                'NotificationChannel': autoclass('android.app.NotificationChannel'),
+                'Builder': autoclass('androidx.core.app.NotificationCompat$Builder'),
+                'PendingIntent': autoclass('android.app.PendingIntent'),
+                'Intent': autoclass('android.content.Intent'),
+                'IntentFilter': autoclass('android.content.IntentFilter'),
+                'String': autoclass('java.lang.String')
+            }
+        return self._java
+
+    def _action_name(self, index):
+        return f"{self._classes()['package']}.copy_address_{index}"
+
+    def sync_receiver(self, locations):
+        """
+        Registers the receiver for the buttons the favorites need. It is only
+        replaced when the number of buttons changes; their addresses travel in
+        the intents. Returns True if anything was (un)registered.
+        """
+        count = min(len(locations), self.max_actions)
+        actions = tuple(self._action_name(index) for index in range(count)) if count else ()
+        if actions == self._receiver_actions:
+            return False
+
+        self._unregister()
+        if actions:
+            java = self._classes()
+            intent_filter = java['IntentFilter']()
+            for action in actions:
+                intent_filter.addAction(action)
+
+            self.receiver = self.receiver_factory(list(actions))
+            if java['sdk'] >= 33:
+                java['context'].registerReceiver(self.receiver.receiver, intent_filter, RECEIVER_EXPORTED)
+            else:
+                java['context'].registerReceiver(self.receiver.receiver, intent_filter)
+            logger.debug(f"BroadcastReceiver registered with {len(actions)} actions")
+        self._receiver_actions = actions
+        return True
+
+    def _unregister(self):
+        if self.receiver is None:
+            return
+        try:
+            self._classes()['context'].unregisterReceiver(self.receiver.receiver)
+            logger.debug("BroadcastReceiver unregistered")
+        except Exception as e:
+            logger.warning(f"Error unregistering BroadcastReceiver: {e}")
+        self.receiver = None
+        self._receiver_actions = ()
+
+    def _is_shown(self):
+        # The user may have swiped the notification away since it was posted
+        java = self._classes()
+        if java['sdk'] < 23:
+            return True
+        return any(notification.getId() == NOTIFICATION_ID
+                   for notification in java['manager'].getActiveNotifications())
+
+    def post(self, locations, repost_dismissed=True):
+        """
+        Shows the notification with a button per favorite, or updates it in
+        place (same id and request codes) if its content changed. An unchanged
+        notification the user dismissed is shown again if repost_dismissed.
+        Returns True if the notification was (re)posted or removed.
+        """
+        actions = notification_actions(locations, self.max_actions)
+        digest = actions_digest(actions)
+        if digest == self._posted_digest and (not actions or not repost_dismissed or self._is_shown()):
+            return False
+
+        java = self._classes()
+        if not actions:
+            java['manager'].cancel(NOTIFICATION_ID)
+            self._posted_digest = digest
+            logger.debug("No saved locations; notification removed")
+            return True
+
+        self._ensure_channel()
+        builder = java['Builder'](java['context'], CHANNEL_ID)
+        builder.setSmallIcon(java['context'].getApplicationInfo().icon)
+        builder.setContentTitle("Saved Locations")
+        builder.setContentText("Tap a location to copy the address")
+        builder.setAutoCancel(True)
+        builder.setOnlyAlertOnce(True)
+
+        PendingIntent = java['PendingIntent']
+        if java['sdk'] >= 31:
+            flags = PendingIntent.FLAG_MUTABLE | PendingIntent.FLAG_UPDATE_CURRENT
+        else:
+            flags = PendingIntent.FLAG_UPDATE_CURRENT
+
+        for index, (label, address) in enumerate(actions):
+            intent = java['Intent']()
+            intent.setAction(self._action_name(index))
+            intent.setPackage(java['package'])
+            intent.putExtra("address", java['String'](address))
+            # FLAG_UPDATE_CURRENT replaces the extras of the existing PendingIntent for this button
+            pending_intent = PendingIntent.getBroadcast(java['context'], REQUEST_CODE_BASE + index, intent, flags)
+            builder.addAction(0, java['String'](label), pending_intent)
+
+        java['manager'].notify(NOTIFICATION_ID, builder.build())
+        self._posted_digest = digest
+        logger.debug(f"Notification with {len(actions)} saved locations posted")
+        return True
+
+    def _ensure_channel(self):
+        java = self._classes()
+        if java['sdk'] >= 26 and java['manager'].getNotificationChannel(CHANNEL_ID) is None:
+            channel = java['NotificationChannel'](
+                CHANNEL_ID, "Saved Locations", java['NotificationManager'].IMPORTANCE_DEFAULT
+            )
+            java['manager'].createNotificationChannel(channel)
+
+    def on_change(self, locations):
+        """
+        Follows a change of the favorites: fixes the receiver and, if the
+        notification was posted before, updates it in place.
+        """
+        self.sync_receiver(locations)
+        if self._posted_digest is not None:
+            self.post(locations, repost_dismissed=False)
+
+    def close(self):
+        self._unregister()
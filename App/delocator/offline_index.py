@@ -0,0 +1,247 @@
+# On-device POI index imported from a regional OSM PBF extract
+import json
+import math
+import sqlite3
+import threading
+import time
+
+# Grid cells of 0.01 degrees (about 1.1 km north-south) bucket the POIs
+CELL_SIZE = 0.01
+# Same as spatial.EARTH_RADIUS; spatial (and numpy) is only loaded for the first query
+EARTH_RADIUS = 6371000.0
+# POIs fetched per SELECT, below SQLite's host parameter limit
+QUERY_CHUNK_SIZE = 900
+
+
+def radius_bbox(lat, lon, radius):
+    """
+    Returns (south, west, north, east) of the box enclosing a circle.
+    """
+    d_lat = math.degrees(radius / EARTH_RADIUS)
+    d_lon = math.degrees(radius / (EARTH_RADIUS * max(math.cos(math.radians(lat)), 1e-6)))
+    return lat - d_lat, lon - d_lon, lat + d_lat, lon + d_lon
+
+
+def _cell(value):
+    return int(math.floor(value / CELL_SIZE))
+
+
+# OfflinePoiIndex: SQLite table of candidate records bucketed into grid cells
+class OfflinePoiIndex:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pois ("
+            " osm_type TEXT NOT NULL,"
+            " osm_id INTEGER NOT NULL,"
+            " latitude REAL NOT NULL,"
+            " longitude REAL NOT NULL,"
+            " cell_lat INTEGER NOT NULL,"
+            " cell_lon INTEGER NOT NULL,"
+            " address TEXT NOT NULL,"
+            " category TEXT NOT NULL,"
+            " tags TEXT NOT NULL,"
+            " PRIMARY KEY (osm_type, osm_id))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pois_cell ON pois (cell_lat, cell_lon)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS coverage ("
+            " source TEXT PRIMARY KEY, south REAL, west REAL, north REAL, east REAL, imported REAL)"
+        )
+        self._conn.commit()
+        self._coverage = self._load_coverage()
+        self._grid = None
+        self._rowids = None
+
+    def _load_coverage(self):
+        return self._conn.execute("SELECT south, west, north, east FROM coverage").fetchall()
+
+    def covers(self, lat, lon, radius):
+        """
+        Checks if the whole search circle lies inside an imported extract.
+        """
+        south, west, north, east = radius_bbox(lat, lon, radius)
+        return any(
+            south >= c_south and west >= c_west and north <= c_north and east <= c_east
+            for c_south, c_west, c_north, c_east in self._coverage
+        )
+
+    def _spatial_index(self):
+        # Coordinates of all POIs are loaded once into an in-memory grid index;
+        # records are only read from SQLite for the points a query selects
+        if self._grid is None:
+            import numpy as np
+
+            from .spatial import GridIndex
+
+            rows = self._conn.execute("SELECT rowid, latitude, longitude FROM pois").fetchall()
+            data = np.array(rows, dtype=np.float64).reshape(-1, 3)
+            self._rowids = data[:, 0].astype(np.int64)
+            self._grid = GridIndex(data[:, 1], data[:, 2], CELL_SIZE)
+        return self._grid
+
+    def query(self, lat, lon, radius, min_distance=0.0):
+        """
+        Returns candidate records between min_distance and radius meters of (lat, lon),
+        each with its distance in meters.
+        """
+        with self._lock:
+            indices, distances = self._spatial_index().query(lat, lon, radius, min_distance)
+            if not len(indices):
+                return []
+
+            rowids = self._rowids[indices].tolist()
+            rows = []
+            # Older SQLite builds allow at most 999 parameters per statement
+            for start in range(0, len(rowids), QUERY_CHUNK_SIZE):
+                chunk = rowids[start:start + QUERY_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(self._conn.execute(
+                    f"SELECT rowid, latitude, longitude, address, category, tags FROM pois"
+                    f" WHERE rowid IN ({placeholders})",
+                    chunk
+                ).fetchall())
+
+        distance_by_rowid = dict(zip(rowids, distances.tolist()))
+        return [{
+            'address': address,
+            'coordinates': (poi_lon, poi_lat),
+            'category': category,
+            'tags': json.loads(tags),
+            'distance': distance_by_rowid[rowid]
+        } for rowid, poi_lat, poi_lon, address, category, tags in rows]
+
+    def addresses(self):
+        """
+        Returns the distinct addresses of all imported POIs.
+        """
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT address FROM pois")]
+
+    def add(self, osm_type, osm_id, candidate):
+        lon, lat = candidate['coordinates']
+        self._conn.execute(
+            "INSERT OR REPLACE INTO pois"
+            " (osm_type, osm_id, latitude, longitude, cell_lat, cell_lon, address, category, tags)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (osm_type, osm_id, lat, lon, _cell(lat), _cell(lon),
+             candidate['address'], candidate['category'], json.dumps(candidate['tags']))
+        )
+
+    def set_coverage(self, source, bbox):
+        south, west, north, east = bbox
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO coverage (source, south, west, north, east, imported)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (source, south, west, north, east, time.time())
+            )
+            self._conn.commit()
+            self._coverage = self._load_coverage()
+
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+            self._grid = None
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pois").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def build_index_from_pbf(pbf_path, index_path):
+    """
+    Imports every element of a PBF extract that matches PLACE_CATEGORIES and
+    has a street and city into the index. Ways are placed at the center of
+    their bounding box, like Overpass' "out center".
+    Returns the number of imported POIs.
+    """
+    # Imported here: the engine itself uses this module for lookups
+    from .engine import element_to_candidate, matches_place_categories
+    from .pbf import PbfReader
+
+    reader = PbfReader(pbf_path)
+    index = OfflinePoiIndex(index_path)
+    imported = 0
+    pending_ways = []
+    needed_nodes = set()
+    south = west = math.inf
+    north = east = -math.inf
+
+    # Pass 1: tagged nodes become candidates directly; matching ways wait for their node coordinates
+    for element in reader.iter_elements(tagged_nodes_only=True):
+        if element[0] == "node":
+            _, node_id, lat, lon, tags = element
+            if not matches_place_categories(tags):
+                continue
+            candidate = element_to_candidate({'lat': lat, 'lon': lon, 'tags': tags})
+            if candidate is not None:
+                index.add("node", node_id, candidate)
+                imported += 1
+                south, west, north, east = min(south, lat), min(west, lon), max(north, lat), max(east, lon)
+        else:
+            _, way_id, refs, tags = element
+            if refs and matches_place_categories(tags) and element_to_candidate(
+                    {'lat': 1, 'lon': 1, 'tags': tags}) is not None:
+                pending_ways.append((way_id, refs, tags))
+                needed_nodes.update(refs)
+
+    # Pass 2: look up the coordinates of the nodes the candidate ways consist of
+    if pending_ways:
+        coordinates = {}
+        for _, node_id, lat, lon, _ in reader.iter_elements(ways=False, node_ids=needed_nodes):
+            coordinates[node_id] = (lat, lon)
+
+        for way_id, refs, tags in pending_ways:
+            points = [coordinates[ref] for ref in refs if ref in coordinates]
+            if not points:
+                continue
+            lats = [point[0] for point in points]
+            lons = [point[1] for point in points]
+            lat = (min(lats) + max(lats)) / 2
+            lon = (min(lons) + max(lons)) / 2
+            candidate = element_to_candidate({'center': {'lat': lat, 'lon': lon}, 'tags': tags})
+            if candidate is not None:
+                index.add("way", way_id, candidate)
+                imported += 1
+                south, west, north, east = min(south, lat), min(west, lon), max(north, lat), max(east, lon)
+
+    index.commit()
+
+    # Prefer the extract's declared bounds; fall back to the extent of the imported POIs
+    bbox = reader.bbox()
+    if bbox is None or None in bbox:
+        bbox = (south, west, north, east) if imported else None
+    if bbox is not None:
+        index.set_coverage(pbf_path, bbox)
+
+    index.close()
+    return imported
+
+
+# Shared index used by get_places_with_fallback
+_offline_index = None
+
+
+def configure_offline_index(path):
+    """
+    Opens the shared offline POI index at the given path and returns it.
+    """
+    global _offline_index
+    if _offline_index is not None:
+        _offline_index.close()
+    _offline_index = OfflinePoiIndex(path)
+    return _offline_index
+
+
+def get_offline_index():
+    """
+    Returns the shared offline POI index, or None if none is configured.
+    """
+    return _offline_index
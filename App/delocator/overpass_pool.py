@@ -0,0 +1,247 @@
+# Overpass endpoint pool with failover, hedged requests and per-endpoint circuit breakers
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .clients import POOL_MAXSIZE, get_session
+
+# Every endpoint may be sent the coordinates searched around, so only the main
+# instance is used unless more are configured explicitly (configure_overpass_endpoints).
+# Configured endpoints are tried in order while their latencies are unknown.
+DEFAULT_ENDPOINTS = (
+    "https://overpass-api.de/api/interpreter",
+)
+
+# A duplicate request goes to the next endpoint once the current one has not
+# answered for this long, or for HEDGE_FACTOR times its usual latency if that is longer
+HEDGE_DELAY = 2.0
+HEDGE_FACTOR = 2.0
+# At most this many endpoints are asked per request, hedges and failovers included
+MAX_ATTEMPTS = 3
+# Responses that mean "try another server"; anything else is returned to the caller
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Circuit breaker: consecutive failures that open it, and how long it stays open
+FAILURE_THRESHOLD = 3
+COOLDOWN = 30.0
+MAX_COOLDOWN = 300.0
+# An endpoint whose average latency exceeds this is treated as failing
+SLOW_LATENCY = 15.0
+# Weight of a new sample in the latency moving average
+LATENCY_SMOOTHING = 0.3
+
+logger = logging.getLogger(__name__)
+
+
+# OverpassUnavailable: Raised when no endpoint produced a usable response
+class OverpassUnavailable(Exception):
+    pass
+
+
+# Endpoint: Health and latency statistics of one Overpass server.
+# The breaker is closed while the endpoint works, open (skipped) for a cooldown
+# after repeated failures, then half-open: a single probe request decides.
+class Endpoint:
+    def __init__(self, url):
+        self.url = url
+        self.latency = None
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.cooldown = COOLDOWN
+        self.probing = False
+
+    @property
+    def state(self):
+        if not self.open_until:
+            return "closed"
+        return "open" if time.monotonic() < self.open_until else "half-open"
+
+    def hedge_delay(self, minimum=HEDGE_DELAY):
+        if self.latency is None:
+            return minimum
+        return max(minimum, HEDGE_FACTOR * self.latency)
+
+    def record_success(self, latency):
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.probing = False
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency = (1 - LATENCY_SMOOTHING) * self.latency + LATENCY_SMOOTHING * latency
+
+        if self.latency > SLOW_LATENCY and self.successes >= FAILURE_THRESHOLD:
+            self._trip(f"average latency {self.latency:.1f}s")
+        elif self.open_until:
+            logger.info(f"Overpass endpoint recovered: {self.url}")
+            self.open_until = 0.0
+            self.cooldown = COOLDOWN
+
+    def record_failure(self, error):
+        self.failures += 1
+        self.consecutive_failures += 1
+        # A failed probe reopens the breaker right away
+        if self.probing or self.consecutive_failures >= FAILURE_THRESHOLD:
+            self._trip(error)
+        self.probing = False
+
+    def _trip(self, reason):
+        self.open_until = time.monotonic() + self.cooldown
+        logger.warning(f"Overpass endpoint {self.url} disabled for {self.cooldown:.0f}s: {reason}")
+        self.cooldown = min(MAX_COOLDOWN, self.cooldown * 2)
+
+
+# OverpassPool: Sends each query to the best available endpoint, hedges slow
+# requests to the next one and returns the first usable response
+class OverpassPool:
+    def __init__(self, urls=DEFAULT_ENDPOINTS, hedge_delay=HEDGE_DELAY, max_attempts=MAX_ATTEMPTS):
+        if not urls:
+            raise ValueError("At least one Overpass endpoint is required")
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.hedge_delay = hedge_delay
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=POOL_MAXSIZE, thread_name_prefix="overpass")
+
+    def _ranked(self):
+        """
+        Returns the endpoints to try, best first: closed breakers ordered by
+        latency (unknown counts as the hedge delay), then at most one
+        half-open endpoint as probe. If every breaker is open, the one that
+        opened first is tried anyway.
+        """
+        with self._lock:
+            now = time.monotonic()
+            closed = [e for e in self.endpoints if not e.open_until]
+            closed.sort(key=lambda e: e.latency if e.latency is not None else self.hedge_delay)
+            probes = [e for e in self.endpoints if e.open_until and now >= e.open_until and not e.probing]
+            ranked = closed + probes[:1]
+            if not ranked:
+                ranked = [min(self.endpoints, key=lambda e: e.open_until)]
+            return ranked[:self.max_attempts]
+
+    def _attempt(self, endpoint, data, timeout):
+        started = time.perf_counter()
+        try:
+            response = get_session().post(endpoint.url, data=data, timeout=timeout, stream=True)
+        except Exception as e:
+            with self._lock:
+                endpoint.record_failure(e)
+            raise
+
+        with self._lock:
+            if response.status_code in RETRY_STATUSES:
+                endpoint.record_failure(f"HTTP {response.status_code}")
+            else:
+                endpoint.record_success(time.perf_counter() - started)
+        return response
+
+    def post(self, data, timeout=30):
+        """
+        Posts an Overpass query and returns the first streaming response that
+        is not a server error. Raises OverpassUnavailable if all attempts fail.
+        """
+        remaining_endpoints = iter(self._ranked())
+        pending = {}
+        errors = []
+        deadline = time.monotonic() + timeout
+
+        def launch():
+            endpoint = next(remaining_endpoints, None)
+            if endpoint is not None:
+                with self._lock:
+                    if endpoint.open_until:
+                        endpoint.probing = True
+                pending[self._executor.submit(self._attempt, endpoint, data, timeout)] = endpoint
+            return endpoint
+
+        current = launch()
+        while pending:
+            remaining = deadline - time.monotonic()
+            wait_for = min(current.hedge_delay(self.hedge_delay), remaining)
+            done, _ = wait(pending, timeout=max(0.0, wait_for), return_when=FIRST_COMPLETED)
+
+            if not done:
+                if remaining <= wait_for:
+                    break
+                hedge = launch()
+                if hedge is not None:
+                    logger.info(f"Overpass endpoint {current.url} slow, hedging to {hedge.url}")
+                    current = hedge
+                continue
+
+            for future in done:
+                endpoint = pending.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    errors.append(f"{endpoint.url}: {e}")
+                    continue
+                if response.status_code not in RETRY_STATUSES:
+                    # Late answers of the other attempts are discarded
+                    for other in pending:
+                        other.add_done_callback(_close_response)
+                    return response
+                response.close()
+                errors.append(f"{endpoint.url}: HTTP {response.status_code}")
+
+            # Fail over right away instead of waiting for the hedge delay
+            if not pending:
+                current = launch() or current
+
+        for future in pending:
+            future.add_done_callback(_close_response)
+        raise OverpassUnavailable("; ".join(errors) or "Overpass request timed out")
+
+    def stats(self):
+        """
+        Returns the health and latency statistics of every endpoint.
+        """
+        with self._lock:
+            return [{
+                'url': endpoint.url,
+                'state': endpoint.state,
+                'latency_ms': endpoint.latency * 1000 if endpoint.latency is not None else None,
+                'successes': endpoint.successes,
+                'failures': endpoint.failures
+            } for endpoint in self.endpoints]
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+def _close_response(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+# Shared pool used by the engine
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure_overpass_endpoints(urls, **kwargs):
+    """
+    Replaces the shared pool with one over the given endpoint URLs and returns it.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = OverpassPool(list(urls), **kwargs)
+        return _pool
+
+
+def get_overpass_pool():
+    """
+    Returns the shared Overpass pool, created over DEFAULT_ENDPOINTS on first use.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = OverpassPool()
+    return _pool
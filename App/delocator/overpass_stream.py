@@ -0,0 +1,131 @@
+# Incremental parsing of Overpass JSON responses
+import bisect
+import codecs
+import json
+import random
+import re
+
+CHUNK_SIZE = 64 * 1024
+
+_ELEMENTS_START = re.compile(r'"elements"\s*:\s*\[')
+_SKIP = re.compile(r"[\s,]*")
+
+
+def iter_elements(chunks):
+    """
+    Yields the objects of the top-level "elements" array of an Overpass JSON
+    response while it is still being received.
+    Accepts an iterable of bytes or str chunks and only keeps the current,
+    unfinished element in memory.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    in_elements = False
+
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = text_decoder.decode(chunk)
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+        if not in_elements:
+            match = _ELEMENTS_START.search(buffer)
+            if match is None:
+                # Keep a short tail in case the key is split across chunks
+                pos = max(0, len(buffer) - 32)
+                continue
+            in_elements = True
+            pos = match.end()
+
+        while True:
+            pos = _SKIP.match(buffer, pos).end()
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                # Element continues in the next chunk
+                break
+            pos = end
+            yield element
+
+
+# ReservoirSampler: Keeps a uniform random sample of k items from a stream in O(k) memory
+class ReservoirSampler:
+    def __init__(self, k, rng=random):
+        self.k = k
+        self.rng = rng
+        self.seen = 0
+        self.items = []
+
+    def add(self, item):
+        self.seen += 1
+        if len(self.items) < self.k:
+            self.items.append(item)
+            return
+
+        # Algorithm R: the n-th item replaces a random slot with probability k / n
+        slot = self.rng.randrange(self.seen)
+        if slot < self.k:
+            self.items[slot] = item
+
+
+# RingSampler: Reservoir samples per distance ring, so a uniform sample of any
+# inner disc can be drawn after a single fetch at the outer radius
+class RingSampler:
+    def __init__(self, edges, k, rng=random):
+        self.edges = list(edges)
+        self.k = k
+        self.rng = rng
+        self.rings = [ReservoirSampler(k, rng) for _ in self.edges]
+
+    @property
+    def seen(self):
+        return sum(ring.seen for ring in self.rings)
+
+    @property
+    def items(self):
+        return self.sample()
+
+    def add(self, item):
+        # Items carry their 'distance'; ring i holds distances up to edges[i]
+        ring = bisect.bisect_left(self.edges, item['distance'])
+        if ring < len(self.rings):
+            self.rings[ring].add(item)
+
+    def cumulative_counts(self):
+        """
+        Returns the number of items seen within each edge.
+        """
+        counts = []
+        total = 0
+        for ring in self.rings:
+            total += ring.seen
+            counts.append(total)
+        return counts
+
+    def sample(self, ring_count=None):
+        """
+        Returns a uniform sample of up to k items from the first ring_count rings (default: all).
+        Each pick chooses a ring weighted by its not yet sampled items, then an item of its reservoir.
+        """
+        rings = self.rings[:ring_count]
+        remaining = [ring.seen for ring in rings]
+        pools = [list(ring.items) for ring in rings]
+        total = sum(remaining)
+        picked = []
+        while total and len(picked) < self.k:
+            pick = self.rng.randrange(total)
+            index = 0
+            while pick >= remaining[index]:
+                pick -= remaining[index]
+                index += 1
+            pool = pools[index]
+            picked.append(pool.pop(self.rng.randrange(len(pool))))
+            remaining[index] -= 1
+            total -= 1
+        return picked
@@ -0,0 +1,242 @@
+"""
+Minimal pure-Python reader for OpenStreetMap .osm.pbf files.
+
+Only what the offline POI index needs is decoded: the header bounding box,
+nodes (plain and dense) and ways with their tags and node references.
+Relations, metadata and history are skipped. Blobs must be raw or zlib
+compressed, which is what common extract providers ship.
+"""
+import struct
+import zlib
+
+# Wire types of the protobuf encoding
+_VARINT = 0
+_FIXED64 = 1
+_LENGTH_DELIMITED = 2
+_FIXED32 = 5
+
+
+def _read_varint(buf, pos):
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+
+def _signed(value):
+    # Plain (non-zigzag) int64 fields are encoded as two's complement
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _iter_fields(buf):
+    """
+    Yields (field_number, wire_type, value) for each field of a message.
+    Length-delimited values are returned as memoryview slices.
+    """
+    pos = 0
+    end = len(buf)
+    while pos < end:
+        key, pos = _read_varint(buf, pos)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == _VARINT:
+            value, pos = _read_varint(buf, pos)
+        elif wire_type == _LENGTH_DELIMITED:
+            length, pos = _read_varint(buf, pos)
+            value = buf[pos:pos + length]
+            pos += length
+        elif wire_type == _FIXED64:
+            value = buf[pos:pos + 8]
+            pos += 8
+        elif wire_type == _FIXED32:
+            value = buf[pos:pos + 4]
+            pos += 4
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire_type}")
+        yield field, wire_type, value
+
+
+def _packed_varints(buf):
+    values = []
+    pos = 0
+    end = len(buf)
+    while pos < end:
+        value, pos = _read_varint(buf, pos)
+        values.append(value)
+    return values
+
+
+def _packed_deltas(buf):
+    # Packed sint64 values stored as deltas to the previous value
+    values = []
+    current = 0
+    for raw in _packed_varints(buf):
+        current += _zigzag(raw)
+        values.append(current)
+    return values
+
+
+# PbfReader: Sequential reader over the blocks of an .osm.pbf file
+class PbfReader:
+    def __init__(self, path):
+        self.path = path
+
+    def _iter_blobs(self):
+        # Yields (type, decompressed data) for every blob in the file
+        with open(self.path, "rb") as file:
+            while True:
+                size_bytes = file.read(4)
+                if len(size_bytes) < 4:
+                    return
+                (header_size,) = struct.unpack(">I", size_bytes)
+                header = memoryview(file.read(header_size))
+
+                blob_type = None
+                data_size = 0
+                for field, _, value in _iter_fields(header):
+                    if field == 1:
+                        blob_type = bytes(value).decode("utf-8")
+                    elif field == 3:
+                        data_size = value
+
+                blob = memoryview(file.read(data_size))
+                data = None
+                for field, _, value in _iter_fields(blob):
+                    if field == 1:
+                        data = value
+                    elif field == 3:
+                        data = memoryview(zlib.decompress(value))
+                    elif field in (4, 5, 6, 7):
+                        raise ValueError("Only raw and zlib compressed PBF blobs are supported")
+                if data is not None:
+                    yield blob_type, data
+
+    def bbox(self):
+        """
+        Returns (south, west, north, east) from the file header, or None.
+        """
+        for blob_type, data in self._iter_blobs():
+            if blob_type != "OSMHeader":
+                return None
+            for field, _, value in _iter_fields(data):
+                if field == 1:
+                    edges = {}
+                    for bbox_field, _, raw in _iter_fields(value):
+                        edges[bbox_field] = _zigzag(raw) * 1e-9
+                    # HeaderBBox: 1 left, 2 right, 3 top, 4 bottom
+                    return edges.get(4), edges.get(1), edges.get(3), edges.get(2)
+            return None
+        return None
+
+    def iter_elements(self, nodes=True, ways=True, tagged_nodes_only=False, node_ids=None):
+        """
+        Yields ("node", id, lat, lon, tags) and ("way", id, refs, tags) tuples.
+        tagged_nodes_only skips untagged nodes; node_ids restricts nodes to a set of ids.
+        """
+        for blob_type, data in self._iter_blobs():
+            if blob_type != "OSMData":
+                continue
+
+            strings = []
+            groups = []
+            granularity = 100
+            lat_offset = 0
+            lon_offset = 0
+            for field, _, value in _iter_fields(data):
+                if field == 1:
+                    strings = [bytes(s).decode("utf-8") for f, _, s in _iter_fields(value) if f == 1]
+                elif field == 2:
+                    groups.append(value)
+                elif field == 17:
+                    granularity = value
+                elif field == 19:
+                    lat_offset = _signed(value)
+                elif field == 20:
+                    lon_offset = _signed(value)
+
+            def to_degrees(raw, offset):
+                return (offset + granularity * raw) * 1e-9
+
+            for group in groups:
+                for field, _, value in _iter_fields(group):
+                    if field == 2 and nodes:
+                        yield from self._dense_nodes(value, strings, to_degrees, lat_offset, lon_offset,
+                                                     tagged_nodes_only, node_ids)
+                    elif field == 1 and nodes:
+                        node = self._node(value, strings, to_degrees, lat_offset, lon_offset)
+                        if tagged_nodes_only and not node[4]:
+                            continue
+                        if node_ids is not None and node[1] not in node_ids:
+                            continue
+                        yield node
+                    elif field == 3 and ways:
+                        yield self._way(value, strings)
+
+    def _node(self, buf, strings, to_degrees, lat_offset, lon_offset):
+        node_id = lat = lon = 0
+        keys = vals = ()
+        for field, _, value in _iter_fields(buf):
+            if field == 1:
+                node_id = _zigzag(value)
+            elif field == 2:
+                keys = _packed_varints(value)
+            elif field == 3:
+                vals = _packed_varints(value)
+            elif field == 8:
+                lat = _zigzag(value)
+            elif field == 9:
+                lon = _zigzag(value)
+        tags = {strings[k]: strings[v] for k, v in zip(keys, vals)}
+        return "node", node_id, to_degrees(lat, lat_offset), to_degrees(lon, lon_offset), tags
+
+    def _dense_nodes(self, buf, strings, to_degrees, lat_offset, lon_offset, tagged_only, node_ids):
+        ids = lats = lons = ()
+        keys_vals = None
+        for field, _, value in _iter_fields(buf):
+            if field == 1:
+                ids = _packed_deltas(value)
+            elif field == 8:
+                lats = _packed_deltas(value)
+            elif field == 9:
+                lons = _packed_deltas(value)
+            elif field == 10:
+                keys_vals = _packed_varints(value)
+
+        position = 0
+        for index, node_id in enumerate(ids):
+            # keys_vals holds key/value string ids per node, each node terminated by 0
+            tags = {}
+            if keys_vals is not None:
+                while keys_vals[position] != 0:
+                    tags[strings[keys_vals[position]]] = strings[keys_vals[position + 1]]
+                    position += 2
+                position += 1
+
+            if tagged_only and not tags:
+                continue
+            if node_ids is not None and node_id not in node_ids:
+                continue
+            yield "node", node_id, to_degrees(lats[index], lat_offset), to_degrees(lons[index], lon_offset), tags
+
+    def _way(self, buf, strings):
+        way_id = 0
+        keys = vals = refs = ()
+        for field, _, value in _iter_fields(buf):
+            if field == 1:
+                way_id = value
+            elif field == 2:
+                keys = _packed_varints(value)
+            elif field == 3:
+                vals = _packed_varints(value)
+            elif field == 8:
+                refs = _packed_deltas(value)
+        tags = {strings[k]: strings[v] for k, v in zip(keys, vals)}
+        return "way", way_id, refs, tags
@@ -0,0 +1,252 @@
+# Persistent spatial cache for Overpass POI results
+import json
+import sqlite3
+import threading
+import time
+
+# Geohash precision 7 gives cells of roughly 150 m x 150 m, so addresses a
+# few meters apart share one entry while the 500 m search area stays valid.
+GEOHASH_PRECISION = 7
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 2000
+# Entries hold up to engine.POI_CACHE_SAMPLE_SIZE places (about 300 KB in a dense city)
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(lat, lon, precision=GEOHASH_PRECISION):
+    """
+    Encodes a coordinate as a geohash string of the given length.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if lon >= mid:
+                bits = (bits << 1) | 1
+                lon_range[0] = mid
+            else:
+                bits = bits << 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits = bits << 1
+                lat_range[1] = mid
+        even = not even
+        bit_count += 1
+
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+# PoiCache: SQLite-backed cache of parsed candidate records per geohash cell
+class PoiCache:
+    def __init__(self, path, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_bytes=DEFAULT_MAX_BYTES, precision=GEOHASH_PRECISION):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.precision = precision
+
+        # Session counters, reported through stats()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS poi_cache ("
+            " cell TEXT NOT NULL,"
+            " radius INTEGER NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " fetch_seconds REAL NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_access REAL NOT NULL,"
+            " PRIMARY KEY (cell, radius))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS poi_cache_last_access ON poi_cache (last_access)"
+        )
+        self._conn.commit()
+
+    def cell_for(self, lat, lon):
+        """
+        Returns the geohash cell a coordinate falls into.
+        """
+        return geohash_encode(lat, lon, self.precision)
+
+    def get(self, lat, lon, radius):
+        """
+        Returns the cached candidate records for the cell around (lat, lon),
+        or None if nothing fresh is stored.
+        """
+        cell = self.cell_for(lat, lon)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetch_seconds, created FROM poi_cache WHERE cell = ? AND radius = ?",
+                (cell, int(radius))
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            payload, fetch_seconds, created = row
+            if now - created > self.ttl:
+                self._conn.execute(
+                    "DELETE FROM poi_cache WHERE cell = ? AND radius = ?", (cell, int(radius))
+                )
+                self._conn.commit()
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE poi_cache SET last_access = ? WHERE cell = ? AND radius = ?",
+                (now, cell, int(radius))
+            )
+            self._conn.commit()
+            self.hits += 1
+            self.saved_seconds += fetch_seconds
+
+        candidates = json.loads(payload)
+        for candidate in candidates:
+            # JSON turns the (lon, lat) tuple into a list
+            candidate['coordinates'] = tuple(candidate['coordinates'])
+        return candidates
+
+    def cached_radii(self, lat, lon):
+        """
+        Returns the radii with a fresh entry for the cell around (lat, lon),
+        without counting a hit or miss.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT radius FROM poi_cache WHERE cell = ? AND created >= ?",
+                (self.cell_for(lat, lon), time.time() - self.ttl)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def put(self, lat, lon, radius, candidates, fetch_seconds=0.0):
+        """
+        Stores candidate records for the cell around (lat, lon) and evicts
+        least recently used cells beyond the size limits.
+        """
+        cell = self.cell_for(lat, lon)
+        payload = json.dumps(candidates)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO poi_cache"
+                " (cell, radius, payload, size, fetch_seconds, created, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (cell, int(radius), payload, len(payload), fetch_seconds, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # Drop expired cells first, then the least recently used ones until
+        # both the entry and the byte budget are met
+        cursor = self._conn.execute(
+            "DELETE FROM poi_cache WHERE created < ?", (time.time() - self.ttl,)
+        )
+        self.evictions += max(cursor.rowcount, 0)
+
+        count, total_bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM poi_cache"
+        ).fetchone()
+
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT cell, radius, size FROM poi_cache ORDER BY last_access ASC"
+        ).fetchall()
+        for cell, radius, size in rows:
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            self._conn.execute(
+                "DELETE FROM poi_cache WHERE cell = ? AND radius = ?", (cell, radius)
+            )
+            count -= 1
+            total_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Removes all cached cells.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM poi_cache")
+            self._conn.commit()
+
+    def stats(self):
+        """
+        Returns hit/miss counters and the Overpass time saved this session.
+        """
+        with self._lock:
+            entries, total_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM poi_cache"
+            ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'expired': self.expired,
+            'evictions': self.evictions,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            'saved_seconds': self.saved_seconds,
+            'entries': entries,
+            'bytes': total_bytes
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Shared cache instance used by get_places_with_fallback
+_poi_cache = None
+
+
+def configure_poi_cache(path, **kwargs):
+    """
+    Opens the shared POI cache at the given path and returns it.
+    """
+    global _poi_cache
+    if _poi_cache is not None:
+        _poi_cache.close()
+    _poi_cache = PoiCache(path, **kwargs)
+    return _poi_cache
+
+
+def get_poi_cache():
+    """
+    Returns the shared POI cache, or None if caching is not configured.
+    """
+    return _poi_cache
@@ -0,0 +1,107 @@
+# Precomputed pools of public places per favorite, for re-rolling a favorite without network requests
+import logging
+import random
+import time
+
+from .geocode_cache import normalize_address
+
+# Number of places kept per favorite
+POOL_SIZE = 50
+# Pools older than this are searched again in the background
+POOL_MAX_AGE = 7 * 24 * 3600
+
+logger = logging.getLogger(__name__)
+
+
+def vet_candidates(candidates, limit=POOL_SIZE, rng=random):
+    """
+    Keeps the candidates (as in anonymize_address's 'candidates') that have an
+    address and coordinates, each address once, and at most limit of them chosen at random.
+    """
+    pool = {}
+    for candidate in candidates or ():
+        address = candidate.get('address')
+        if not address or not address.strip():
+            continue
+        if candidate.get('latitude') is None or candidate.get('longitude') is None:
+            continue
+        pool.setdefault(normalize_address(address), candidate)
+
+    pool = list(pool.values())
+    if len(pool) > limit:
+        pool = rng.sample(pool, limit)
+    return pool
+
+
+def pool_is_stale(location, max_age=POOL_MAX_AGE, now=None):
+    """
+    Checks if a favorite's pool was never searched or is older than max_age.
+    An empty pool found recently is not stale; the area has no other places.
+    """
+    updated = location.get('pool_updated')
+    if updated is None:
+        return True
+    return (time.time() if now is None else now) - updated > max_age
+
+
+def can_reroll(location):
+    current = normalize_address(location['address'])
+    return any(normalize_address(candidate['address']) != current for candidate in location.get('pool') or ())
+
+
+def reroll(location, rng=random):
+    """
+    Draws another place for a favorite from its pool, uniformly among those
+    other than the current one, in constant time. Returns an updated copy of
+    the favorite, or None if the pool holds no other place.
+    """
+    pool = location.get('pool') or []
+    if not pool:
+        return None
+    index = rng.randrange(len(pool))
+    if normalize_address(pool[index]['address']) == normalize_address(location['address']):
+        # Addresses are unique in a pool, so any other index is a different place
+        if len(pool) == 1:
+            return None
+        index = (index + 1 + rng.randrange(len(pool) - 1)) % len(pool)
+
+    selected = pool[index]
+    rerolled = dict(location)
+    rerolled.update({
+        'address': selected['address'],
+        'latitude': selected['latitude'],
+        'longitude': selected['longitude'],
+        'category': selected.get('category'),
+        'distance': selected.get('distance')
+    })
+    return rerolled
+
+
+def refresh_pool(location, geocoder=None, rng=random, cancel_check=None):
+    """
+    Searches the places around a favorite's original address again. Returns the
+    fields to update the favorite with ('pool', 'pool_updated', and the original
+    coordinates if they had to be geocoded), or None if the address was not found.
+    Raises AnonymizationError if the search failed, so the old pool is kept.
+    """
+    # The engine pulls in numpy and the HTTP stack; pools are refreshed in the background only
+    from .clients import get_geocoder
+    from .engine import search_candidates
+
+    updates = {}
+    latitude, longitude = location.get('original_latitude'), location.get('original_longitude')
+    if latitude is None or longitude is None:
+        found = (geocoder or get_geocoder()).geocode(location['original_address'])
+        if not found:
+            return None
+        latitude, longitude = found.latitude, found.longitude
+        updates['original_latitude'], updates['original_longitude'] = latitude, longitude
+
+    if cancel_check is not None:
+        cancel_check()
+
+    candidates, radius = search_candidates(latitude, longitude, target=POOL_SIZE, rng=rng, cancel_check=cancel_check)
+    updates['pool'] = vet_candidates(candidates, rng=rng)
+    updates['pool_updated'] = time.time()
+    logger.debug(f"Pool of {location['original_address']}: {len(updates['pool'])} places within {radius:.0f} m")
+    return updates
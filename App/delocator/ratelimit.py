@@ -0,0 +1,54 @@
+# Rate limiting for calls to public OpenStreetMap services
+import threading
+import time
+
+# Nominatim usage policy: an absolute maximum of 1 request per second
+NOMINATIM_RATE = 1.0
+
+
+# TokenBucket: Thread-safe token bucket scheduler.
+# Callers reserve a token in arrival order and sleep until their slot comes up,
+# so concurrent callers are queued first-come, first-served instead of racing.
+class TokenBucket:
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """
+        Takes one token, sleeping until one becomes available.
+        Returns the number of seconds the caller was queued.
+        A rate of zero or less disables limiting.
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            self._refill(time.monotonic())
+            # Tokens may go negative: the deficit is the queue of waiting callers
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def set_rate(self, rate):
+        """
+        Changes the refill rate for future reservations.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+
+
+# Shared scheduler for all Nominatim requests of this process
+nominatim_limiter = TokenBucket(NOMINATIM_RATE)
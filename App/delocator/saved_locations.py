@@ -0,0 +1,269 @@
+# Versioned storage format for saved (favorite) locations, and the cached store the app reads them through
+import json
+import logging
+import os
+import threading
+
+from .fuzzy import TrigramIndex
+from .geocode_cache import normalize_address
+
+SAVED_LOCATIONS_FILE = "saved_locations.json"
+# Changes within this many seconds are written to disk together
+WRITE_DELAY = 0.5
+
+# Version 1: bare JSON list of {original_address, address, description, icon}
+# Version 2: {"version": 2, "locations": [...]} where each entry also carries the
+#            coordinates of both addresses and the metadata of the chosen candidate
+# Version 3: entries also carry a pool of places to re-roll from ("pool", see
+#            pools.py) and when it was searched ("pool_updated")
+SCHEMA_VERSION = 3
+
+COORDINATE_FIELDS = ("latitude", "longitude", "original_latitude", "original_longitude")
+
+logger = logging.getLogger(__name__)
+
+
+def migrate_saved_locations(data):
+    """
+    Converts any known saved-locations format to the current schema.
+    Returns (locations, migrated) where migrated tells if the data was changed.
+    """
+    if isinstance(data, list):
+        # Version 1: no coordinates yet; they are filled in on first replay
+        locations = data
+        migrated = True
+    elif isinstance(data, dict) and data.get("version") in (2, SCHEMA_VERSION):
+        # Version 2 only lacks the pool fields, filled in below
+        locations = data.get("locations", [])
+        migrated = data["version"] != SCHEMA_VERSION
+    else:
+        raise ValueError(f"Unsupported saved locations format: {str(data)[:80]}")
+
+    for location in locations:
+        for field in COORDINATE_FIELDS:
+            if field not in location:
+                location[field] = None
+                migrated = True
+        location.setdefault("category", None)
+        location.setdefault("candidate_count", None)
+        location.setdefault("pool", [])
+        location.setdefault("pool_updated", None)
+
+    return locations, migrated
+
+
+def has_coordinates(location):
+    """
+    Checks if a saved location can be shown on the map without geocoding.
+    """
+    return all(location.get(field) is not None for field in COORDINATE_FIELDS)
+
+
+def load_saved_locations(path=SAVED_LOCATIONS_FILE):
+    """
+    Loads saved locations, migrating and rewriting older files on the fly.
+    """
+    try:
+        with open(path, "r") as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return []
+
+    locations, migrated = migrate_saved_locations(data)
+    if migrated:
+        logger.debug(f"Migrated {path} to schema version {SCHEMA_VERSION}")
+        save_saved_locations(locations, path)
+    return locations
+
+
+def save_saved_locations(saved_locations, path=SAVED_LOCATIONS_FILE):
+    """
+    Writes saved locations to a temporary file and renames it over the old one,
+    so a crash mid-write leaves either the old or the new file, never a partial one.
+    """
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as file:
+        json.dump({"version": SCHEMA_VERSION, "locations": saved_locations}, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def _file_version(path):
+    # Modification time and size identify the file contents the cache was read from
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+# SavedLocationStore: Saved locations kept in memory and re-read only when the
+# file changed on disk. Saves update memory at once and are written back in
+# batches, atomically; listeners are told about every change. A trigram index
+# on the normalized original address finds a favorite without scanning the
+# list, also when the address is written a little differently.
+class SavedLocationStore:
+    def __init__(self, path=SAVED_LOCATIONS_FILE, write_delay=WRITE_DELAY, legacy_path=None):
+        self.path = path
+        self.write_delay = write_delay
+        self.legacy_path = legacy_path
+
+        self._lock = threading.RLock()
+        self._locations = None
+        self._index = TrigramIndex()
+        self._version = None
+        self._dirty = False
+        self._timer = None
+        self._listeners = []
+
+    def load(self):
+        """
+        Returns a copy of the saved locations; callers may change it and pass it to save().
+        """
+        with self._lock:
+            changed = self._refresh()
+            locations = [dict(location) for location in self._locations]
+
+        if changed:
+            self._notify(locations)
+        return locations
+
+    def find(self, original_address, fuzzy=False):
+        """
+        Returns a copy of the favorite saved for an original address (compared
+        normalized, like the geocode cache), or None. With fuzzy, a favorite
+        for the same address written a little differently (see
+        TrigramIndex.match) is returned as well.
+        """
+        key = normalize_address(original_address)
+        with self._lock:
+            changed = self._refresh()
+            if fuzzy:
+                match = self._index.match(key)
+                location = dict(match[0]) if match is not None else None
+            else:
+                location = self._index.get(key)
+                location = dict(location) if location is not None else None
+            locations = [dict(entry) for entry in self._locations] if changed else None
+
+        if changed:
+            self._notify(locations)
+        return location
+
+    def _refresh(self):
+        # Re-reads the file if it changed on disk; returns True if that replaced what was loaded.
+        # Unwritten changes are newer than the file.
+        if self._dirty:
+            return False
+        version = _file_version(self.path)
+        if self._locations is not None and version == self._version:
+            return False
+        changed = self._locations is not None
+        self._read()
+        return changed
+
+    def _set_locations(self, locations):
+        self._locations = locations
+        self._index = TrigramIndex()
+        for location in locations:
+            self._index.add(normalize_address(location.get("original_address")), location)
+
+    def _read(self):
+        if self.legacy_path and not os.path.exists(self.path) and os.path.exists(self.legacy_path):
+            # Saved locations used to live in the working directory
+            logger.info(f"Moving saved locations from {self.legacy_path} to {self.path}")
+            save_saved_locations(load_saved_locations(self.legacy_path), self.path)
+            os.remove(self.legacy_path)
+
+        self._set_locations(load_saved_locations(self.path))
+        self._version = _file_version(self.path)
+
+    def save(self, locations):
+        """
+        Replaces the saved locations. Readers see the change immediately;
+        it reaches the disk within write_delay seconds or on flush().
+        """
+        locations = [dict(location) for location in locations]
+        with self._lock:
+            self._set_locations(locations)
+            self._dirty = True
+            if self.write_delay <= 0:
+                self._write()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.write_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        self._notify([dict(location) for location in locations])
+
+    def flush(self):
+        """
+        Writes pending changes to disk now.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._dirty:
+                self._write()
+
+    def _write(self):
+        try:
+            save_saved_locations(self._locations, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write saved locations: {e}")
+            return
+        self._version = _file_version(self.path)
+        self._dirty = False
+
+    def subscribe(self, listener):
+        """
+        Calls listener(locations) after every change, on the thread that made it.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _notify(self, locations):
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(locations)
+            except Exception:
+                logger.exception("Saved locations listener failed")
+
+
+# Shared store used by the app
+_store = None
+_store_lock = threading.Lock()
+
+
+def configure_saved_locations(path, **kwargs):
+    """
+    Opens the shared store on the given file and returns it.
+    Pending changes of a previous store are written first.
+    """
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.flush()
+        _store = SavedLocationStore(path, **kwargs)
+        return _store
+
+
+def get_saved_locations_store():
+    """
+    Returns the shared store, created on SAVED_LOCATIONS_FILE in the working directory if none is configured.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SavedLocationStore()
+    return _store
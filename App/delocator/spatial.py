@@ -0,0 +1,94 @@
+# Vectorized distance computations and a grid index over candidate POIs
+import math
+
+import numpy as np
+
+EARTH_RADIUS = 6371000.0
+DEFAULT_CELL_SIZE = 0.01
+
+
+def haversine_many(lat, lon, lats, lons):
+    """
+    Returns the distances in meters from (lat, lon) to every point of the
+    lats/lons arrays, computed in one vectorized pass.
+    """
+    lat1 = math.radians(lat)
+    lats = np.radians(np.asarray(lats, dtype=np.float64))
+    d_phi = lats - lat1
+    d_lambda = np.radians(np.asarray(lons, dtype=np.float64)) - math.radians(lon)
+    a = np.sin(d_phi / 2) ** 2 + math.cos(lat1) * np.cos(lats) * np.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def filter_by_distance(lat, lon, lats, lons, min_distance=0.0, max_distance=math.inf):
+    """
+    Returns (indices, distances) of the points whose distance to (lat, lon)
+    lies within [min_distance, max_distance].
+    """
+    distances = haversine_many(lat, lon, lats, lons)
+    mask = (distances >= min_distance) & (distances <= max_distance)
+    indices = np.nonzero(mask)[0]
+    return indices, distances[indices]
+
+
+def ring_ids(distances, edges):
+    """
+    Assigns each distance to a ring: 0 for distances up to edges[0],
+    1 up to edges[1], and so on; len(edges) for anything beyond.
+    """
+    return np.searchsorted(np.asarray(edges, dtype=np.float64), distances, side="left")
+
+
+# GridIndex: Points sorted by grid cell so a radius query only touches nearby cells.
+# Cells of one latitude row are contiguous, so each row needs a single range lookup.
+class GridIndex:
+    def __init__(self, lats, lons, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+
+        cell_lats = np.floor(lats / cell_size).astype(np.int64)
+        cell_lons = np.floor(lons / cell_size).astype(np.int64)
+        self._lon_cells = int(math.ceil(360 / cell_size)) + 2
+        keys = cell_lats * self._lon_cells + (cell_lons + self._lon_cells // 2)
+
+        order = np.argsort(keys, kind="stable")
+        self.order = order
+        self.keys = keys[order]
+        self.lats = lats[order]
+        self.lons = lons[order]
+
+    def __len__(self):
+        return len(self.order)
+
+    def _key(self, cell_lat, cell_lon):
+        return cell_lat * self._lon_cells + (cell_lon + self._lon_cells // 2)
+
+    def query(self, lat, lon, radius, min_distance=0.0):
+        """
+        Returns (indices, distances) of the points within [min_distance, radius]
+        meters of (lat, lon). Indices refer to the original input order.
+        """
+        if not len(self.order):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        d_lat = math.degrees(radius / EARTH_RADIUS)
+        d_lon = math.degrees(radius / (EARTH_RADIUS * max(math.cos(math.radians(lat)), 1e-6)))
+        first_row = int(math.floor((lat - d_lat) / self.cell_size))
+        last_row = int(math.floor((lat + d_lat) / self.cell_size))
+        first_col = int(math.floor((lon - d_lon) / self.cell_size))
+        last_col = int(math.floor((lon + d_lon) / self.cell_size))
+
+        rows = np.arange(first_row, last_row + 1, dtype=np.int64)
+        starts = np.searchsorted(self.keys, self._key(rows, first_col), side="left")
+        ends = np.searchsorted(self.keys, self._key(rows, last_col), side="right")
+        positions = np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)]) \
+            if len(rows) else np.empty(0, dtype=np.int64)
+
+        if not len(positions):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        local, distances = filter_by_distance(
+            lat, lon, self.lats[positions], self.lons[positions], min_distance, radius
+        )
+        return self.order[positions[local]], distances
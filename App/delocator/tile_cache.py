@@ -0,0 +1,210 @@
+# Bounded on-disk map tile cache shared with MapView, and its warm-up
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+from .clients import get_session
+
+logger = logging.getLogger(__name__)
+
+TILE_URL = "https://tile.openstreetmap.org/{z}/{x}/{y}.png"
+CACHE_KEY = "osm"
+TILE_SIZE = 256
+IMAGE_EXT = "png"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# The OpenStreetMap tile usage policy allows two parallel downloads
+TILE_WORKERS = 2
+TILE_TIMEOUT = 10
+# Seconds a warm-up may delay revealing the map
+WARM_TIMEOUT = 5.0
+
+
+def tile_xy(lat, lon, zoom):
+    """
+    Returns the fractional slippy-map (XYZ) tile coordinates of a point.
+    """
+    n = 2 ** zoom
+    lat = max(-85.05112878, min(85.05112878, lat))
+    x = (lon + 180.0) / 360.0 * n
+    y = (1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n
+    return x, y
+
+
+def tiles_for_view(points, zoom, width, height, margin=1):
+    """
+    Returns the (zoom, x, y) tiles a width x height pixel map centered between
+    the points shows, plus those under the points themselves and margin tiles
+    around them, ordered from the center outwards.
+    """
+    n = 2 ** zoom
+    coordinates = [tile_xy(lat, lon, zoom) for lat, lon in points]
+    center_x = sum(x for x, _ in coordinates) / len(coordinates)
+    center_y = sum(y for _, y in coordinates) / len(coordinates)
+    half_width = width / TILE_SIZE / 2 + margin
+    half_height = height / TILE_SIZE / 2 + margin
+
+    min_x = min([center_x - half_width] + [x - margin for x, _ in coordinates])
+    max_x = max([center_x + half_width] + [x + margin for x, _ in coordinates])
+    min_y = min([center_y - half_height] + [y - margin for _, y in coordinates])
+    max_y = max([center_y + half_height] + [y + margin for _, y in coordinates])
+
+    tiles = []
+    for x in range(int(math.floor(min_x)), int(math.floor(max_x)) + 1):
+        for y in range(max(0, int(math.floor(min_y))), min(n - 1, int(math.floor(max_y))) + 1):
+            tiles.append((zoom, x % n, y))
+    tiles.sort(key=lambda tile: (tile[1] + 0.5 - center_x) ** 2 + (tile[2] + 0.5 - center_y) ** 2)
+    return list(dict.fromkeys(tiles))
+
+
+# TileCache: Tile images as files in MapView's cache layout, so the map loads
+# warmed tiles from disk, kept under a byte budget by evicting the least
+# recently used (oldest modification time) files
+class TileCache:
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, url=TILE_URL, cache_key=CACHE_KEY):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.url = url
+        self.cache_key = cache_key
+
+        # Session counters, reported through stats()
+        self.hits = 0
+        self.downloads = 0
+        self.failures = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        # Tile files oldest first and their total size, as of the last trim
+        self._files = OrderedDict()
+        self._total = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, zoom, x, y):
+        # MapView numbers tile rows from the bottom (TMS) in its cache file names
+        row = 2 ** zoom - 1 - y
+        return os.path.join(self.directory, f"{self.cache_key}_{zoom}_{x}_{row}.{IMAGE_EXT}")
+
+    def tile_url(self, zoom, x, y):
+        return self.url.format(z=zoom, x=x, y=y, s="a")
+
+    def _scan(self):
+        # Also picks up the tiles MapView downloaded itself while the user panned or zoomed
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.is_file() and entry.name.endswith("." + IMAGE_EXT):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.path, stat.st_size))
+        entries.sort()
+        self._files = OrderedDict((path, size) for _, path, size in entries)
+        self._total = sum(self._files.values())
+
+    def fetch(self, zoom, x, y):
+        """
+        Makes sure one tile is on disk and marks it as recently used.
+        Returns True if it was cached already.
+        """
+        path = self.path(zoom, x, y)
+        try:
+            os.utime(path)
+            with self._lock:
+                self.hits += 1
+            return True
+        except FileNotFoundError:
+            pass
+
+        response = get_session().get(self.tile_url(zoom, x, y), timeout=TILE_TIMEOUT)
+        response.raise_for_status()
+        # Written under a temporary name, so MapView never reads half a tile
+        temporary = f"{path}.{threading.get_ident()}.part"
+        with open(temporary, "wb") as file:
+            file.write(response.content)
+        os.replace(temporary, path)
+
+        with self._lock:
+            self.downloads += 1
+        return False
+
+    def warm(self, tiles, cancel_check=None, timeout=WARM_TIMEOUT):
+        """
+        Downloads the given (zoom, x, y) tiles that are not cached yet, in
+        parallel, then trims the cache. Returns the number of tiles on disk;
+        failed or late tiles are left for MapView to load itself.
+        """
+        started = time.monotonic()
+        ready = 0
+        executor = ThreadPoolExecutor(max_workers=TILE_WORKERS, thread_name_prefix="tiles")
+        futures = [executor.submit(self.fetch, *tile) for tile in tiles]
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                if cancel_check is not None:
+                    cancel_check()
+                try:
+                    future.result()
+                    ready += 1
+                except Exception as e:
+                    with self._lock:
+                        self.failures += 1
+                    logger.debug(f"Tile download failed: {e}")
+        except FuturesTimeoutError:
+            logger.info(f"Tile warm-up stopped after {time.monotonic() - started:.1f}s ({ready}/{len(tiles)} tiles)")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self.trim(keep=[self.path(*tile) for tile in tiles])
+        return ready
+
+    def trim(self, keep=()):
+        """
+        Deletes the least recently used tiles until the cache fits its byte
+        budget. Tiles in keep (those about to be shown) are never deleted.
+        """
+        keep = set(keep)
+        with self._lock:
+            self._scan()
+            for path in list(self._files):
+                if self._total <= self.max_bytes:
+                    break
+                if path in keep:
+                    continue
+                self._total -= self._files.pop(path)
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'downloads': self.downloads,
+                'failures': self.failures,
+                'evictions': self.evictions,
+                'bytes': self._total
+            }
+
+
+# Shared cache used by the map
+_tile_cache = None
+
+
+def configure_tile_cache(directory, **kwargs):
+    """
+    Sets up the shared tile cache in the given directory and returns it.
+    """
+    global _tile_cache
+    _tile_cache = TileCache(directory, **kwargs)
+    return _tile_cache
+
+
+def get_tile_cache():
+    """
+    Returns the shared tile cache, or None if none is configured.
+    """
+    return _tile_cache
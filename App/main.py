@@ -1,258 +1,87 @@
 # Imports
+import time
+
+# Reference point for the time to first frame (see benchmarks/bench_startup.py)
+STARTED = time.perf_counter()
+
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
+from kivy.uix.dropdown import DropDown
 from kivy.graphics import Color, Rectangle, Ellipse, Line
-from kivy_garden.mapview import MapView, MapMarker
-from geopy.geocoders import Nominatim
-import ssl
-import certifi
-from threading import Thread
-import geopy.geocoders
 from kivy.core.window import Window
 from kivy.uix.popup import Popup
 from kivy.uix.label import Label
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.metrics import dp
-import json
 from kivy.uix.anchorlayout import AnchorLayout
 from kivy.uix.gridlayout import GridLayout
 from kivy.core.clipboard import Clipboard
-import random
 from kivy.utils import platform
 from kivy.clock import Clock
 from kivy.properties import StringProperty
 from kivy.uix.image import Image
 from kivy.uix.scrollview import ScrollView
-import traceback
-import requests
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+import difflib
+import logging
+import os
+from delocator.autocomplete import build_address_suggester, get_address_suggester
+from delocator.clients import close_clients, get_geocoder
+from delocator.density import configure_density_memory
+from delocator.geocode_cache import configure_geocode_cache, get_geocode_cache
+from delocator.history import configure_history, get_history
+from delocator.instrumentation import configure_logging, format_stage_stats, profiling, span, stage_stats
+from delocator.jobs import JobTimeout, get_scheduler
+from delocator.notifications import FavoritesNotifier
+from delocator.offline_index import configure_offline_index
+from delocator.overpass_pool import configure_overpass_endpoints
+from delocator.poi_cache import configure_poi_cache
+from delocator.pools import can_reroll, pool_is_stale, refresh_pool, reroll, vet_candidates
+from delocator.saved_locations import (COORDINATE_FIELDS, SAVED_LOCATIONS_FILE, configure_saved_locations,
+                                       get_saved_locations_store, has_coordinates)
+from delocator.tile_cache import IMAGE_EXT, TILE_SIZE, TILE_URL, configure_tile_cache, get_tile_cache, tiles_for_view
+
+logger = logging.getLogger("delocator.app")
 
 if platform == 'android':
     try:
         from jnius import PythonJavaClass, java_method, autoclass
         from android.permissions import request_permissions, Permission
         from android.broadcast import BroadcastReceiver
-        from notification import AndroidNotification
     except ImportError as e:
-        print(f"Android modules not available: {e}")
+        logger.warning(f"Android modules not available: {e}")
         # Fallback definitions for desktop testing
         autoclass = None
         BroadcastReceiver = None
-        AndroidNotification = None
-
-# Categories for anonymized location search.
-# Used for filtering specific public places with Overpass API.# 🔧 NEW: Categories for anonymized location search
-PLACE_CATEGORIES = {
-    "Dining": [
-        '"amenity"="restaurant"',
-        '"amenity"="cafe"',
-        '"amenity"="bar"',
-        '"amenity"="fast_food"'
-    ],
-    "Shopping": [
-        '"shop"="supermarket"',
-        '"shop"="bakery"',
-        '"shop"="convenience"'
-    ],
-    "Healthcare": [
-        '"amenity"="pharmacy"'
-    ],
-    "Services": [
-        '"amenity"="bank"',
-        '"amenity"="atm"',
-        '"amenity"="post_office"',
-        '"amenity"="fuel"'
-    ],
-    "Transport": [
-        '"highway"="bus_stop"'
-    ],
-    "Recreation": [
-        '"leisure"="park"',
-        '"shop"="hairdresser"'
-    ]
-}
-
-
-def determine_category_from_tags(tags):
-    """
-    Determines a location's category based on its OSM tags.
-    Returns a human-readable category string.
-    """
-    amenity = tags.get("amenity", "")
-    shop = tags.get("shop", "")
-    leisure = tags.get("leisure", "")
-    highway = tags.get("highway", "")
-
-    if amenity in ["restaurant", "cafe", "bar", "fast_food"]:
-        return "Dining"
-    elif shop in ["supermarket", "bakery", "convenience"]:
-        return "Shopping"
-    elif amenity == "pharmacy":
-        return "Healthcare"
-    elif amenity in ["bank", "atm", "post_office", "fuel"]:
-        return "Services"
-    elif highway == "bus_stop":
-        return "Transport"
-    elif leisure == "park" or shop == "hairdresser":
-        return "Recreation"
-    else:
-        return "Other"
-
-
-def is_valid_address(address, tags):
-    """
-    Checks if an address is valid.
-    """
-    return address is not None and len(address.strip()) > 0
-
-
-def get_places_with_fallback(api, location, radius=500):
-    """
-    Fetches nearby public places by direct HTTP request to Overpass API.
-    This method bypasses the Overpass Python library.
-    Returns a list of amenities with address and coordinates.
-    """
-
-    print(f"Direct HTTP request to Overpass API...")
-
-    # Compose Overpass query for various amenities
-    overpass_query = f"""
-[out:json][timeout:25];
-(
-  node(around:{radius},{location.latitude},{location.longitude})[amenity=restaurant];
-  node(around:{radius},{location.latitude},{location.longitude})[amenity=cafe];
-  node(around:{radius},{location.latitude},{location.longitude})[amenity=bank];
-  node(around:{radius},{location.latitude},{location.longitude})[shop=supermarket];
-  node(around:{radius},{location.latitude},{location.longitude})[amenity=pharmacy];
-);
-out body;
-"""
-
-    try:
-        url = "https://overpass-api.de/api/interpreter"
-        response = requests.post(url, data={'data': overpass_query.strip()}, timeout=30)
-
-        if response.status_code != 200:
-            print(f"HTTP Error: {response.status_code}")
-            return []
-
-        data = response.json()
-        elements = data.get('elements', [])
-        print(f"Direct API: {len(elements)} elements found")
 
-        amenities_data = []
+# Deadline for one anonymization (geocoding plus POI search), in seconds
+ANONYMIZE_TIMEOUT = 45
 
-        for element in elements:
-            try:
-                # Extract coordinates
-                lat = element.get('lat')
-                lon = element.get('lon')
-                if not (lat and lon):
-                    continue
-
-                # Extract tags
-                tags = element.get('tags', {})
-                if not tags:
-                    continue
-
-                # Check address
-                street = tags.get("addr:street", "")
-                city = tags.get("addr:city", "")
-
-                if street and city:
-                    address = f"{street}, {city}"
-
-                    # Determine category
-                    amenity = tags.get('amenity', '')
-                    shop = tags.get('shop', '')
-                    category = amenity or shop or 'Unknown'
-
-                    amenities_data.append({
-                        'address': address,
-                        'coordinates': (lon, lat),
-                        'category': category,
-                        'tags': tags
-                    })
-                    print(f"HTTP Address: {address} ({category})")
-
-                    # Limit number of returned amenities
-                    if len(amenities_data) >= 10:
-                        break
+# Seconds the address input must stay unchanged before its caches are warmed
+PREFETCH_DELAY = 0.8
 
-            except Exception as e:
-                print(f"Element error: {e}")
-                continue
+# Offline POI index looked up in the app's data directory
+OFFLINE_INDEX_FILE = "poi_index.sqlite3"
 
-        print(f"Direct API result: {len(amenities_data)} addresses")
-        return amenities_data
+# Map tiles are kept in this subdirectory of the app's data directory;
+# DELOCATOR_TILE_URL replaces the OpenStreetMap tile server (e.g. with a local stand-in)
+TILE_CACHE_DIR = "tiles"
 
-    except Exception as e:
-        print(f"HTTP request error: {e}")
-        return []
+# Optional list of Overpass endpoints (one URL per line) in the app's data directory
+OVERPASS_ENDPOINTS_FILE = "overpass_endpoints.txt"
 
-
-def test_simple_overpass(api, location):
-    """
-    Sends a basic test query to Overpass API to check if it's reachable and functional.
-    Returns True if at least one restaurant is found, otherwise False.
-    """
-    try:
-        url = "https://overpass-api.de/api/interpreter"
-        simple_query = f"""
-        [out:json][timeout:25];
-        node(around:500,{location.latitude},{location.longitude})[amenity=restaurant];
-        out body;
-        """
-
-        response = requests.post(url, data={'data': simple_query}, timeout=30)
-        if response.status_code == 200:
-            data = response.json()
-            elements = data.get('elements', [])
-            return len(elements) > 0
-        else:
-            print(f"Direct HTTP failed: {response.status_code}")
-            return False
-
-    except Exception as e:
-        print(f"HTTP Test Error: {e}")
-        return False
-
-
-def extract_address_from_tags(tags):
-    """
-    Extracts a full, real address from OSM tags.
-    Only returns addresses if 'street' and 'city' are present.
-    Ignores names, brands, and generic types.
-    """
-    street = tags.get("addr:street", "").strip()
-    housenumber = tags.get("addr:housenumber", "").strip()
-    postcode = tags.get("addr:postcode", "").strip()
-    city = tags.get("addr:city", "").strip()
-
-    if street and city:
-        address_parts = []
-
-        # Add street and optional house number
-        if housenumber:
-            address_parts.append(f"{street} {housenumber}")
-        else:
-            address_parts.append(street)
-
-        # Add postal code and city
-        if postcode:
-            address_parts.append(f"{postcode} {city}")
-        else:
-            address_parts.append(city)
-
-        result = ", ".join(address_parts)
-        print(f"Real address accepted: {result}")
-        return result
-
-    # 🔧 DISCARD EVERYTHING ELSE - even if name, brand, operator are present
-    print(f"Discarded (no complete address): {tags.get('name', 'Unknown')}")
-    return None
+# The map screen, MapView and the anonymization engine (numpy, requests, geopy) are
+# loaded on first use; DELOCATOR_EAGER_STARTUP=1 loads everything up front as before
+EAGER_STARTUP = bool(os.environ.get("DELOCATOR_EAGER_STARTUP"))
+# DELOCATOR_STARTUP_BENCHMARK=1 prints the time to the first frame and quits
+STARTUP_BENCHMARK = bool(os.environ.get("DELOCATOR_STARTUP_BENCHMARK"))
+# Seconds after start before the engine is imported in the background
+WARM_UP_DELAY = 1.0
 
 
 # MapLegend: Displays a legend for the map with colored squares representing location types
@@ -391,7 +220,7 @@ class InfoPopup(Popup):
 Prevent the disclosure of sensitive or private addresses (e.g., home address, work address, etc.) to third-party apps and online platforms. For example, you can use the anonymized location instead of the real location for navigation purposes (e.g., Google Maps).
 
 [b]WHAT IT DOES[/b]
-Transforms your real address into a random nearby public location within 500m radius for enhanced privacy protection.
+Transforms your real address into a random nearby public location, usually within 500m radius (up to 2km in areas with few public places), for enhanced privacy protection.
 
 [b]HOW IT WORKS[/b]
 [b]Step 1: ENTER ADDRESS[/b] - App geocodes your location using OpenStreetMap
@@ -401,16 +230,17 @@ Transforms your real address into a random nearby public location within 500m ra
 [color=666666][b]Practical Example for Step 3:[/b]
 Instead of sharing "123 Main Street, Your Home", the app might randomly select "Central Library, 456 Oak Avenue" or "City Pharmacy, 789 Pine Street" - both real public places near your actual location. You can then use this anonymized address for delivery apps, ride-sharing, or any service where you don't want to reveal your exact address.[/color]
 
-[b]Step 4: SAVE & REUSE[/b] - Store up to 3 favorites for consistent mapping
+[b]Step 4: SAVE & REUSE[/b] - Store any number of favorites for consistent mapping
 
 [b]PRIVACY FEATURES[/b]
-[b]Non-deterministic anonymization[/b] - Different results each time for unsaved addresses
+[b]Non-deterministic anonymization[/b] - Different results each time for unsaved addresses (repeat addresses are drawn again from the places found before, without network requests)
 [b]Local storage only[/b] - No personal data sent to external servers
+[b]Limited history[/b] - Entered addresses and their results are forgotten after 30 days, or at once with "Clear history" below
 [b]OpenStreetMap integration[/b] - Uses only verified public place data
 [b]Clipboard integration[/b] - Quick copy functionality with notifications
 
 [b]EFFECTS OF ANONYMIZATION[/b]
-Please note that the anonymized location will be further away from your real location (within 500 meters), and this may impact the accuracy depending on the usage purpose. Consider this distance when using the anonymized address for time-sensitive deliveries or precise navigation requirements.
+Please note that the anonymized location will be further away from your real location (usually within 500 meters, up to 2 kilometers in sparse areas), and this may impact the accuracy depending on the usage purpose. Consider this distance when using the anonymized address for time-sensitive deliveries or precise navigation requirements.
 
 [b]SUPPORTED CATEGORIES[/b]
 [color=0066cc]Restaurants & Cafes[/color]    [color=0066cc]Shops & Markets[/color]
@@ -438,6 +268,13 @@ This application demonstrates practical approaches to location privacy while mai
 
 [color=4169E1][b]Thank you for contributing to privacy-aware location sharing![/b][/color]"""
 
+        # Timings of the anonymization stages measured in this session
+        if stage_stats():
+            info_text += f"""
+
+[b]PERFORMANCE[/b]
+[font=RobotoMono-Regular][size=12sp]{format_stage_stats()}[/size][/font]"""
+
         self.info_label = Label(
             text=info_text,
             markup=True,
@@ -462,6 +299,17 @@ This application demonstrates practical approaches to location privacy while mai
         self.scroll.add_widget(self.info_label)
         layout.add_widget(self.scroll)
 
+        # Deletes the anonymization history and looked up addresses; saved locations stay
+        self.clear_history_button = Button(
+            text="Clear history",
+            size_hint=(1, None),
+            height=dp(50),
+            background_color=(0.8, 0.2, 0.2, 1),
+            background_normal="",
+        )
+        self.clear_history_button.bind(on_release=self.clear_history)
+        layout.add_widget(self.clear_history_button)
+
         # Close button for dismissing the popup
         close_button = Button(
             text="Close",
@@ -490,6 +338,18 @@ This application demonstrates practical approaches to location privacy while mai
         Clock.schedule_once(lambda dt: update_text_width(None, None), 0.3)
         Clock.schedule_once(lambda dt: update_text_width(None, None), 0.5)
 
+    def clear_history(self, instance):
+        self.clear_history_button.disabled = True
+        self.clear_history_button.text = "Clearing..."
+
+        def show(text):
+            self.clear_history_button.text = text
+
+        App.get_running_app().clear_history(
+            on_done=lambda: Clock.schedule_once(lambda dt: show("History cleared")),
+            on_error=lambda e: Clock.schedule_once(lambda dt: show("Could not clear history"))
+        )
+
 
 # SavePopup: Popup for saving a location with description and icon selection
 class SavePopup(Popup):
@@ -498,10 +358,12 @@ class SavePopup(Popup):
     selected_icon = StringProperty(None)
     icon_buttons = {}
 
-    def __init__(self, original_address, address, **kwargs):
+    def __init__(self, original_address, address, result=None, **kwargs):
         super().__init__(**kwargs)
         self.original_address = original_address
         self.address = address
+        # Anonymization result shown on the map; its coordinates are stored with the favorite
+        self.result = result
         self.title = "Save Location"
 
         # Set popup size based on window size
@@ -625,19 +487,20 @@ class SavePopup(Popup):
             warning_popup.open()
             return
 
+        # Any number of favorites may share an icon; an address is saved only once
         saved_locations = load_saved_locations()
-
-        for location in saved_locations:
-            if location["icon"] == self.selected_icon:
-                self.ask_overwrite(location, saved_locations)
-                return
+        existing_location = get_saved_locations_store().find(self.original_address)
+        if existing_location is not None:
+            self.ask_overwrite(existing_location, saved_locations)
+            return
 
         self.save_new_location(saved_locations)
 
     def ask_overwrite(self, existing_location, saved_locations):
-        # Ask the user if they want to overwrite an existing location for the icon
+        # Ask the user if they want to overwrite the location saved for this address
         def overwrite(instance):
-            saved_locations.remove(existing_location)
+            saved_locations[:] = [location for location in saved_locations
+                                  if location["original_address"] != existing_location["original_address"]]
             self.save_new_location(saved_locations)
             confirm_popup.dismiss()
 
@@ -647,7 +510,7 @@ class SavePopup(Popup):
         popup_width = min(Window.width * 0.9, dp(500))
 
         confirm_popup = Popup(
-            title="Overwrite Icon?",
+            title="Overwrite Location?",
             content=BoxLayout(orientation="vertical", spacing=dp(40), padding=dp(40)),
             size_hint=(None, None),
             size=(popup_width, dp(300)),
@@ -660,7 +523,7 @@ class SavePopup(Popup):
         content = confirm_popup.content
 
         overwrite_label = Label(
-            text=f"The icon is already linked to:\n[b]{existing_location['address']}[/b]\nDo you want to overwrite it?",
+            text=f"This address is already saved as:\n[b]{existing_location['address']}[/b]\nDo you want to overwrite it?",
             markup=True,
             color=(0, 0, 0, 1),
             halign="center",
@@ -684,32 +547,31 @@ class SavePopup(Popup):
         confirm_popup.open()
 
     def save_new_location(self, saved_locations):
-        # Actually save the new location and refresh broadcast receiver on Android
+        # Actually save the new location; the notification follows through the store
         description = self.description_input.text
-        saved_locations.append({
+        new_location = {
             "original_address": self.original_address,
             "address": self.address,
             "description": description,
             "icon": self.selected_icon
-        })
-        save_saved_locations(saved_locations)
+        }
 
-        if platform == "android":
-            app = App.get_running_app()
-            print(f"Re-registering BroadcastReceiver after Save (now {len(saved_locations)} locations)...")
+        # Keep coordinates and candidate metadata only if the address was not edited since
+        result = self.result or {}
+        unchanged = result.get("address") == self.address
+        for field in COORDINATE_FIELDS + ("category", "radius", "candidate_count"):
+            new_location[field] = result.get(field) if unchanged else None
 
-            if hasattr(app, 'copy_receiver') and app.copy_receiver is not None:
-                try:
-                    ctx = autoclass('org.kivy.android.PythonActivity').mActivity
-                    java_receiver = app.copy_receiver.receiver
-                    ctx.unregisterReceiver(java_receiver)
-                    print("Old BroadcastReceiver unregistered")
-                except Exception as e:
-                    print(f"Error unregistering old receiver: {e}")
+        # The places found for the address are the first pool to re-roll from; the background refresh widens it
+        new_location["pool"] = vet_candidates(result.get("candidates") or result.get("pool")) if unchanged else []
+        new_location["pool_updated"] = None
 
-            app.register_broadcast_receiver()
+        saved_locations.append(new_location)
+        save_saved_locations(saved_locations)
+        get_address_suggester().add(self.original_address, "saved")
+        App.get_running_app().refresh_pools()
 
-        print(
+        logger.debug(
             f"Location '{self.address}' saved with description: '{description}' and icon: {self.selected_icon}")
         self.dismiss()
 
@@ -719,6 +581,9 @@ class MapWithMarker(BoxLayout):
     def __init__(self, **kwargs):
         super(MapWithMarker, self).__init__(**kwargs)
         self.original_address = ""
+        self.current_result = None
+        self._prefetch_event = None
+        self._prefetch_address = None
         self.orientation = 'vertical'
         self.padding = dp(20)
 
@@ -738,6 +603,11 @@ class MapWithMarker(BoxLayout):
             background_normal='',
             background_active=''
         )
+        self.address_input.bind(text=self._on_address_text)
+
+        # Suggestions from the on-device address index, shown under the input while typing
+        self.suggestions = DropDown(max_height=dp(240))
+        self.suggestions.bind(on_select=self._select_suggestion)
 
         self.copy_button = Button(text='Copy', size_hint=(None, None), size=(dp(50), dp(50)),
                                   background_color=(0.1, 0.7, 0.3, 1), background_normal='', background_down='')
@@ -767,7 +637,18 @@ class MapWithMarker(BoxLayout):
         self.submit_button.bind(on_press=self.show_map)
 
         # MapView and markers for displaying original and generated locations
-        self.mapview = MapView(zoom=15, lat=0, lon=0, size_hint=[1, 0.8])
+        # (imported here: the map screen is only built when first shown)
+        from kivy_garden.mapview import MapView, MapMarker, MapSource
+
+        tile_cache = get_tile_cache()
+        if tile_cache is not None:
+            # MapView reads tiles from, and downloads into, the bounded tile cache
+            map_source = MapSource(url=tile_cache.url, cache_key=tile_cache.cache_key, tile_size=TILE_SIZE,
+                                   image_ext=IMAGE_EXT, cache_dir=tile_cache.directory)
+            self.mapview = MapView(zoom=15, lat=0, lon=0, size_hint=[1, 0.8],
+                                   map_source=map_source, cache_dir=tile_cache.directory)
+        else:
+            self.mapview = MapView(zoom=15, lat=0, lon=0, size_hint=[1, 0.8])
         self.marker_new_address = MapMarker(lat=0, lon=0, color=(1, 0, 0, 1))
         self.mapview.add_widget(self.marker_new_address)
         self.marker_old_address = MapMarker(lat=0, lon=0, color=(0.6, 0.0, 0.0, 1.0))
@@ -805,7 +686,7 @@ class MapWithMarker(BoxLayout):
                 Clock.schedule_once(animate_legend, 0.05)
 
         animate_legend(0)
-        print("Map Legend displayed")
+        logger.debug("Map Legend displayed")
 
     def hide_legend(self):
         # Hide the legend widget with a fade-out animation
@@ -818,10 +699,13 @@ class MapWithMarker(BoxLayout):
                     self.mapview.remove_widget(self.map_legend)
 
         animate_legend_hide(0)
-        print("Map Legend hidden")
+        logger.debug("Map Legend hidden")
 
     def go_to_start(self, instance):
-        # Navigate back to the start screen
+        # Navigate back to the start screen and drop any pending anonymization
+        self._cancel_prefetch()
+        get_scheduler().cancel("anonymize")
+        self._reset_submit_button()
         self.parent.parent.current = 'start'
 
     def _update_rect(self, instance, value):
@@ -829,28 +713,127 @@ class MapWithMarker(BoxLayout):
         self.rect.pos = instance.pos
         self.rect.size = instance.size
 
+    def _on_address_text(self, instance, text):
+        # Only typed text gets suggestions; results written into the input do not
+        if instance.focus:
+            self._show_suggestions(text)
+
+        # Debounce typing; a prefetch for older text is no longer useful
+        self._cancel_prefetch()
+        self._prefetch_event = Clock.schedule_once(lambda dt: self._prefetch(text), PREFETCH_DELAY)
+
+    def _show_suggestions(self, text):
+        # Served from memory on every keystroke, without any network request
+        suggestions = [suggestion for suggestion in get_address_suggester().suggest(text) if suggestion != text]
+        self.suggestions.clear_widgets()
+        if not suggestions:
+            self.suggestions.dismiss()
+            return
+
+        for suggestion in suggestions:
+            button = Button(text=suggestion, size_hint_y=None, height=dp(40), halign='left', shorten=True,
+                            color=(0, 0, 0, 1), background_color=(0.95, 0.95, 0.95, 1), background_normal='')
+            button.bind(size=lambda instance, size: setattr(instance, 'text_size', (size[0] - dp(16), None)))
+            button.bind(on_release=lambda instance: self.suggestions.select(instance.text))
+            self.suggestions.add_widget(button)
+
+        if self.suggestions.parent is None:
+            self.suggestions.open(self.address_input)
+
+    def _select_suggestion(self, instance, text):
+        self.address_input.text = text
+        self.suggestions.dismiss()
+
+    def _cancel_prefetch(self):
+        if self._prefetch_event is not None:
+            self._prefetch_event.cancel()
+            self._prefetch_event = None
+        if self._prefetch_address is not None:
+            get_scheduler().cancel("prefetch")
+            self._prefetch_address = None
+
+    def _prefetch(self, address):
+        # Geocode and fetch places for text that stopped changing, so Submit finds them cached
+        from delocator.engine import looks_like_complete_address, prefetch_address
+
+        self._prefetch_event = None
+        if not looks_like_complete_address(address):
+            return
+        # Shown results, saved and recently anonymized addresses need no network
+        if self.current_result and self.current_result.get('address') == address:
+            return
+        if get_saved_locations_store().find(address, fuzzy=True) is not None:
+            return
+        history = get_history()
+        if history is not None and history.knows(address):
+            return
+
+        self._prefetch_address = address
+        get_scheduler().submit(
+            ("prefetch", address),
+            lambda job: prefetch_address(address, cancel_check=job.raise_if_cancelled),
+            on_error=lambda job, e: logger.debug(f"Prefetch of '{address}' failed: {e}"),
+            channel="prefetch",
+            timeout=ANONYMIZE_TIMEOUT
+        )
+
     def show_map(self, instance):
-        # Perform location anonymization in a separate thread
+        # Queue location anonymization on the shared background worker
+        address = self.address_input.text
+        self.suggestions.dismiss()
+
+        # A running prefetch of this address is kept: the job below queues behind it and hits its caches
+        if self._prefetch_event is not None:
+            self._prefetch_event.cancel()
+            self._prefetch_event = None
+        if self._prefetch_address != address:
+            self._cancel_prefetch()
         self.submit_button.disabled = True
         self.submit_button.text = "Loading..."
         self.submit_button.background_color = (0.5, 0.5, 0.5, 1)
 
-        # API calls in separate thread
-        def api_thread():
-            try:
-                self._perform_api_calls()
-            except Exception as e:
-                print(f"❌ Error in API thread: {e}")
-                traceback.print_exc()
-                Clock.schedule_once(lambda dt: self.show_error_popup("API Error", str(e)))
-            finally:
-                # Reset Submit Button to normal
-                Clock.schedule_once(lambda dt: self._reset_submit_button())
-
-        # Start thread
-        thread = Thread(target=api_thread)
-        thread.daemon = True
-        thread.start()
+        # Pool searches make way for the Submit and go on once it is answered
+        get_scheduler().cancel("pools")
+        app = App.get_running_app()
+
+        def on_done(job, result):
+            self._apply_if_current(job, self._reset_submit_button)
+            app.refresh_pools()
+
+        def on_error(job, e):
+            logger.warning(f"❌ Error in API job: {e}", exc_info=e)
+            if isinstance(e, JobTimeout):
+                message = "The request took too long.\nPlease try again."
+            else:
+                message = str(e)
+            self._apply_if_current(job, lambda: self.show_error_popup("API Error", message))
+            self._apply_if_current(job, self._reset_submit_button)
+            app.refresh_pools()
+
+        def run(job):
+            # Profiled only when DELOCATOR_PROFILE names an output file
+            with profiling():
+                self._perform_api_calls(address, job)
+
+        # Identical addresses share one job; a new address supersedes the previous one
+        get_scheduler().submit(
+            ("anonymize", address),
+            run,
+            on_done=on_done,
+            on_error=on_error,
+            channel="anonymize",
+            timeout=ANONYMIZE_TIMEOUT
+        )
+
+    def _apply_if_current(self, job, callback):
+        # Run a UI update on the main thread unless the job was cancelled or superseded meanwhile
+        def apply(dt):
+            if job.cancelled:
+                logger.debug(f"Skipped UI update of cancelled job: {job.key}")
+                return
+            callback()
+
+        Clock.schedule_once(apply)
 
     def _reset_submit_button(self):
         # Reset submit button state after API call
@@ -858,104 +841,133 @@ class MapWithMarker(BoxLayout):
         self.submit_button.text = "Submit"
         self.submit_button.background_color = (0.1, 0.7, 0.3, 1)
 
-    def _perform_api_calls(self):
+    def _perform_api_calls(self, address, job):
         # Geocode address, fetch nearby locations, and update map markers
-        self.original_address = self.address_input.text
-        address = self.address_input.text
-
-        # SSL Setup
-        ctx = ssl._create_unverified_context(cafile=certifi.where())
-        geopy.geocoders.options.default_ssl_context = ctx
-        loc = Nominatim(user_agent="DeLocatorApp", timeout=10)
+        from delocator.engine import AnonymizationError, anonymize_address
+
+        loc = get_geocoder()
+
+        # Check saved locations (matched on the normalized original address, tolerating small differences)
+        location = get_saved_locations_store().find(address, fuzzy=True)
+        if location is not None:
+            logger.debug(f"Address already saved: {location['address']}")
+            if not has_coordinates(location):
+                # Saved before coordinates were stored: geocode once and persist them
+                self._backfill_coordinates(location, loc)
+            if has_coordinates(location):
+                self._warm_tiles(location["latitude"], location["longitude"],
+                                 location["original_latitude"], location["original_longitude"], job)
+            self._apply_if_current(job, lambda: self._update_ui_with_saved_location(location))
+            return
 
-        # Check saved locations
-        saved_locations = load_saved_locations()
-        for location in saved_locations:
-            if location["original_address"] == address:
-                print(f"Address already saved: {location['address']}")
-                Clock.schedule_once(lambda dt: self._update_ui_with_saved_location(location, loc))
+        # A near-duplicate of an address looked up before (typo, abbreviation, missing postal code)
+        # stands in for it, so both share one geocoding result and history entry
+        geocode_cache = get_geocode_cache()
+        known_address = geocode_cache.match(address) if geocode_cache is not None else None
+        if known_address is not None and known_address != address:
+            logger.debug(f"'{address}' matched known address '{known_address}'")
+            address = known_address
+
+        # An address anonymized before is drawn again from its stored candidates, without geocoding or POI search
+        history = get_history()
+        result = history.replay(address) if history is not None else None
+        replayed = result is not None
+        if replayed:
+            logger.debug(f"Replayed from history: {address}")
+        else:
+            # Geocoding, POI search and random selection
+            try:
+                result = anonymize_address(address, geocoder=loc, cancel_check=job.raise_if_cancelled,
+                                           adaptive=True, keep_candidates=True)
+            except AnonymizationError as e:
+                title, message = e.title, e.message
+                self._apply_if_current(job, lambda: self.show_error_popup(title, message))
                 return
 
-        # Geocoding
-        location = loc.geocode(address)
-        if not location:
-            Clock.schedule_once(lambda dt: self.show_error_popup(
-                "Address Not Found",
-                "No address found for your input.\nPlease try a different search term."
-            ))
-            return
-
-        print(f"Address found: {location.address}")
+        if history is not None:
+            if replayed:
+                # Recording the replayed candidates again would renew their age, so they would never expire
+                history.record({key: value for key, value in result.items() if key != 'candidates'})
+            else:
+                history.record(result)
+        # The candidates stay with the result: saving it as a favorite keeps them as its pool
 
-        try:
-            amenities_data = get_places_with_fallback(None, location, radius=500)  # api=None
-        except Exception as e:
-            error_message = str(e)
-            Clock.schedule_once(lambda dt: self.show_error_popup(
-                "API Error", f"Failed to fetch nearby locations.\nError: {error_message}"
-            ))
-            return
+        # Remember the address for autocomplete
+        get_address_suggester().add(address, "history")
 
-        if not amenities_data:
-            Clock.schedule_once(lambda dt: self.show_error_popup(
-                "No Locations Found",
-                "No public places found near this address.\nPlease try a different location."
-            ))
-            return
+        self._warm_tiles(result['latitude'], result['longitude'],
+                         result['original_latitude'], result['original_longitude'], job)
 
-        # Process results
-        amenities = [(place_data['address'], place_data['coordinates'])
-                     for place_data in amenities_data]
+        # UI Update in Main Thread
+        self._apply_if_current(job, lambda: self._update_ui_with_new_location(result))
 
-        if not amenities:
-            Clock.schedule_once(lambda dt: self.show_error_popup(
-                "No Valid Addresses",
-                "No valid public place addresses found.\nPlease try a different location."
-            ))
+    def _warm_tiles(self, new_lat, new_lon, old_lat, old_lon, job):
+        # Download the tiles around both markers before the map is revealed, so it appears fully rendered
+        tile_cache = get_tile_cache()
+        if tile_cache is None:
+            return
+        width, height = self.mapview.size
+        tiles = tiles_for_view([(new_lat, new_lon), (old_lat, old_lon)], int(self.mapview.zoom), width, height)
+        with span("tile_warmup"):
+            ready = tile_cache.warm(tiles, cancel_check=job.raise_if_cancelled)
+        logger.debug(f"Map tiles ready: {ready}/{len(tiles)}")
+
+    def _backfill_coordinates(self, saved_location, geocoder):
+        # Geocode a legacy favorite and store its coordinates for offline replay
+        original_address = geocoder.geocode(saved_location["original_address"])
+        address = geocoder.geocode(saved_location['address'])
+        if not (original_address and address):
             return
 
-        # Random selection
-        selected_place, (lon, lat) = random.choice(amenities)
+        saved_location["latitude"] = address.latitude
+        saved_location["longitude"] = address.longitude
+        saved_location["original_latitude"] = original_address.latitude
+        saved_location["original_longitude"] = original_address.longitude
 
-        # UI Update in Main Thread
-        Clock.schedule_once(lambda dt: self._update_ui_with_new_location(
-            selected_place, lat, lon, location
-        ))
+        saved_locations = load_saved_locations()
+        for location in saved_locations:
+            if location["original_address"] == saved_location["original_address"]:
+                location.update({field: saved_location[field] for field in COORDINATE_FIELDS})
+        save_saved_locations(saved_locations)
+        logger.debug(f"Stored coordinates for saved location: {saved_location['address']}")
 
-    def _update_ui_with_saved_location(self, saved_location, geocoder):
-        # Update the map with saved location data
+    def _update_ui_with_saved_location(self, saved_location):
+        # Update the map with saved location data, using the stored coordinates
         try:
             self.address_input.text = saved_location["address"]
+            self.original_address = saved_location["original_address"]
+            self.current_result = saved_location
 
-            original_address = geocoder.geocode(saved_location["original_address"])
-            address = geocoder.geocode(saved_location['address'])
-
-            self._update_map_markers(address.latitude, address.longitude,
-                                     original_address.latitude, original_address.longitude)
+            self._update_map_markers(saved_location["latitude"], saved_location["longitude"],
+                                     saved_location["original_latitude"], saved_location["original_longitude"])
         except Exception as e:
-            print(f"Error updating saved location: {e}")
+            logger.warning(f"Error updating saved location: {e}")
             pass
 
-    def _update_ui_with_new_location(self, selected_place, lat, lon, original_location):
+    def _update_ui_with_new_location(self, result):
         # Update the map with new anonymized location data
         try:
-            self.address_input.text = selected_place
-            self._update_map_markers(lat, lon, original_location.latitude, original_location.longitude)
+            self.address_input.text = result['address']
+            self.original_address = result['original_address']
+            self.current_result = result
+            self._update_map_markers(result['latitude'], result['longitude'],
+                                     result['original_latitude'], result['original_longitude'])
         except Exception as e:
-            print(f"Error updating new location: {e}")
+            logger.warning(f"Error updating new location: {e}")
             pass
 
     def _update_map_markers(self, new_lat, new_lon, old_lat, old_lon):
         # Update marker positions on the map
-        self.marker_new_address.lat = new_lat
-        self.marker_new_address.lon = new_lon
-        self.marker_old_address.lat = old_lat
-        self.marker_old_address.lon = old_lon
+        with span("ui_update"):
+            self.marker_new_address.lat = new_lat
+            self.marker_new_address.lon = new_lon
+            self.marker_old_address.lat = old_lat
+            self.marker_old_address.lon = old_lon
 
-        # Center map
-        center_lat = (new_lat + old_lat) / 2
-        center_lon = (new_lon + old_lon) / 2
-        self.mapview.center_on(center_lat, center_lon)
+            # Center map
+            center_lat = (new_lat + old_lat) / 2
+            center_lon = (new_lon + old_lon) / 2
+            self.mapview.center_on(center_lat, center_lon)
 
         # Show map
         self.mapview.opacity = 1
@@ -991,112 +1003,187 @@ class MapWithMarker(BoxLayout):
     def open_save_popup(self, instance):
         # Open the SavePopup for the current address
         address = self.address_input.text
-        save_popup = SavePopup(original_address=self.original_address, address=address)
+        save_popup = SavePopup(original_address=self.original_address, address=address,
+                               result=self.current_result)
         save_popup.open()
 
 
-# ShowSavedLocationsPopup: Popup window for viewing, copying, and deleting saved locations
-class ShowSavedLocationsPopup(Popup):
-    def __init__(self, saved_locations, **kwargs):
-        super().__init__(**kwargs)
-        self.title = "Saved Locations"
-        self.size_hint = (0.9, 0.8)
-        self.title_color = (0, 0, 0, 1)
-        self.background = ""
-        self.background_color = (1, 1, 1, 1)
+# SavedLocationRow: One row of the saved locations list. RecycleView creates only
+# as many rows as fit on screen and rebinds them to other entries while scrolling.
+class SavedLocationRow(RecycleDataViewBehavior, BoxLayout):
+    def __init__(self, **kwargs):
+        super().__init__(orientation="vertical", spacing=dp(5), **kwargs)
+        self.list_view = None
+        self.address = ""
+        self.original_address = ""
 
-        main_layout = BoxLayout(orientation="vertical", padding=dp(20), spacing=dp(10))
+        address_layout = BoxLayout(orientation="horizontal", spacing=dp(10), size_hint_y=None, height=dp(50))
 
-        # ScrollView for displaying all saved locations
-        scroll_view = ScrollView()
-        layout = BoxLayout(orientation="vertical", spacing=dp(10), size_hint_y=None)
-        layout.bind(minimum_height=layout.setter("height"))
+        # Icon for the saved location
+        self.icon = Image(size_hint=(None, None), size=(dp(40), dp(40)))
+        address_layout.add_widget(self.icon)
 
-        for location in saved_locations:
-            entry_layout = BoxLayout(orientation="vertical", size_hint_y=None, height=dp(100), spacing=dp(5))
-
-            address_layout = BoxLayout(orientation="horizontal", spacing=dp(10), size_hint_y=None, height=dp(50))
-
-            # Icon for the saved location
-            icon_path = location.get("icon", None)
-            if icon_path:
-                icon = Image(source=icon_path, size_hint=(None, None), size=(dp(40), dp(40)))
-                address_layout.add_widget(icon)
-
-            # Address and description label
-            address_label = Label(
-                text=f"[b]{location['address']}[/b]\n{location.get('description', '')}",
-                markup=True,
-                size_hint_x=1,
-                halign="left",
-                valign="middle",
-                color=(0, 0, 0, 1)
-            )
-            address_label.bind(size=address_label.setter("text_size"))
-            address_layout.add_widget(address_label)
+        # Address and description label
+        self.address_label = Label(
+            markup=True,
+            size_hint_x=1,
+            halign="left",
+            valign="middle",
+            color=(0, 0, 0, 1)
+        )
+        self.address_label.bind(size=self.address_label.setter("text_size"))
+        address_layout.add_widget(self.address_label)
 
-            entry_layout.add_widget(address_layout)
+        self.add_widget(address_layout)
 
-            # Copy and Delete buttons for each saved location
-            button_layout = BoxLayout(size_hint_y=None, height=dp(40), spacing=dp(10))
+        # Copy and Delete buttons for each saved location
+        button_layout = BoxLayout(size_hint_y=None, height=dp(40), spacing=dp(10))
 
-            self.copy_button = Button(text='Copy', size_hint=(None, None), size=(dp(100), dp(40)),
-                                      background_color=(0.1, 0.7, 0.3, 1), background_normal='', background_down='')
-            self.copy_button.bind(on_release=lambda btn, address=location['address']: self.copy_address(address))
-            button_layout.add_widget(self.copy_button)
+        copy_button = Button(text='Copy', size_hint=(None, None), size=(dp(100), dp(40)),
+                             background_color=(0.1, 0.7, 0.3, 1), background_normal='', background_down='')
+        copy_button.bind(on_release=lambda btn: self.list_view.copy_address(self.address))
+        button_layout.add_widget(copy_button)
 
-            delete_button = Button(
-                text="Delete",
-                size_hint=(None, None),
-                size=(dp(100), dp(40)),
-                background_color=(0.9, 0.3, 0.3, 1),
-                background_normal=""
-            )
-            delete_button.bind(on_release=lambda btn, address=location['address']: self.delete_address(address))
-            button_layout.add_widget(delete_button)
+        # Draws another place from the favorite's pool, without any network request
+        self.reroll_button = Button(text='Re-roll', size_hint=(None, None), size=(dp(100), dp(40)),
+                                    background_color=(0.2, 0.5, 0.8, 1), background_normal='')
+        self.reroll_button.bind(on_release=lambda btn: self.list_view.reroll_address(self.original_address))
+        button_layout.add_widget(self.reroll_button)
 
-            entry_layout.add_widget(button_layout)
-            layout.add_widget(entry_layout)
+        delete_button = Button(
+            text="Delete",
+            size_hint=(None, None),
+            size=(dp(100), dp(40)),
+            background_color=(0.9, 0.3, 0.3, 1),
+            background_normal=""
+        )
+        delete_button.bind(on_release=lambda btn: self.list_view.delete_address(self.original_address))
+        button_layout.add_widget(delete_button)
+
+        self.add_widget(button_layout)
+
+    def refresh_view_attrs(self, rv, index, data):
+        # Bind the row to the entry at index (the keys are not widget attributes, so no super call)
+        self.list_view = rv
+        self.address = data['address']
+        self.original_address = data['original_address']
+        self.address_label.text = data['label']
+        self.icon.source = data['icon'] or ""
+        self.icon.opacity = 1 if data['icon'] else 0
+        self.reroll_button.disabled = not data['can_reroll']
+
+
+def saved_location_row(location):
+    # RecycleView data for one saved location; rows are keyed on the original address, which is unique
+    return {
+        'original_address': location['original_address'],
+        'address': location['address'],
+        'label': f"[b]{location['address']}[/b]\n{location.get('description', '')}",
+        'icon': location.get("icon"),
+        'can_reroll': can_reroll(location)
+    }
+
+
+# SavedLocationsList: RecycleView kept in sync with the saved locations store.
+# A change patches only the rows that differ instead of rebuilding the list.
+class SavedLocationsList(RecycleView):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.viewclass = SavedLocationRow
+        layout = RecycleBoxLayout(orientation="vertical", spacing=dp(10), size_hint_y=None,
+                                  default_size=(None, dp(100)), default_size_hint=(1, None))
+        layout.bind(minimum_height=layout.setter("height"))
+        self.add_widget(layout)
 
-        scroll_view.add_widget(layout)
-        main_layout.add_widget(scroll_view)
+        self._pending = None
+        self._patch_trigger = Clock.create_trigger(self._apply_pending)
+        self.data = [saved_location_row(location) for location in load_saved_locations()]
+        get_saved_locations_store().subscribe(self._on_saved_locations)
 
-        self.content = main_layout
+    def _on_saved_locations(self, locations):
+        # Called on the thread that changed the store; several changes are applied in one frame
+        self._pending = locations
+        self._patch_trigger()
+
+    def _apply_pending(self, dt):
+        locations, self._pending = self._pending, None
+        if locations is not None:
+            self.patch([saved_location_row(location) for location in locations])
+
+    def patch(self, rows):
+        """
+        Turns the shown rows into the given ones with the fewest list
+        operations; untouched rows keep their views.
+        """
+        old_keys = [row['original_address'] for row in self.data]
+        new_keys = [row['original_address'] for row in rows]
+        opcodes = difflib.SequenceMatcher(None, old_keys, new_keys, autojunk=False).get_opcodes()
+
+        # Back to front, so the indices of earlier operations stay valid
+        for tag, i1, i2, j1, j2 in reversed(opcodes):
+            if tag == "equal":
+                for offset in range(i2 - i1):
+                    if self.data[i1 + offset] != rows[j1 + offset]:
+                        self.data[i1 + offset] = rows[j1 + offset]
+            elif tag == "delete":
+                del self.data[i1:i2]
+            else:
+                self.data[i1:i2] = rows[j1:j2]
 
     def copy_address(self, address):
         # Copy the address to the clipboard
         Clipboard.copy(address)
 
-    def delete_address(self, address):
-        # Delete the location from saved locations and update the popup
+    def reroll_address(self, original_address):
+        # Replace the favorite's place with another one from its pool; the row and the notification follow the store
         saved_locations = load_saved_locations()
-        saved_locations = [location for location in saved_locations if location['address'] != address]
+        for index, location in enumerate(saved_locations):
+            if location['original_address'] == original_address:
+                rerolled = reroll(location)
+                if rerolled is None:
+                    return
+                saved_locations[index] = rerolled
+                save_saved_locations(saved_locations)
+
+                history = get_history()
+                if history is not None:
+                    history.record(rerolled)
+                logger.debug(f"Re-rolled '{location['address']}' to '{rerolled['address']}'")
+                return
+
+    def delete_address(self, original_address):
+        # Delete the location; the store notifies this list (which drops just that row) and the notification
+        saved_locations = load_saved_locations()
+        saved_locations = [location for location in saved_locations
+                           if location['original_address'] != original_address]
         save_saved_locations(saved_locations)
 
-        # Re-register broadcast receiver for Android notifications if needed
-        if platform == "android":
-            app = App.get_running_app()
-            print(f"Re-registering BroadcastReceiver after Delete (now {len(saved_locations)} locations)...")
 
-            if hasattr(app, 'copy_receiver') and app.copy_receiver is not None:
-                try:
-                    ctx = autoclass('org.kivy.android.PythonActivity').mActivity
-                    java_receiver = app.copy_receiver.receiver
-                    ctx.unregisterReceiver(java_receiver)
-                    print("Old BroadcastReceiver unregistered")
-                except Exception as e:
-                    print(f"Error unregistering old receiver: {e}")
+# ShowSavedLocationsPopup: Popup window for viewing, copying, and deleting saved locations.
+# It is created once and reopened; its list follows the store while closed.
+class ShowSavedLocationsPopup(Popup):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.title = "Saved Locations"
+        self.size_hint = (0.9, 0.8)
+        self.title_color = (0, 0, 0, 1)
+        self.background = ""
+        self.background_color = (1, 1, 1, 1)
+
+        main_layout = BoxLayout(orientation="vertical", padding=dp(20), spacing=dp(10))
 
-            app.register_broadcast_receiver()
+        # Virtualized list of all saved locations
+        self.locations_list = SavedLocationsList()
+        main_layout.add_widget(self.locations_list)
 
-        self.dismiss()
-        ShowSavedLocationsPopup(saved_locations=saved_locations).open()
+        self.content = main_layout
 
 
 # StartScreen: The main/home screen of the app
 class StartScreen(Screen):
     def __init__(self, **kwargs):
         super(StartScreen, self).__init__(**kwargs)
+        self.saved_locations_popup = None
 
         # Set the window background color to white
         Window.clearcolor = (1, 1, 1, 1)
@@ -1219,10 +1306,11 @@ class StartScreen(Screen):
         """
         Displays the saved locations popup if locations exist, otherwise shows a message.
         """
-        saved_locations = load_saved_locations()
-        if saved_locations:
-            saved_locations_popup = ShowSavedLocationsPopup(saved_locations=saved_locations)
-            saved_locations_popup.open()
+        if load_saved_locations():
+            # Built on first use and kept; the list updates itself when locations change
+            if self.saved_locations_popup is None:
+                self.saved_locations_popup = ShowSavedLocationsPopup()
+            self.saved_locations_popup.open()
         else:
             no_saved_locations_popup = Popup(title='Saved Locations', title_color=(0, 0, 0, 1),
                                              content=Label(text="No saved locations found.", color=(0, 0, 0, 1)),
@@ -1234,10 +1322,19 @@ class StartScreen(Screen):
 class MapScreen(Screen):
     def __init__(self, **kwargs):
         super(MapScreen, self).__init__(**kwargs)
-        # Add the MapWithMarker widget to display the map and controls
+        # The MapWithMarker widget (map and controls) is built when the screen is first shown
+        self.map_view = None
+        if EAGER_STARTUP:
+            self._build_map_view()
+
+    def _build_map_view(self):
         self.map_view = MapWithMarker()
         self.add_widget(self.map_view)
 
+    def on_pre_enter(self, *args):
+        if self.map_view is None:
+            self._build_map_view()
+
     def go_to_start(self, instance):
         """
         Navigates back to the start screen.
@@ -1247,7 +1344,56 @@ class MapScreen(Screen):
 
 # Main application class
 class MyApp(App):
+    # FavoritesNotifier for the notification and its BroadcastReceiver (Android only)
+    notifier = None
     def build(self):
+        # Quiet by default; DELOCATOR_LOG_LEVEL, DELOCATOR_TRACE and DELOCATOR_PROFILE enable diagnostics
+        configure_logging()
+
+        # Original addresses whose pool could not be refreshed in this session
+        self.pool_failures = set()
+
+        # Saved locations live in the app's private data directory (older versions used the working directory)
+        configure_saved_locations(os.path.join(self.user_data_dir, SAVED_LOCATIONS_FILE),
+                                  legacy_path=os.path.abspath(SAVED_LOCATIONS_FILE))
+
+        # Open the on-device POI, geocode and density caches and the history in the app's private data directory
+        try:
+            configure_poi_cache(os.path.join(self.user_data_dir, "poi_cache.sqlite3"))
+            configure_geocode_cache(os.path.join(self.user_data_dir, "geocode_cache.sqlite3"))
+            configure_density_memory(os.path.join(self.user_data_dir, "density.sqlite3"))
+            configure_history(os.path.join(self.user_data_dir, "history.sqlite3"))
+            configure_tile_cache(os.path.join(self.user_data_dir, TILE_CACHE_DIR),
+                                 url=os.environ.get("DELOCATOR_TILE_URL", TILE_URL))
+        except Exception as e:
+            logger.warning(f"Caches unavailable: {e}")
+
+        # Use an imported regional POI index (see "python -m delocator import-pbf") if present
+        offline_index_path = os.path.join(self.user_data_dir, OFFLINE_INDEX_FILE)
+        if os.path.exists(offline_index_path):
+            try:
+                configure_offline_index(offline_index_path)
+            except Exception as e:
+                logger.warning(f"Offline POI index unavailable: {e}")
+
+        # Self-hosted or opt-in Overpass mirrors replace the default overpass-api.de
+        endpoints_path = os.path.join(self.user_data_dir, OVERPASS_ENDPOINTS_FILE)
+        if os.path.exists(endpoints_path):
+            with open(endpoints_path, "r", encoding="utf-8") as file:
+                urls = [line.strip() for line in file if line.strip() and not line.startswith("#")]
+            if urls:
+                configure_overpass_endpoints(urls)
+
+        # Fill the autocomplete index in the background; suggestions appear as soon as it is ready
+        get_scheduler().submit(
+            ("autocomplete",),
+            lambda job: build_address_suggester(load_saved_locations()),
+            channel="autocomplete"
+        )
+
+        if EAGER_STARTUP:
+            import delocator.engine  # noqa: F401
+
         # Create the screen manager and add your main screens
         sm = ScreenManager()
         sm.add_widget(StartScreen(name='start'))
@@ -1258,7 +1404,7 @@ class MyApp(App):
             try:
                 request_permissions([Permission.POST_NOTIFICATIONS])
             except:
-                print("Permission request failed")
+                logger.warning("Permission request failed")
 
         return sm
 
@@ -1267,216 +1413,180 @@ class MyApp(App):
         Handles broadcast intents from Android notifications.
         Copies received address to clipboard and logs details for debugging.
         """
-        print(f"BroadcastReceiver called!")
-        print(f"Intent Action: {intent.getAction()}")
+        logger.debug(f"BroadcastReceiver called!")
+        logger.debug(f"Intent Action: {intent.getAction()}")
 
         extras = intent.getExtras()
         if extras:
-            print(f"Intent Extras found:")
+            logger.debug(f"Intent Extras found:")
             for key in extras.keySet():
                 value = extras.get(key)
-                print(f"'{key}' = '{value}' (Type: {type(value)})")
+                logger.debug(f"'{key}' = '{value}' (Type: {type(value)})")
         else:
-            print("No Intent Extras found!")
+            logger.debug("No Intent Extras found!")
 
         # Extract address from intent
         address = intent.getStringExtra("address")
-        print(f"Extracted address: '{address}'")
+        logger.debug(f"Extracted address: '{address}'")
 
         # If address is valid, copy it to clipboard
         if address and address != "None":
             Clipboard.copy(str(address))
-            print(f"Address copied from notification: {address}")
+            logger.debug(f"Address copied from notification: {address}")
         else:
-            print(f"No valid address received: {address}")
+            logger.debug(f"No valid address received: {address}")
 
     def on_pause(self):
         """
         Called when the app goes into the background.
-        On Android, triggers notification setup.
+        On Android, shows the notification with the saved locations.
         """
-        if platform == 'android':
+        # The app may be killed in the background; write pending changes now
+        get_saved_locations_store().flush()
+
+        # A no-op unless the favorites changed or the notification was dismissed
+        if self.notifier is not None:
             try:
-                self.notification = AndroidNotification()
-                self.send_notification()
-            except:
-                print("Notification failed")
+                self.notifier.post(load_saved_locations())
+            except Exception as e:
+                logger.warning(f"Error sending notification: {e}", exc_info=e)
         return True
 
-    def send_notification(self):
-        '''
-        Sends an Android notification with saved location shortcuts (action buttons)
-        Only works on Android; prints a message if used elsewhere.
-        '''
-        try:
-            # Load all saved locations from local storage
-            saved_locations = load_saved_locations()
-            if not saved_locations:
-                print("No saved locations found. No notification sent.")
-                return
+    def on_start(self):
+        """
+        Called when the app starts.
+        Registers the BroadcastReceiver for notifications if on Android; it and
+        the notification then follow changes of the saved locations.
+        """
+        Window.bind(on_flip=self._on_first_frame)
 
-            # Prepare Android system objects for notification creation
-            PythonActivity = autoclass('org.kivy.android.PythonActivity')
-            Context = autoclass('android.content.Context')
-            NotificationManager = autoclass('android.app.NotificationManager')
-            NotificationChannel = autoclass('android.app.NotificationChannel')
-            NotificationCompat_Builder = autoclass('androidx.core.app.NotificationCompat$Builder')
-            PendingIntent = autoclass('android.app.PendingIntent')
-            Intent = autoclass('android.content.Intent')
-            BuildVersion = autoclass('android.os.Build$VERSION')
-
-            context = PythonActivity.mActivity
-            notification_manager = context.getSystemService(Context.NOTIFICATION_SERVICE)
-            pkg = context.getPackageName()
-
-            # Create notification channel if on Android 8+ (API 26+)
-            channel_id = "saved_locations_channel"
-            if BuildVersion.SDK_INT >= 26:
-                if notification_manager.getNotificationChannel(channel_id) is None:
-                    channel = NotificationChannel(
-                        channel_id, "Saved Locations", NotificationManager.IMPORTANCE_DEFAULT
-                    )
-                    notification_manager.createNotificationChannel(channel)
-
-            # Build the notification
-            notification_builder = NotificationCompat_Builder(context, channel_id)
-            notification_builder.setSmallIcon(context.getApplicationInfo().icon)
-            notification_builder.setContentTitle("Saved Locations")
-            notification_builder.setContentText("Tap a location to copy the address")
-            notification_builder.setAutoCancel(True)
-
-            # Mapping icons to human-readable names
-            icon_mapping = {
-                "icons/home.png": "Home",
-                "icons/work.png": "Work",
-                "icons/family.png": "Family"
-            }
-
-            # Create an action button for each saved location
-            for index, location in enumerate(saved_locations):
-                address = location["address"]
-                icon_path = location.get("icon", "")
-                icon_text = icon_mapping.get(icon_path, "Location")
-
-                print(f"Creating notification button {index}: '{icon_text}' -> '{address}'")
-
-                # Create intent for each action button
-                intent = Intent()
-                intent.setAction(f"{pkg}.copy_address_{index}")
-                intent.setPackage(pkg)
-
-                JavaString = autoclass('java.lang.String')
-                address_java = JavaString(str(address))
-                intent.putExtra("address", address_java)
-
-                print(f"Intent Extra set: 'address' = '{address_java}'")
-
-                request_code = 1000 + index
-
-                # Use correct pending intent flags for Android version
-                if BuildVersion.SDK_INT >= 31:
-                    flag = PendingIntent.FLAG_MUTABLE | PendingIntent.FLAG_UPDATE_CURRENT
-                else:
-                    flag = PendingIntent.FLAG_UPDATE_CURRENT
-
-                pending_intent = PendingIntent.getBroadcast(context, request_code, intent, flag)
-
-                # Add the action to the notification builder
-                notification_builder.addAction(0, JavaString(icon_text), pending_intent)
-
-            notification_manager.notify(1, notification_builder.build())
-            print("Notification with saved locations sent.")
-
-        # Send the notification to the system
+        # Load the engine off the UI thread once the start screen is up, so the first
+        # keystroke or Submit does not wait for the import
+        Clock.schedule_once(lambda dt: get_scheduler().submit(
+            ("warm-up",), self._warm_up, on_done=lambda job, result: self.refresh_pools(), channel="warm-up"
+        ), WARM_UP_DELAY)
+
+        if platform == 'android' and autoclass is not None:
+            try:
+                self.notifier = FavoritesNotifier(
+                    autoclass, lambda actions: BroadcastReceiver(self.handle_broadcast, actions=actions)
+                )
+                self.notifier.sync_receiver(load_saved_locations())
+                # Saves and deletes may come from worker threads; Java calls are made on the UI thread
+                get_saved_locations_store().subscribe(
+                    lambda locations: Clock.schedule_once(lambda dt: self._on_saved_locations(locations))
+                )
+            except Exception as e:
+                logger.warning(f"Error starting BroadcastReceiver: {e}")
+                self.notifier = None
+
+    def _on_saved_locations(self, locations):
+        try:
+            self.notifier.on_change(locations)
         except Exception as e:
-            print(f"Error sending notification: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning(f"Error updating notification: {e}")
 
-    def register_broadcast_receiver(self):
+    def _warm_up(self, job):
+        import delocator.engine  # noqa: F401
+        get_geocoder()
+
+        # Tiles MapView downloaded while panning in earlier sessions count against the budget too
+        tile_cache = get_tile_cache()
+        if tile_cache is not None:
+            tile_cache.trim()
+
+    def refresh_pools(self):
         """
-        Registers the Android BroadcastReceiver to handle notification actions.
-        Only registers if saved locations exist.
+        Searches the places of the next favorite whose pool is stale in the
+        background. Each favorite is a job of its own; a Submit cancels the
+        running one (see MapWithMarker.show_map) and starts the refresh again when done.
         """
-        if platform != "android":
+        for location in load_saved_locations():
+            original_address = location['original_address']
+            if original_address in self.pool_failures or not pool_is_stale(location):
+                continue
+            get_scheduler().submit(
+                ("pool", original_address),
+                lambda job: self._refresh_pool(location, job),
+                on_done=lambda job, result: self.refresh_pools(),
+                on_error=lambda job, error: self._on_pool_error(original_address, error),
+                channel="pools",
+                timeout=ANONYMIZE_TIMEOUT
+            )
             return
 
-        saved_locations = load_saved_locations()
-        if not saved_locations:
-            print("No saved_locations - BroadcastReceiver not registered")
-            self.copy_receiver = None
-            return
+    def _refresh_pool(self, location, job):
+        updates = refresh_pool(location, geocoder=get_geocoder(), cancel_check=job.raise_if_cancelled)
+        if updates is None:
+            raise LookupError(f"Address not found: {location['original_address']}")
 
-        try:
-            # Android Java object imports
-            PythonActivity = autoclass('org.kivy.android.PythonActivity')
-            Context = autoclass('android.content.Context')
-            IntentFilter = autoclass('android.content.IntentFilter')
-            BuildVersion = autoclass('android.os.Build$VERSION')
-
-            ctx = PythonActivity.mActivity
-            pkg = ctx.getPackageName()
-            actions = [f"{pkg}.copy_address_{i}" for i in range(len(saved_locations))]
-
-            filter = IntentFilter()
-            for action in actions:
-                filter.addAction(action)
-
-            # Set up the BroadcastReceiver for each saved location
-            self.copy_receiver = BroadcastReceiver(self.handle_broadcast, actions=actions)
-            java_receiver = self.copy_receiver.receiver
-
-            # Correct registration for Android 13+ (SDK 33+)
-            if BuildVersion.SDK_INT >= 33:
-                RECEIVER_EXPORTED = 2
-                ctx.registerReceiver(java_receiver, filter, RECEIVER_EXPORTED)
-            else:
-                ctx.registerReceiver(java_receiver, filter)
+        saved_locations = load_saved_locations()
+        for saved_location in saved_locations:
+            if saved_location['original_address'] == location['original_address']:
+                saved_location.update(updates)
+        save_saved_locations(saved_locations)
 
-            print(f"BroadcastReceiver registered with {len(actions)} actions")
-        except Exception as e:
-            print(f"Error registering BroadcastReceiver: {e}")
-            self.copy_receiver = None
+    def _on_pool_error(self, original_address, error):
+        # Skipped until the next start, then tried again; the other favorites go on
+        logger.warning(f"Could not refresh the pool of '{original_address}': {error}")
+        self.pool_failures.add(original_address)
+        self.refresh_pools()
 
-    def on_start(self):
+    def clear_history(self, on_done=None, on_error=None):
         """
-        Called when the app starts.
-        Registers the BroadcastReceiver for notifications if on Android.
+        Forgets the anonymized addresses, their candidates and the looked up
+        queries in the background. Saved locations and their suggestions stay.
         """
-        if platform == 'android':
-            try:
-                self.register_broadcast_receiver()
-            except Exception as e:
-                print(f"Error starting BroadcastReceiver: {e}")
+        def run(job):
+            for store in (get_history(), get_geocode_cache()):
+                if store is not None:
+                    store.clear()
+            suggester = get_address_suggester()
+            suggester.personal.clear()
+            suggester.personal.add_many((location.get("original_address") for location in load_saved_locations()),
+                                        "saved")
+
+        def failed(job, error):
+            logger.warning(f"Could not clear history: {error}")
+            if on_error is not None:
+                on_error(error)
+
+        get_scheduler().submit(
+            ("clear-history",),
+            run,
+            on_done=lambda job, result: on_done() if on_done is not None else None,
+            on_error=failed,
+            channel="clear-history"
+        )
+
+    def _on_first_frame(self, window):
+        Window.unbind(on_flip=self._on_first_frame)
+        elapsed = time.perf_counter() - STARTED
+        logger.info(f"First frame after {elapsed:.3f}s")
+        if STARTUP_BENCHMARK:
+            print(f"DELOCATOR_FIRST_FRAME {elapsed:.6f}", flush=True)
+            self.stop()
 
     def on_stop(self):
         """
         Called when the app is stopped.
-        Unregisters the BroadcastReceiver if it was registered.
+        Unregisters the BroadcastReceiver if it was registered, writes pending
+        saved-location changes and closes the HTTP clients.
         """
-        if platform == "android" and hasattr(self, "copy_receiver") and self.copy_receiver is not None:
-            try:
-                ctx = autoclass('org.kivy.android.PythonActivity').mActivity
-                java_receiver = self.copy_receiver.receiver
-                ctx.unregisterReceiver(java_receiver)
-                print("BroadcastReceiver unregistered")
-            except Exception as e:
-                print(f"Error unregistering BroadcastReceiver: {e}")
+        get_saved_locations_store().flush()
+        close_clients()
 
+        if self.notifier is not None:
+            self.notifier.close()
 
-# Helper functions for loading and saving locations to JSON file
+
+# Helper functions for reading and changing the saved locations (cached in memory, written back atomically)
 def load_saved_locations():
-    try:
-        with open("saved_locations.json", "r") as file:
-            saved_locations = json.load(file)
-    except FileNotFoundError:
-        saved_locations = []
-    return saved_locations
+    return get_saved_locations_store().load()
 
 
 def save_saved_locations(saved_locations):
-    with open("saved_locations.json", "w") as file:
-        json.dump(saved_locations, file)
+    get_saved_locations_store().save(saved_locations)
 
 
 # Run the application
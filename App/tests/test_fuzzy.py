@@ -0,0 +1,90 @@
+import pytest
+
+from delocator.fuzzy import TrigramIndex, address_parts
+from delocator.geocode_cache import normalize_address
+
+
+@pytest.mark.parametrize("address, expected", [
+    ("Hauptstr. 5, Wien", "hauptstrasse 5 wien"),
+    ("hauptstraße 5 wien", "hauptstrasse 5 wien"),
+    ("  HAUPTSTRASSE   5,,Wien ", "hauptstrasse 5 wien"),
+    ("Maria-Theresien-Pl. 1, 1010 Wien", "maria theresien platz 1 1010 wien"),
+    ("Mariahilfer Str. 10", "mariahilfer strasse 10"),
+    ("Main Rd 3", "main road 3"),
+    ("", ""),
+    (None, ""),
+])
+def test_normalize_address(address, expected):
+    assert normalize_address(address) == expected
+
+
+def test_address_parts_separates_house_number_postcode_and_place():
+    parts = address_parts(normalize_address("Hauptstraße 5/3, 1010 Wien"))
+    assert parts.street == "hauptstrasse"
+    assert parts.numbers == ("5", "3")
+    assert parts.postcodes == ("1010",)
+    assert parts.place == ("wien",)
+
+
+@pytest.fixture
+def index():
+    index = TrigramIndex()
+    for address in ["Hauptstraße 5, Wien", "Lindenweg 3, Berlin", "Hauptstraße 12", "Mariahilfer Straße 10, Wien"]:
+        index.add(normalize_address(address), address)
+    return index
+
+
+def match(index, address):
+    found = index.match(normalize_address(address))
+    return found[0] if found is not None else None
+
+
+@pytest.mark.parametrize("address, expected", [
+    ("Hauptstraße 5, Wien", "Hauptstraße 5, Wien"),
+    ("Hauptstr. 5 Wien", "Hauptstraße 5, Wien"),
+    ("Hauptstrase 5, Wien", "Hauptstraße 5, Wien"),
+    ("Mariahilferstraße 10 Wien", "Mariahilfer Straße 10, Wien"),
+    ("Mariahilfer Strasse 10, 1060 Wien", "Mariahilfer Straße 10, Wien"),
+])
+def test_match_accepts_differently_written_street(index, address, expected):
+    assert match(index, address) == expected
+
+
+@pytest.mark.parametrize("address", [
+    # Another place
+    "Hauptstraße 5, Wels",
+    "Lindenweg 3, Bern",
+    # Another or no house number
+    "Hauptstraße 7, Wien",
+    "Hauptstraße, Wien",
+    "Hauptstraße 5/3, Wien",
+    # A known fragment without a place is not the full address
+    "Hauptstraße 12, Wien",
+    # Another street
+    "Hauptplatz 5, Wien",
+    "",
+])
+def test_match_rejects_other_addresses(index, address):
+    assert match(index, address) is None
+
+
+def test_match_compares_postcodes_where_both_give_one():
+    index = TrigramIndex()
+    index.add(normalize_address("Hauptstraße 5, 1010 Wien"), "first district")
+    assert match(index, "Hauptstrase 5, 1010") == "first district"
+    assert match(index, "Hauptstrase 5, 1020 Wien") is None
+
+
+def test_match_scores_exact_key_one(index):
+    assert index.match(normalize_address("Hauptstr. 5, Wien")) == ("Hauptstraße 5, Wien", 1.0)
+
+
+def test_get_is_exact(index):
+    assert index.get(normalize_address("Hauptstr. 5, Wien")) == "Hauptstraße 5, Wien"
+    assert index.get(normalize_address("Hauptstrase 5, Wien")) is None
+
+
+def test_discard_removes_address(index):
+    index.discard(normalize_address("Hauptstraße 5, Wien"))
+    assert match(index, "Hauptstrase 5, Wien") is None
+    assert len(index) == 3
@@ -0,0 +1,57 @@
+import pytest
+
+from delocator.history import REPLAY_MAX_AGE, AnonymizationHistory
+
+RESULT = {
+    'original_address': "Hauptstraße 5, Wien",
+    'original_latitude': 48.2,
+    'original_longitude': 16.37,
+    'address': "Café Central",
+    'latitude': 48.21,
+    'longitude': 16.36,
+    'category': "dining",
+    'candidates': [{'address': "Café Central", 'latitude': 48.21, 'longitude': 16.36, 'category': "dining"}]
+}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "history.sqlite3")
+
+
+def age(history, seconds):
+    for table in ("history", "candidate_sets"):
+        history._conn.execute(f"UPDATE {table} SET created = created - ?", (seconds,))
+    history._conn.commit()
+
+
+def test_old_entries_are_deleted_on_open(path):
+    history = AnonymizationHistory(path)
+    history.record(RESULT)
+    age(history, REPLAY_MAX_AGE + 60)
+    history.close()
+
+    history = AnonymizationHistory(path)
+    assert len(history) == 0
+    assert not history.knows("Hauptstr. 5, Wien")
+
+
+def test_record_deletes_old_entries_and_keeps_recent_ones(path):
+    history = AnonymizationHistory(path)
+    history.record(RESULT)
+    age(history, REPLAY_MAX_AGE + 60)
+    history.record(dict(RESULT, original_address="Lindenweg 3, Berlin"))
+    history.record(RESULT)
+
+    assert [entry['original_address'] for entry in history.entries()] == ["Hauptstraße 5, Wien",
+                                                                          "Lindenweg 3, Berlin"]
+    assert history.knows("Lindenweg 3, Berlin")
+
+
+def test_clear_forgets_everything(path):
+    history = AnonymizationHistory(path)
+    history.record(RESULT)
+    history.clear()
+
+    assert len(history) == 0
+    assert history.replay("Hauptstraße 5, Wien") is None
@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+from delocator.jobs import JobScheduler, JobTimeout
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = JobScheduler("test-worker")
+    yield scheduler
+    scheduler.shutdown()
+
+
+def wait_for(event):
+    assert event.wait(5), "job did not finish"
+
+
+def test_timeout_starts_when_the_job_runs(scheduler):
+    finished = threading.Event()
+    results = []
+    scheduler.submit(("slow",), lambda job: time.sleep(0.3), channel="pools")
+
+    def quick(job):
+        job.raise_if_cancelled()
+        return "done"
+
+    scheduler.submit(("quick",), quick, channel="anonymize", timeout=0.1,
+                     on_done=lambda job, result: (results.append(result), finished.set()),
+                     on_error=lambda job, error: (results.append(error), finished.set()))
+    wait_for(finished)
+    assert results == ["done"]
+
+
+def test_running_job_past_its_timeout_fails(scheduler):
+    finished = threading.Event()
+    errors = []
+
+    def slow(job):
+        time.sleep(0.2)
+        job.raise_if_cancelled()
+
+    scheduler.submit(("slow",), slow, timeout=0.05,
+                     on_error=lambda job, error: (errors.append(error), finished.set()))
+    wait_for(finished)
+    assert isinstance(errors[0], JobTimeout)
+
+
+def test_cancelled_channel_makes_way(scheduler):
+    started, finished = threading.Event(), threading.Event()
+    calls = []
+
+    def pool(job):
+        started.set()
+        while True:
+            time.sleep(0.01)
+            job.raise_if_cancelled()
+
+    scheduler.submit(("pool",), pool, on_done=lambda job, result: calls.append("pool"), channel="pools")
+    wait_for(started)
+    scheduler.cancel("pools")
+    scheduler.submit(("anonymize",), lambda job: "done", channel="anonymize",
+                     on_done=lambda job, result: (calls.append(result), finished.set()))
+    wait_for(finished)
+    assert calls == ["done"]
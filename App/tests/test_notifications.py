@@ -0,0 +1,78 @@
+import os
+import sys
+
+import pytest
+
+from delocator.notifications import NOTIFICATION_ID, RECEIVER_EXPORTED, FavoritesNotifier
+
+# The pyjnius and notification manager stand-in of the notification benchmark
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, "benchmarks"))
+from bench_notifications import FakeAndroid, favorites  # noqa: E402
+
+
+@pytest.fixture
+def android():
+    return FakeAndroid()
+
+
+@pytest.fixture
+def notifier(android):
+    notifier = FavoritesNotifier(android.autoclass, android.receiver_factory)
+    notifier.sync_receiver(favorites(3))
+    notifier.post(favorites(3))
+    android.calls.clear()
+    android.manager.posted.clear()
+    return notifier
+
+
+def test_pause_with_unchanged_favorites_only_checks_the_notification(android, notifier):
+    assert notifier.post(favorites(3)) is False
+    assert notifier.sync_receiver(favorites(3)) is False
+    assert dict(android.calls) == {"NotificationManager.getActiveNotifications": 1}
+
+
+def test_dismissed_notification_is_posted_again(android, notifier):
+    android.dismiss()
+    assert notifier.post(favorites(3)) is True
+    assert android.manager.posted == [NOTIFICATION_ID]
+    assert android.manager.active == {NOTIFICATION_ID}
+
+
+def test_dismissed_notification_stays_away_after_a_save(android, notifier):
+    android.dismiss()
+    notifier.on_change(favorites(3))
+    assert android.manager.posted == []
+
+
+def test_changed_favorite_updates_the_notification_in_place(android, notifier):
+    notifier.on_change(favorites(3, generation=1))
+    assert android.manager.posted == [NOTIFICATION_ID]
+    assert android.manager.active == {NOTIFICATION_ID}
+    # Same number of buttons: the receiver is kept
+    assert android.calls["Context.registerReceiver"] == 0
+    assert android.calls["Context.unregisterReceiver"] == 0
+
+
+def test_favorite_beyond_the_buttons_touches_nothing(android, notifier):
+    notifier.on_change(favorites(3) + favorites(1, generation=1))
+    assert sum(android.calls.values()) == 0
+
+
+@pytest.mark.parametrize("sdk, flags", [(34, (RECEIVER_EXPORTED,)), (33, (RECEIVER_EXPORTED,)), (30, ())])
+def test_receiver_is_registered_again_only_when_the_count_changes(sdk, flags):
+    android = FakeAndroid(sdk)
+    notifier = FavoritesNotifier(android.autoclass, android.receiver_factory)
+
+    assert notifier.sync_receiver(favorites(2)) is True
+    assert notifier.sync_receiver(favorites(2, generation=1)) is False
+    assert android.calls["Context.registerReceiver"] == 1
+
+    assert notifier.sync_receiver(favorites(3)) is True
+    assert android.calls["Context.unregisterReceiver"] == 1
+    assert android.calls["Context.registerReceiver"] == 2
+    assert notifier.receiver.actions == [f"org.delocator.app.copy_address_{index}" for index in range(3)]
+    assert android.registrations == [flags, flags]
+    assert len(android.receivers) == 1
+
+    notifier.close()
+    assert android.receivers == set()
@@ -0,0 +1,235 @@
+"""
+Benchmark for the favorites notification and its BroadcastReceiver.
+
+Runs delocator.notifications.FavoritesNotifier against an in-process stand-in
+for pyjnius (autoclass) and the Android notification APIs, which counts every
+call that would cross JNI on a device. Compares, per app pause and per saved
+location change:
+  - rebuild: what the app did before, looking up every Java class each time,
+    rebuilding the notification on every pause and the receiver on every save
+  - incremental: one long-lived notifier, which only touches Java when the
+    favorites changed
+
+Usage:
+    python benchmarks/bench_notifications.py
+    python benchmarks/bench_notifications.py --repeat 1000 --sdk 30
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, os.pardir, "App"))
+
+from delocator.notifications import FavoritesNotifier  # noqa: E402
+
+
+# JavaObject: Stand-in for a pyjnius proxy. Any method call is counted and
+# returns another proxy; the few values the notifier inspects are filled in.
+class JavaObject:
+    def __init__(self, android, name, **values):
+        self._android = android
+        self._name = name
+        self.__dict__.update(values)
+
+    def __getattr__(self, attribute):
+        def method(*args):
+            self._android.calls[f"{self._name}.{attribute}"] += 1
+            return JavaObject(self._android, attribute)
+        return method
+
+
+# JavaClass: Stand-in for a class returned by autoclass; calling it is a constructor call
+class JavaClass(JavaObject):
+    def __call__(self, *args):
+        self._android.calls[f"new {self._name}"] += 1
+        return JavaObject(self._android, self._name)
+
+
+# FakeNotificationManager: Keeps the posted notifications and channels, so
+# dismissing a notification can be simulated; posted lists the ids of every notify
+class FakeNotificationManager(JavaObject):
+    def __init__(self, android):
+        super().__init__(android, "NotificationManager")
+        self.active = set()
+        self.channels = set()
+        self.posted = []
+
+    def notify(self, notification_id, notification):
+        self._android.calls["NotificationManager.notify"] += 1
+        self.active.add(notification_id)
+        self.posted.append(notification_id)
+
+    def cancel(self, notification_id):
+        self._android.calls["NotificationManager.cancel"] += 1
+        self.active.discard(notification_id)
+
+    def getActiveNotifications(self):
+        self._android.calls["NotificationManager.getActiveNotifications"] += 1
+        return [JavaObject(self._android, "StatusBarNotification", getId=lambda n=n: n) for n in self.active]
+
+    def getNotificationChannel(self, channel_id):
+        self._android.calls["NotificationManager.getNotificationChannel"] += 1
+        return JavaObject(self._android, "NotificationChannel") if channel_id in self.channels else None
+
+    def createNotificationChannel(self, channel):
+        self._android.calls["NotificationManager.createNotificationChannel"] += 1
+        self.channels.add("saved_locations_channel")
+
+
+# FakeAndroid: The device as the notifier sees it: autoclass, the activity and
+# the notification manager. calls counts the Java calls made so far, and
+# registrations the flags each receiver was registered with.
+class FakeAndroid:
+    def __init__(self, sdk=34):
+        self.calls = Counter()
+        self.sdk = sdk
+        self.manager = FakeNotificationManager(self)
+        self.receivers = set()
+        self.registrations = []
+
+        android = self
+        self.context = JavaObject(
+            self, "Context",
+            getPackageName=lambda: self._count("Context.getPackageName", "org.delocator.app"),
+            getSystemService=lambda name: self._count("Context.getSystemService", self.manager),
+            getApplicationInfo=lambda: self._count("Context.getApplicationInfo",
+                                                   JavaObject(android, "ApplicationInfo", icon=17)),
+            registerReceiver=lambda receiver, intent_filter, *flags: self._count(
+                "Context.registerReceiver", self._register(receiver, flags)),
+            unregisterReceiver=lambda receiver: self._count("Context.unregisterReceiver",
+                                                            self.receivers.discard(receiver))
+        )
+
+    def _count(self, call, result):
+        self.calls[call] += 1
+        return result
+
+    def _register(self, receiver, flags):
+        self.receivers.add(receiver)
+        self.registrations.append(flags)
+
+    def autoclass(self, name):
+        self.calls["autoclass"] += 1
+        short = name.rsplit(".", 1)[-1]
+        values = {}
+        if name == 'org.kivy.android.PythonActivity':
+            values['mActivity'] = self.context
+        elif name == 'android.content.Context':
+            values['NOTIFICATION_SERVICE'] = "notification"
+        elif name == 'android.os.Build$VERSION':
+            values['SDK_INT'] = self.sdk
+        elif name == 'android.app.PendingIntent':
+            values.update(FLAG_UPDATE_CURRENT=0x08000000, FLAG_MUTABLE=0x02000000)
+        elif name == 'android.app.NotificationManager':
+            values['IMPORTANCE_DEFAULT'] = 3
+        return JavaClass(self, short, **values)
+
+    def receiver_factory(self, actions):
+        self.calls["new BroadcastReceiver"] += 1
+        return JavaObject(self, "BroadcastReceiver", receiver=object(), actions=actions)
+
+    def dismiss(self):
+        self.manager.active.clear()
+
+    def java_calls(self):
+        return sum(self.calls.values())
+
+
+def favorites(count, generation=0):
+    icons = ["icons/home.png", "icons/work.png", "icons/family.png"]
+    return [{"address": f"Place {index} v{generation}, 1010 Wien", "icon": icons[index % len(icons)]}
+            for index in range(count)]
+
+
+def measure(android, action, repeat):
+    """
+    Runs action repeat times and returns (Java calls, microseconds) per run.
+    """
+    calls = android.java_calls()
+    started = time.perf_counter()
+    for run in range(repeat):
+        action(run)
+    elapsed = time.perf_counter() - started
+    return (android.java_calls() - calls) / repeat, elapsed / repeat * 1e6
+
+
+def run(repeat, sdk, count):
+    scenarios = {}
+
+    def rebuild(android, locations, save=False):
+        # The old code rebuilt the notification on every pause and replaced the receiver on every save
+        notifier = FavoritesNotifier(android.autoclass, android.receiver_factory)
+        if save:
+            notifier.sync_receiver(locations)
+            notifier.close()
+        else:
+            notifier.post(locations)
+
+    for mode in ("rebuild", "incremental"):
+        for scenario in ("pause, unchanged", "pause, after dismiss", "save, changed", "save, not in buttons"):
+            android = FakeAndroid(sdk)
+            notifier = FavoritesNotifier(android.autoclass, android.receiver_factory)
+            notifier.sync_receiver(favorites(count))
+            notifier.post(favorites(count))
+
+            if mode == "rebuild":
+                if scenario == "pause, unchanged":
+                    def action(run):
+                        rebuild(android, favorites(count))
+                elif scenario == "pause, after dismiss":
+                    def action(run):
+                        android.dismiss()
+                        rebuild(android, favorites(count))
+                elif scenario == "save, changed":
+                    def action(run):
+                        rebuild(android, favorites(count, run + 1), save=True)
+                else:
+                    def action(run):
+                        rebuild(android, favorites(count) + favorites(1, run + 1), save=True)
+            elif scenario == "pause, unchanged":
+                def action(run):
+                    notifier.post(favorites(count))
+            elif scenario == "pause, after dismiss":
+                def action(run):
+                    android.dismiss()
+                    notifier.post(favorites(count))
+            elif scenario == "save, changed":
+                def action(run):
+                    notifier.on_change(favorites(count, run + 1))
+            else:
+                # A favorite beyond the buttons changed: neither the receiver nor the notification is touched
+                def action(run):
+                    locations = favorites(count) + favorites(1, run + 1)
+                    notifier.on_change(locations)
+
+            calls, micros = measure(android, action, repeat)
+            scenarios.setdefault(scenario, {})[mode] = {'java_calls': calls, 'us': micros}
+    return scenarios
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DeLocator notification update benchmark")
+    parser.add_argument("--repeat", type=int, default=200, help="Runs per scenario")
+    parser.add_argument("--sdk", type=int, default=34, help="Android SDK level to emulate")
+    parser.add_argument("--favorites", type=int, default=3, help="Number of saved locations")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat, args.sdk, args.favorites)
+    print(f"{'scenario':<24} {'rebuild calls':>14} {'incremental calls':>18} {'rebuild us':>11} {'incremental us':>15}")
+    for scenario, modes in results.items():
+        print(f"{scenario:<24} {modes['rebuild']['java_calls']:>14.1f} {modes['incremental']['java_calls']:>18.1f} "
+              f"{modes['rebuild']['us']:>11.1f} {modes['incremental']['us']:>15.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+Offline benchmarks for the anonymization pipeline.
+
+Starts the local stand-in server in a subprocess, points the engine at it and
+reports p50/p95 latency, throughput and peak memory for:
+  - extract_address_from_tags / determine_category_from_tags
+  - get_places_with_fallback
+  - the full submit flow (anonymize_address, which MapWithMarker._perform_api_calls runs)
+across Overpass responses of 10 to 100k elements, and
+  - reroll of a saved location from its precomputed pool (no network requests).
+
+Usage:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --sizes 10 1000 --output results.json
+    python benchmarks/bench_pipeline.py --baseline results.json --tolerance 0.2
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, os.pardir, "App"))
+
+from delocator import clients, engine, pools  # noqa: E402
+from delocator.overpass_pool import configure_overpass_endpoints  # noqa: E402
+from delocator.ratelimit import nominatim_limiter  # noqa: E402
+from standin_server import DEFAULT_CONFIG, synthetic_overpass_payload  # noqa: E402
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(name, size, func, repeat, items=1):
+    """
+    Runs func repeat times and returns a result row.
+    items is the number of elements one call processes, used for throughput.
+    """
+    timings = []
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(timings)
+    return {
+        'benchmark': name,
+        'size': size,
+        'repeat': repeat,
+        'p50_ms': percentile(timings, 0.50) * 1000,
+        'p95_ms': percentile(timings, 0.95) * 1000,
+        'throughput': (items * repeat / total) if total else 0.0,
+        'peak_kib': peak / 1024
+    }
+
+
+# StandIn: Runs standin_server.py in a subprocess so its memory is not measured
+class StandIn:
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.join(BENCH_DIR, "standin_server.py")],
+            stdout=subprocess.PIPE, text=True
+        )
+        self.url = self.process.stdout.readline().strip()
+        return self
+
+    def configure(self, **config):
+        session = clients.get_session()
+        session.post(f"{self.url}/_config", json=config, timeout=30).raise_for_status()
+        # Make the stand-in build and cache the payload outside of the timed runs
+        session.post(f"{self.url}/api/interpreter", data={'data': ""}, timeout=120)
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        self.process.wait()
+
+
+def point_engine_at(url):
+    # Route all engine traffic to the stand-in and disable the Nominatim rate limit
+    host = url.split("://", 1)[1]
+    engine.OVERPASS_URL = f"{url}/api/interpreter"
+    configure_overpass_endpoints([engine.OVERPASS_URL])
+    clients.NOMINATIM_DOMAIN = host
+    clients.NOMINATIM_SCHEME = "http"
+    clients.close_clients()
+    nominatim_limiter.set_rate(0)
+
+
+def tag_samples(size):
+    payload = json.loads(synthetic_overpass_payload(dict(DEFAULT_CONFIG, element_count=size)))
+    return [element['tags'] for element in payload['elements']]
+
+
+def run(sizes, repeat, latency):
+    results = []
+    location = type("Location", (), {
+        'latitude': DEFAULT_CONFIG['latitude'], 'longitude': DEFAULT_CONFIG['longitude']
+    })()
+
+    with StandIn() as stand_in:
+        point_engine_at(stand_in.url)
+
+        for size in sizes:
+            # Fewer repetitions for the largest payloads to keep runs short
+            runs = max(3, repeat if size <= 1000 else repeat // 4)
+            tags_list = tag_samples(size)
+
+            results.append(measure(
+                "extract_address_from_tags", size,
+                lambda: [engine.extract_address_from_tags(tags) for tags in tags_list],
+                runs, items=size
+            ))
+            results.append(measure(
+                "determine_category_from_tags", size,
+                lambda: [engine.determine_category_from_tags(tags) for tags in tags_list],
+                runs, items=size
+            ))
+
+            stand_in.configure(element_count=size, latency=latency)
+            results.append(measure(
+                "get_places_with_fallback", size,
+                lambda: engine.get_places_with_fallback(None, location, radius=500),
+                runs, items=size
+            ))
+            results.append(measure(
+                "anonymize_address", size,
+                lambda: engine.anonymize_address("Stephansplatz 1, Wien"),
+                runs
+            ))
+
+        # Re-rolling draws from the pool the app keeps per favorite; the size is the pool's
+        favorite = {'original_address': "Stephansplatz 1, Wien", 'original_latitude': None,
+                    'original_longitude': None}
+        favorite.update(pools.refresh_pool(favorite))
+        favorite['address'] = favorite['pool'][0]['address']
+        results.append(measure("reroll", len(favorite['pool']), lambda: pools.reroll(favorite), repeat))
+
+    return results
+
+
+def print_table(results):
+    header = f"{'benchmark':<30}{'size':>8}{'p50 ms':>11}{'p95 ms':>11}{'items/s':>13}{'peak KiB':>11}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(f"{row['benchmark']:<30}{row['size']:>8}{row['p50_ms']:>11.2f}{row['p95_ms']:>11.2f}"
+              f"{row['throughput']:>13.0f}{row['peak_kib']:>11.0f}")
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns descriptions of rows whose p95 latency regressed beyond tolerance.
+    """
+    previous = {(row['benchmark'], row['size']): row for row in baseline}
+    regressions = []
+    for row in results:
+        old = previous.get((row['benchmark'], row['size']))
+        if old and old['p95_ms'] > 0 and row['p95_ms'] > old['p95_ms'] * (1 + tolerance):
+            regressions.append(
+                f"{row['benchmark']} [{row['size']}]: p95 {old['p95_ms']:.2f} ms -> {row['p95_ms']:.2f} ms"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline DeLocator pipeline benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Overpass element counts to benchmark")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per benchmark")
+    parser.add_argument("--latency", type=float, default=0.0, help="Injected server latency in seconds")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative p95 increase before a regression is reported")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat, args.latency)
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nNo regressions against baseline.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
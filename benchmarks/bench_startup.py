@@ -0,0 +1,112 @@
+"""
+Startup benchmark for the Kivy app.
+
+Launches App/main.py repeatedly with DELOCATOR_STARTUP_BENCHMARK=1, which makes
+the app print the time from process start to its first rendered frame and quit,
+and reports p50/p95 for the default (lazy) startup and for
+DELOCATOR_EAGER_STARTUP=1, which imports the engine and builds the map screen
+up front as the app did before.
+
+Needs Kivy, kivy_garden.mapview and a display (for headless runs use
+e.g. xvfb-run).
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 20 --output startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(BENCH_DIR, os.pardir, "App")
+
+MARKER = "DELOCATOR_FIRST_FRAME"
+MODES = ("lazy", "eager")
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def launch(mode, timeout):
+    """
+    Starts the app once and returns (first frame as reported by the app,
+    wall time until the report) in seconds.
+    """
+    env = dict(os.environ, DELOCATOR_STARTUP_BENCHMARK="1", KIVY_NO_ARGS="1")
+    env.pop("DELOCATOR_EAGER_STARTUP", None)
+    if mode == "eager":
+        env["DELOCATOR_EAGER_STARTUP"] = "1"
+
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "main.py"], cwd=APP_DIR, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=timeout
+    )
+    wall = time.perf_counter() - started
+
+    for line in completed.stdout.splitlines():
+        if line.startswith(MARKER):
+            return float(line.split()[1]), wall
+    raise RuntimeError(f"App did not report a first frame ({mode}):\n{completed.stderr[-2000:]}")
+
+
+def run(repeat, timeout):
+    results = []
+    for mode in MODES:
+        first_frames = []
+        walls = []
+        for _ in range(repeat):
+            first_frame, wall = launch(mode, timeout)
+            first_frames.append(first_frame)
+            walls.append(wall)
+        results.append({
+            'mode': mode,
+            'repeat': repeat,
+            'first_frame_p50_ms': percentile(first_frames, 0.50) * 1000,
+            'first_frame_p95_ms': percentile(first_frames, 0.95) * 1000,
+            'process_p50_ms': percentile(walls, 0.50) * 1000,
+            'process_p95_ms': percentile(walls, 0.95) * 1000
+        })
+    return results
+
+
+def print_table(results):
+    print(f"{'mode':<8} {'first frame p50':>16} {'p95':>10} {'process p50':>12} {'p95':>10}")
+    for row in results:
+        print(f"{row['mode']:<8} {row['first_frame_p50_ms']:>14.1f}ms {row['first_frame_p95_ms']:>8.1f}ms"
+              f" {row['process_p50_ms']:>10.1f}ms {row['process_p95_ms']:>8.1f}ms")
+
+    by_mode = {row['mode']: row for row in results}
+    eager = by_mode['eager']['first_frame_p50_ms']
+    if eager:
+        saved = eager - by_mode['lazy']['first_frame_p50_ms']
+        print(f"\nLazy startup: {saved:.1f}ms ({saved / eager:.0%}) faster to the first frame at p50")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DeLocator app startup benchmark")
+    parser.add_argument("--repeat", type=int, default=10, help="Launches per mode")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for one launch")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat, args.timeout)
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""
+Local stand-in for the Nominatim, Overpass and map tile services.
+
+Serves synthetic or recorded responses so the anonymization pipeline can be
+benchmarked without touching the public servers. Latency, errors and payload
+size are controlled at runtime by POSTing JSON to /_config.
+Map tiles are served as /tiles/{z}/{x}/{y}.png.
+
+Run standalone:
+    python benchmarks/standin_server.py --port 8765
+"""
+import argparse
+import json
+import random
+import struct
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_CONFIG = {
+    'element_count': 100,           # Synthetic Overpass elements per response
+    'address_ratio': 0.7,           # Share of elements with street and city
+    'latency': 0.0,                 # Seconds to wait before answering
+    'error_rate': 0.0,              # Share of requests answered with error_status
+    'error_status': 503,
+    'overpass_recording': None,     # Path of a recorded Overpass response to replay
+    'nominatim_recording': None,    # Path of a recorded Nominatim response to replay
+    'tile_bytes': 20000,            # Approximate size of a served map tile
+    'latitude': 48.2082,
+    'longitude': 16.3738,
+    'seed': 0
+}
+
+# Tag combinations matching PLACE_CATEGORIES, plus some that are filtered out
+SYNTHETIC_TAGS = [
+    ('amenity', 'restaurant'), ('amenity', 'cafe'), ('amenity', 'bar'), ('amenity', 'fast_food'),
+    ('shop', 'supermarket'), ('shop', 'bakery'), ('shop', 'convenience'), ('amenity', 'pharmacy'),
+    ('amenity', 'bank'), ('amenity', 'atm'), ('amenity', 'post_office'), ('amenity', 'fuel'),
+    ('highway', 'bus_stop'), ('leisure', 'park'), ('shop', 'hairdresser'), ('amenity', 'bench')
+]
+
+
+def synthetic_overpass_payload(config):
+    """
+    Builds an Overpass JSON response with config['element_count'] elements
+    scattered around the configured center.
+    """
+    rng = random.Random(config['seed'])
+    elements = []
+    for index in range(config['element_count']):
+        key, value = rng.choice(SYNTHETIC_TAGS)
+        tags = {key: value, 'name': f"Place {index}"}
+        if rng.random() < config['address_ratio']:
+            tags.update({
+                'addr:street': f"Teststraße {index % 250}",
+                'addr:housenumber': str(index % 97 + 1),
+                'addr:postcode': "1010",
+                'addr:city': "Wien"
+            })
+        lat = config['latitude'] + rng.uniform(-0.004, 0.004)
+        lon = config['longitude'] + rng.uniform(-0.006, 0.006)
+        if index % 5 == 0:
+            elements.append({'type': 'way', 'id': index, 'center': {'lat': lat, 'lon': lon}, 'tags': tags})
+        else:
+            elements.append({'type': 'node', 'id': index, 'lat': lat, 'lon': lon, 'tags': tags})
+
+    return json.dumps({
+        'version': 0.6,
+        'generator': "DeLocator stand-in",
+        'osm3s': {'copyright': "Synthetic data"},
+        'elements': elements
+    }, ensure_ascii=False).encode("utf-8")
+
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def synthetic_tile(size_bytes, tile_size=256):
+    """
+    Builds a plain grey tile_size x tile_size PNG, padded with a text chunk
+    to roughly size_bytes so transfers and cache budgets resemble real tiles.
+    """
+    rows = b"".join(b"\x00" + b"\xdd" * tile_size for _ in range(tile_size))
+    image = (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", tile_size, tile_size, 8, 0, 0, 0, 0))
+        + _png_chunk(b"IDAT", zlib.compress(rows))
+    )
+    padding = max(0, size_bytes - len(image) - 24)
+    return image + _png_chunk(b"tEXt", b"Comment\x00" + b"x" * padding) + _png_chunk(b"IEND", b"")
+
+
+# StandInHandler: Answers Overpass, Nominatim, tile and control requests
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+    def _send(self, status, body, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(length) if length else b""
+
+    def _inject_faults(self):
+        # Apply configured latency and errors; returns True if an error was sent
+        config = self.server.config
+        if config['latency']:
+            time.sleep(config['latency'])
+        if config['error_rate'] and self.server.rng.random() < config['error_rate']:
+            self._send(config['error_status'], b'{"error": "injected"}')
+            return True
+        return False
+
+    def do_POST(self):
+        body = self._read_body()
+
+        if self.path == "/_config":
+            with self.server.lock:
+                self.server.config.update(json.loads(body or b"{}"))
+                self.server.payload_cache.clear()
+                self.server.rng = random.Random(self.server.config['seed'])
+            self._send(200, json.dumps(self.server.config).encode("utf-8"))
+            return
+
+        if self.path.startswith("/api/interpreter"):
+            self.server.counters['overpass'] += 1
+            if not self._inject_faults():
+                self._send(200, self.server.overpass_payload())
+            return
+
+        self._send(404, b'{"error": "not found"}')
+
+    def do_GET(self):
+        if self.path.startswith("/search"):
+            self.server.counters['nominatim'] += 1
+            if not self._inject_faults():
+                self._send(200, self.server.nominatim_payload())
+            return
+
+        if self.path.startswith("/tiles/"):
+            self.server.counters['tiles'] += 1
+            if not self._inject_faults():
+                self._send(200, self.server.tile_payload(), content_type="image/png")
+            return
+
+        if self.path == "/_stats":
+            self._send(200, json.dumps(self.server.counters).encode("utf-8"))
+            return
+
+        self._send(404, b'{"error": "not found"}')
+
+
+# StandInServer: Threaded HTTP server holding the runtime configuration
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), config=None):
+        super().__init__(address, StandInHandler)
+        self.config = dict(DEFAULT_CONFIG, **(config or {}))
+        self.lock = threading.Lock()
+        self.rng = random.Random(self.config['seed'])
+        self.payload_cache = {}
+        self.counters = {'overpass': 0, 'nominatim': 0, 'tiles': 0}
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def overpass_payload(self):
+        with self.lock:
+            if 'overpass' not in self.payload_cache:
+                if self.config['overpass_recording']:
+                    with open(self.config['overpass_recording'], "rb") as file:
+                        self.payload_cache['overpass'] = file.read()
+                else:
+                    self.payload_cache['overpass'] = synthetic_overpass_payload(self.config)
+            return self.payload_cache['overpass']
+
+    def tile_payload(self):
+        with self.lock:
+            if 'tile' not in self.payload_cache:
+                self.payload_cache['tile'] = synthetic_tile(self.config['tile_bytes'])
+            return self.payload_cache['tile']
+
+    def nominatim_payload(self):
+        with self.lock:
+            if 'nominatim' not in self.payload_cache:
+                if self.config['nominatim_recording']:
+                    with open(self.config['nominatim_recording'], "rb") as file:
+                        self.payload_cache['nominatim'] = file.read()
+                else:
+                    self.payload_cache['nominatim'] = json.dumps([{
+                        'place_id': 1,
+                        'lat': str(self.config['latitude']),
+                        'lon': str(self.config['longitude']),
+                        'display_name': "Stephansplatz 1, 1010 Wien, Österreich"
+                    }], ensure_ascii=False).encode("utf-8")
+            return self.payload_cache['nominatim']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Nominatim/Overpass/tile stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--config", help="JSON file with initial configuration")
+    args = parser.parse_args(argv)
+
+    config = {}
+    if args.config:
+        with open(args.config, "r") as file:
+            config = json.load(file)
+
+    server = StandInServer((args.host, args.port), config)
+    # The benchmark reads the URL from the first line of output
+    print(server.url, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())